@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+"""
+benchmark package contains micro-benchmarks, run as scripts from the application directory, e.g.
+  python -m benchmark.bench_statements
+"""
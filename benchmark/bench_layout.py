@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+"""
+Headless benchmark and regression check of FakeGridLayout, which needs no display: placement throughput and memory
+  allocations on generated grids (from 10 x 10 up to 1000 x 100), the former slice-and-sum get_place as baseline, and
+  the geometry of the placement plans of the application forms against golden snapshots.
+
+Usage: python -m benchmark.bench_layout [--check-only] [--update-golden]
+  It exits with status 1 if a plan differs from its snapshot. After an intended layout change, the snapshots are
+  written again with --update-golden, and reviewed as any other change.
+"""
+
+# --- Python modules ---
+# argparse: module which makes it easy to write user-friendly command-line interfaces.
+import argparse
+# json: module which exposes an API to encode and decode JSON documents.
+import json
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# random: module which implements pseudo-random number generators for various distributions.
+import random
+# sys: module which provides access to some variables used or maintained by the interpreter and to functions that
+#      interact strongly with the interpreter.
+import sys
+# time: module which provides various time-related functions.
+import time
+# tracemalloc: module which is a debug tool to trace memory blocks allocated by Python.
+import tracemalloc
+
+# --- App modules ---
+from helper import layout, layout_compiler
+from view import forms
+
+DEFAULT_CELLS = 10000
+DEFAULT_GRIDS = '10x10,100x10,100x100,1000x100'
+DEFAULT_REPEAT = 5
+GOLDEN_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+FORMS = (forms.MOVIES_FORM, forms.GENRES_FORM)
+
+
+def legacy_get_place(rows_height_: tuple, columns_width_: tuple, row_number_: int, col_number_: int) -> ():
+    # Former FakeGridLayout.get_place: O(rows + cols) per call, allocating a tuple per slice
+    x_ = sum(columns_width_[:col_number_ - 1]) + layout.DEFAULT_LEFT_MARGIN * col_number_
+    y_ = sum(rows_height_[:row_number_ - 1]) + layout.DEFAULT_TOP_MARGIN * row_number_
+    return x_, y_
+
+
+def _measure(label_: str, count_: int, repeat_: int, action_, unit_: str = 'cells'):
+    """
+    Best time of several runs of an action, and the memory it allocates: peak while it runs, and blocks it leaves
+    """
+    best_ = float('inf')
+    for _ in range(repeat_):
+        start_ = time.perf_counter()
+        result_ = action_()
+        best_ = min(best_, time.perf_counter() - start_)
+        del result_
+
+    # Memory is measured on a separate run, since tracing slows down the allocations
+    tracemalloc.start()
+    before_ = tracemalloc.take_snapshot()
+    result_ = action_()
+    after_ = tracemalloc.take_snapshot()
+    _, peak_ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks_ = sum(stat_.count_diff for stat_ in after_.compare_to(before_, 'filename'))
+
+    print(f'  {label_:<32} {best_ * 1e3:>9.3f} ms {count_ / best_:>14,.0f} {unit_ + "/s":<8}'
+          f'{peak_ / 1024:>10,.1f} KiB peak {blocks_:>8,} blocks')
+    return result_
+
+
+def _grid(rows_: int, columns_: int, cells_: int, random_: random.Random) -> tuple:
+    """
+    Generated grid of random sizes, and random cells over it, some of them spanning several rows and columns
+    """
+    rows_height_ = tuple(random_.randint(10, 40) for _ in range(rows_))
+    columns_width_ = tuple(random_.randint(40, 200) for _ in range(columns_))
+    spans_ = []
+    for _ in range(cells_):
+        row_ = random_.randint(1, rows_)
+        col_ = random_.randint(1, columns_)
+        spans_.append((row_, col_, random_.randint(1, rows_ - row_ + 1) if random_.random() < 0.1 else 1,
+                       random_.randint(1, columns_ - col_ + 1) if random_.random() < 0.1 else 1))
+    return rows_height_, columns_width_, spans_
+
+
+def benchmark(grids_: [], cells_: int, repeat_: int):
+    """
+    Measures every placement path on each grid, checking that they agree
+    :param grids_: sizes (rows, columns) of the generated grids
+    :param cells_: number of cells placed on each grid
+    :param repeat_: runs of each measure, the best one is reported
+    """
+    random_ = random.Random(0)
+    for rows_, columns_ in grids_:
+        rows_height_, columns_width_, spans_ = _grid(rows_, columns_, cells_, random_)
+        fake_grid_ = layout.FakeGridLayout(rows_height_, columns_width_)
+
+        print(f'{cells_} cells on a {rows_} x {columns_} grid, best of {repeat_}')
+        _measure('FakeGridLayout()', 1, repeat_, lambda: layout.FakeGridLayout(rows_height_, columns_width_), 'grids')
+        expected_ = _measure('legacy get_place (slice + sum)', cells_, repeat_,
+                             lambda: [legacy_get_place(rows_height_, columns_width_, c_[0], c_[1]) for c_ in spans_])
+        single_ = _measure('get_place', cells_, repeat_, lambda: [fake_grid_.get_place(c_[0], c_[1]) for c_ in spans_])
+        batch_ = _measure('place_many', cells_, repeat_, lambda: fake_grid_.place_many(spans_))
+        cells_single_ = _measure('get_cell', cells_, repeat_, lambda: [fake_grid_.get_cell(*c_) for c_ in spans_])
+        cells_batch_ = _measure('get_cells', cells_, repeat_, lambda: fake_grid_.get_cells(spans_))
+
+        if not expected_ == single_ == batch_ or cells_single_ != cells_batch_:
+            raise AssertionError('Placement paths disagree.')
+        if [cell_[:2] for cell_ in cells_batch_] != batch_:
+            raise AssertionError('Cells and places disagree.')
+
+    print(f'{len(FORMS)} form specs, best of {repeat_}')
+    for spec_ in FORMS:
+        _measure(f'compile_form({spec_["name"]})', 1, repeat_, lambda: layout_compiler.compile_form(spec_), 'forms')
+
+
+def _golden_file(spec_: dict) -> str:
+    return os.path.join(GOLDEN_FOLDER, f'{spec_["name"]}.json')
+
+
+def check_golden() -> int:
+    """
+    Compares the placement plan of each form with its golden snapshot
+    :return: number of forms whose plan differs, or has no snapshot
+    """
+    failures_ = 0
+    for spec_ in FORMS:
+        # A JSON round trip, so the plan compares as the snapshot, e.g. with lists instead of tuples
+        plan_ = json.loads(json.dumps(layout_compiler.compile_form(spec_)))
+        try:
+            with open(_golden_file(spec_), 'r', encoding='utf-8') as file_:
+                golden_ = json.load(file_)
+        except OSError:
+            print(f'{spec_["name"]}: no golden snapshot, write it with --update-golden')
+            failures_ += 1
+            continue
+
+        differences_ = [(expected_, actual_) for expected_, actual_ in zip(golden_, plan_) if expected_ != actual_]
+        if len(golden_) != len(plan_):
+            print(f'{spec_["name"]}: {len(plan_)} placements, {len(golden_)} expected')
+        for expected_, actual_ in differences_:
+            print(f'{spec_["name"]}: {actual_}, expected {expected_}')
+        if differences_ or len(golden_) != len(plan_):
+            failures_ += 1
+        else:
+            print(f'{spec_["name"]}: {len(plan_)} placements match the golden snapshot')
+
+    return failures_
+
+
+def update_golden():
+    """
+    Writes the golden snapshots with the current placement plans
+    """
+    os.makedirs(GOLDEN_FOLDER, exist_ok=True)
+    for spec_ in FORMS:
+        with open(_golden_file(spec_), 'w', encoding='utf-8') as file_:
+            # One placement per line, so a change shows up as a readable diff
+            file_.write('[\n' + ',\n'.join(f'  {json.dumps(placement_)}'
+                                           for placement_ in layout_compiler.compile_form(spec_)) + '\n]\n')
+        print(f'{spec_["name"]}: golden snapshot written')
+
+
+def _grid_size(text_: str) -> tuple:
+    rows_, _, columns_ = text_.lower().partition('x')
+    return int(rows_), int(columns_)
+
+
+def main() -> int:
+    parser_ = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser_.add_argument('--cells', type=int, default=DEFAULT_CELLS, help='cells placed on each grid')
+    parser_.add_argument('--grids', default=DEFAULT_GRIDS, help='sizes of the grids, rows x columns, comma-separated')
+    parser_.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser_.add_argument('--check-only', action='store_true', help='only compare the plans with the snapshots')
+    parser_.add_argument('--update-golden', action='store_true', help='write the snapshots with the current plans')
+    args_ = parser_.parse_args()
+
+    if args_.update_golden:
+        update_golden()
+        return 0
+
+    if not args_.check_only:
+        benchmark([_grid_size(size_) for size_ in args_.grids.split(',')], args_.cells, args_.repeat)
+
+    return 1 if check_golden() else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
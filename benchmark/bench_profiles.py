@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the engine profiles of the connection pool: throughput of reads, single writes (one transaction per row)
+  and bulk writes (save_many) under each profile, plus the SQLite defaults as baseline, on a file database.
+"""
+
+# --- Python modules ---
+# argparse: module which makes it easy to write user-friendly command-line interfaces.
+import argparse
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# random: module which implements pseudo-random number generators for various distributions.
+import random
+# shutil: module which offers a number of high-level operations on files and collections of files.
+import shutil
+# sqlite3: C library that provides a lightweight disk-based sql without a separate server,
+#          process and allows accessing the sql using a nonstandard variant of the SQL query language
+import sqlite3
+# tempfile: module which creates temporary files and directories.
+import tempfile
+# time: module which provides various time-related functions.
+import time
+
+# --- App modules ---
+from database import connection_pool, genre_repository
+from database.genres_table import Genres
+from database.movies_table import Movies
+from model.movie_model import Movie
+
+DEFAULT_ROWS = 100000
+DEFAULT_SINGLE_WRITES = 500
+DEFAULT_READS = 2000
+
+
+def _movie(i_: int) -> Movie:
+    return Movie(None, f'Movie N° {i_}', f'Director {i_ % 997}', 'Adventure', '1h 45min', i_ % 2 == 0)
+
+
+def _rate(label_: str, profile_: str, count_: int, action_) -> float:
+    start_ = time.perf_counter()
+    action_()
+    elapsed_ = time.perf_counter() - start_
+    print(f'{profile_ or "defaults":<12} {label_:<14} {count_:>8} {count_ / elapsed_:>12,.0f} /s')
+    return elapsed_
+
+
+def _build(database_: str, rows_: int):
+    """
+    Creates the database the profiles are measured on
+    """
+    connection_pool.configure(database_, profile_='bulk_load')
+    with Genres() as genres_:
+        genres_.create_table()
+    with Movies() as movies_:
+        movies_.create_table()
+        movies_.save_many(_movie(i_) for i_ in range(rows_))
+    genre_repository.shutdown()
+    connection_pool.shutdown()
+
+
+def _reads(reads_: int, rows_: int):
+    random_ = random.Random(1)
+    with Movies() as movies_:
+        for _ in range(reads_):
+            movies_.fetch_by_id(random_.randint(1, rows_))
+            movies_.search(None, ('name', 'id'), limit_=20, offset_=random_.randint(0, min(rows_ - 20, 1000)))
+
+
+def _single_writes(writes_: int):
+    with Movies() as movies_:
+        for i_ in range(writes_):
+            movies_.save(_movie(i_))
+            movies_.db.commit()
+
+
+def _bulk_writes(rows_: int):
+    with Movies() as movies_:
+        movies_.save_many(_movie(i_) for i_ in range(rows_))
+
+
+def main():
+    parser_ = argparse.ArgumentParser(description=__doc__)
+    parser_.add_argument('--rows', type=int, default=DEFAULT_ROWS, help='rows of the database, and of the bulk write')
+    parser_.add_argument('--single-writes', type=int, default=DEFAULT_SINGLE_WRITES, help='rows saved one by one')
+    parser_.add_argument('--reads', type=int, default=DEFAULT_READS, help='lookups by id and pages read')
+    parser_.add_argument('--folder', default=None,
+                         help='folder of the database, on the disk to measure, by default a temporary folder')
+    args_ = parser_.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args_.folder) as folder_:
+        template_ = os.path.join(folder_, 'template.db')
+        _build(template_, args_.rows)
+
+        # The replica profile is only for the memory database of the read replica, see bench_replica
+        for profile_ in (None,) + tuple(p_ for p_ in connection_pool.PROFILES if p_ != connection_pool.REPLICA_PROFILE):
+            # Each profile starts from the same database, the defaults with a rollback journal
+            database_ = os.path.join(folder_, f'{profile_}.db')
+            shutil.copyfile(template_, database_)
+            if profile_ is None:
+                connection_ = sqlite3.connect(database_)
+                connection_.execute('PRAGMA journal_mode = DELETE')
+                connection_.close()
+            connection_pool.configure(database_, profile_=profile_)
+
+            _rate('reads', profile_, args_.reads * 2, lambda: _reads(args_.reads, args_.rows))
+            if profile_ not in connection_pool.READ_ONLY_PROFILES:
+                _rate('single writes', profile_, args_.single_writes, lambda: _single_writes(args_.single_writes))
+                _rate('bulk writes', profile_, args_.rows, lambda: _bulk_writes(args_.rows))
+
+            genre_repository.shutdown()
+            connection_pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the in-memory read replica: latency of the reads of the application (data grid load, sorted and filtered
+  pages, full-text search, count, lookup by id) served from the database file and from the replica, the time to load
+  the replica, and the cost it adds to the single writes, which are applied to both.
+"""
+
+# --- Python modules ---
+# argparse: module which makes it easy to write user-friendly command-line interfaces.
+import argparse
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# random: module which implements pseudo-random number generators for various distributions.
+import random
+# statistics: module which provides functions for calculating mathematical statistics of numeric data.
+import statistics
+# tempfile: module which creates temporary files and directories.
+import tempfile
+# time: module which provides various time-related functions.
+import time
+
+# --- App modules ---
+from database import connection_pool, genre_repository, read_replica
+from database.genres_table import Genres
+from database.movies_table import Movies
+from model.movie_model import Movie
+
+DEFAULT_ROWS = 100000
+DEFAULT_REPEAT = 20
+DEFAULT_SINGLE_WRITES = 200
+
+
+def _movie(i_: int) -> Movie:
+    return Movie(None, f'Movie N° {i_}', f'Director {i_ % 997}', 'Adventure', '1h 45min', i_ % 2 == 0)
+
+
+def _build(database_: str, rows_: int):
+    """
+    Creates the database the reads are measured on
+    """
+    connection_pool.configure(database_, profile_='bulk_load')
+    with Genres() as genres_:
+        genres_.create_table()
+    with Movies() as movies_:
+        movies_.create_table()
+        movies_.save_many(_movie(i_) for i_ in range(rows_))
+        movies_.create_full_text_index()
+    genre_repository.shutdown()
+    connection_pool.shutdown()
+
+
+def _queries(rows_: int) -> []:
+    """
+    Reads of the application, as tuples (label, action on a Movies table)
+    """
+    random_ = random.Random(1)
+    return [
+        ('grid load', lambda movies_: sum(1 for _ in movies_.iter_rows('name'))),
+        ('sorted page', lambda movies_: movies_.search(None, ('director', 'name'), True, 50,
+                                                       random_.randint(0, rows_ - 50))),
+        ('prefix filter', lambda movies_: movies_.search(Movies.filters(name_prefix_='Movie N° 12'), ('name',), False,
+                                                         50)),
+        ('full-text', lambda movies_: movies_.search_text(f'director {random_.randint(0, 996)}')),
+        ('count', lambda movies_: movies_.count()),
+        ('by id', lambda movies_: movies_.fetch_by_id(random_.randint(1, rows_))),
+    ]
+
+
+def _latencies(action_, primary_: bool, repeat_: int) -> []:
+    """
+    Durations of the runs of a read, in milliseconds
+    :param primary_: flag to read from the database file, instead of the replica
+    """
+    durations_ = []
+    with Movies() as movies_:
+        movies_.db.primary = primary_
+        action_(movies_)    # Warm up: statement cache, and pages of the database file
+        for _ in range(repeat_):
+            start_ = time.perf_counter()
+            action_(movies_)
+            durations_.append((time.perf_counter() - start_) * 1e3)
+    return durations_
+
+
+def _single_writes(writes_: int) -> float:
+    """
+    Time of saving rows one by one, one transaction per row, in seconds
+    """
+    start_ = time.perf_counter()
+    with Movies() as movies_:
+        for i_ in range(writes_):
+            movies_.save(_movie(i_))
+    return time.perf_counter() - start_
+
+
+def main():
+    parser_ = argparse.ArgumentParser(description=__doc__)
+    parser_.add_argument('--rows', type=int, default=DEFAULT_ROWS, help='rows of the database')
+    parser_.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='runs of each read')
+    parser_.add_argument('--single-writes', type=int, default=DEFAULT_SINGLE_WRITES, help='rows saved one by one')
+    parser_.add_argument('--folder', default=None,
+                         help='folder of the database, on the disk to measure, by default a temporary folder')
+    args_ = parser_.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args_.folder) as folder_:
+        database_ = os.path.join(folder_, 'movies.db')
+        _build(database_, args_.rows)
+        connection_pool.configure(database_)
+
+        writes_disk_ = _single_writes(args_.single_writes)
+
+        read_replica.enable()
+        start_ = time.perf_counter()
+        read_replica.get_replica()
+        print(f'replica loaded in {(time.perf_counter() - start_) * 1e3:,.1f} ms, {args_.rows:,} rows')
+
+        print(f'{"read":<14} {"file p50":>10} {"p90":>9} {"replica p50":>12} {"p90":>9} {"speedup":>8}  (ms)')
+        for label_, action_ in _queries(args_.rows):
+            disk_ = sorted(_latencies(action_, True, args_.repeat))
+            memory_ = sorted(_latencies(action_, False, args_.repeat))
+            disk_p50_, memory_p50_ = statistics.median(disk_), statistics.median(memory_)
+            print(f'{label_:<14} {disk_p50_:>10.3f} {disk_[int(len(disk_) * 0.9) - 1]:>9.3f} '
+                  f'{memory_p50_:>12.3f} {memory_[int(len(memory_) * 0.9) - 1]:>9.3f} '
+                  f'{disk_p50_ / memory_p50_ if memory_p50_ else float("inf"):>7.1f}x')
+
+        writes_replica_ = _single_writes(args_.single_writes)
+        print(f'single writes  {args_.single_writes / writes_disk_:>10,.0f} /s on the file, '
+              f'{args_.single_writes / writes_replica_:,.0f} /s also applied to the replica')
+
+        read_replica.shutdown()
+        genre_repository.shutdown()
+        connection_pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark of the per-row latency of movie inserts and updates: SQL built with f-strings and run through
+  executescript (former path) versus parameterized statements reused from the sqlite3 statement cache. Both paths
+  validate the movie and look its genre up the same way, so only the handling of the statements differs (the genre
+  cache has its own tests).
+It is a regression gate: it exits with status 1 if the median latency of the parameterized path is above the one of
+  the former path, for inserts or for updates (--max-ratio below 1 requires a gain). Both paths run row by row in
+  alternate order, so the growth of the database and the WAL checkpoints weigh the same on both.
+"""
+
+# --- Python modules ---
+# argparse: module which makes it easy to write user-friendly command-line interfaces.
+import argparse
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# statistics: module which provides functions for calculating mathematical statistics of numeric data.
+import statistics
+# sqlite3: C library that provides a lightweight disk-based sql without a separate server,
+#          process and allows accessing the sql using a nonstandard variant of the SQL query language
+import sqlite3
+# sys: module which provides access to some variables used or maintained by the interpreter.
+import sys
+# tempfile: module which creates temporary files and directories.
+import tempfile
+# time: module which provides various time-related functions.
+import time
+
+# --- App modules ---
+from database import connection_pool, genre_repository
+from database.genres_table import Genres
+from database.movies_table import Movies
+from helper import string_helper
+from model.movie_model import Movie
+
+DEFAULT_ROWS = 2000
+DEFAULT_MAX_RATIO = 1.0    # Parameterized / f-string median latency allowed, above it the gate fails
+
+
+def _movie(i_: int, id_: int = None) -> Movie:
+    return Movie(id_, f"Movie N° {i_} - Director's cut", f'Director {i_ % 97}', 'Adventure', '1h 45min', i_ % 2 == 0)
+
+
+def _script_save(connection_: sqlite3.Connection, movie_: Movie):
+    # Former Movies.save, on the current schema: the same validation, and the genre is looked up the same way
+    for value_ in (movie_.name, movie_.director, movie_.gender, movie_.duration):
+        if string_helper.is_none_empty_space(value_):
+            raise ValueError('The movie fields cannot be empty.')
+    genres_ = genre_repository.get_repository().name_map(connection_)
+    genre_id_ = genres_[movie_.gender.strip().casefold()].id
+
+    if movie_.id is None:
+        _script_insert(connection_, movie_, genre_id_)
+    else:
+        _script_update(connection_, movie_, genre_id_)
+
+
+def _script_insert(connection_: sqlite3.Connection, movie_: Movie, genre_id_: int):
+    # Former Movies.__insert: values interpolated in the SQL text, which forces a full parse on every call
+    connection_.executescript(f"""
+        INSERT INTO movies (name, director, genre_id, duration, available)
+        VALUES ('{movie_.name.replace("'", "''")}', '{movie_.director}', {genre_id_}, '{movie_.duration}',
+                {movie_.available})""")
+    connection_.commit()
+
+
+def _script_update(connection_: sqlite3.Connection, movie_: Movie, genre_id_: int):
+    # Former Movies.__update
+    connection_.executescript(f"""
+        UPDATE  movies
+           SET  name = '{movie_.name.replace("'", "''")}', director = '{movie_.director}', genre_id = {genre_id_},
+                duration = '{movie_.duration}', available = {movie_.available}
+         WHERE  id = {movie_.id}""")
+    connection_.commit()
+
+
+def _measure(rows_: int, before_, after_) -> ([], []):
+    """
+    Runs two actions once per row, alternating which one runs first
+    :return: latencies of each action, in microseconds
+    """
+    before_latencies_, after_latencies_ = [], []
+    runs_ = ((before_, before_latencies_), (after_, after_latencies_))
+    for i_ in range(1, rows_ + 1):
+        for action_, latencies_ in (runs_ if i_ % 2 else reversed(runs_)):
+            start_ = time.perf_counter()
+            action_(i_)
+            latencies_.append((time.perf_counter() - start_) * 1e6)
+    return before_latencies_, after_latencies_
+
+
+def main():
+    parser_ = argparse.ArgumentParser(description=__doc__)
+    parser_.add_argument('--rows', type=int, default=DEFAULT_ROWS, help='rows inserted and updated on each path')
+    parser_.add_argument('--max-ratio', type=float, default=DEFAULT_MAX_RATIO,
+                         help='parameterized / f-string median latency allowed before the gate fails')
+    parser_.add_argument('--synchronous', default='OFF', choices=('OFF', 'NORMAL', 'FULL'),
+                         help='synchronous pragma, OFF by default so that fsync does not hide the statement cost')
+    args_ = parser_.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder_:
+        connection_pool.configure(os.path.join(folder_, 'bench.db'))
+        with Genres() as genres_:
+            genres_.create_table(drop_if_exists_=True)
+
+        with Movies() as movies_:
+            movies_.create_table(drop_if_exists_=True)
+
+            # Both paths run on the same borrowed connection
+            movies_.db.connect()
+            connection_ = movies_.db.connection
+            connection_.execute(f'PRAGMA synchronous = {args_.synchronous}')
+
+            # Before: f-string + executescript, one full parse per row.
+            # After: parameterized statements, prepared once and reused from the statement cache
+            first_id_ = movies_.db.get_value('SELECT COALESCE(MAX(id), 0) FROM movies', 0) + 1
+            latencies_ = {'insert': _measure(args_.rows,
+                                             lambda i_: _script_save(connection_, _movie(i_)),
+                                             lambda i_: movies_.save(_movie(i_)))}
+            # Each path updates every other row inserted
+            latencies_['update'] = _measure(
+                args_.rows,
+                lambda i_: _script_save(connection_, _movie(i_ + 1, first_id_ + 2 * i_ - 2)),
+                lambda i_: movies_.save(_movie(i_ + 1, first_id_ + 2 * i_ - 1)))
+
+        genre_repository.shutdown()
+        connection_pool.shutdown()
+
+    failed_ = False
+    for operation_, (before_, after_) in latencies_.items():
+        before_p50_, after_p50_ = statistics.median(before_), statistics.median(after_)
+        print(f'{operation_ + ", f-string + executescript":<40} {args_.rows:>8} rows {before_p50_:>10.1f} µs/row')
+        print(f'{operation_ + ", parameterized execute":<40} {args_.rows:>8} rows {after_p50_:>10.1f} µs/row '
+              f'({(after_p50_ / before_p50_ - 1) * 100:+.1f}%)')
+        if after_p50_ > before_p50_ * args_.max_ratio:
+            print(f'FAILED: the parameterized {operation_} takes {after_p50_ / before_p50_:.3f}x the f-string one, '
+                  f'above {args_.max_ratio:g}x')
+            failed_ = True
+    if failed_:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,22 @@
 # -*- coding: utf-8 -*-
 
 # Engine connection
+from . import query_tracer
+from . import connection_pool
 from . import sql_connection
+from . import db_worker
+from . import genre_repository
+from . import migrations
+from . import read_replica
+from . import unit_of_work
 
 # Tables
 from . import base_table_class
+from . import genres_table
 from . import movies_table
+
+# Tables by name, as they are referenced by the forms of the view
+TABLES = {
+    'genres': genres_table.Genres,
+    'movies': movies_table.Movies,
+}
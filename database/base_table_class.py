@@ -17,16 +17,34 @@ import sys
 from .sql_connection import SqlConnection
 from helper import string_helper
 
+DEFAULT_FETCH_BATCH_SIZE = 500      # Rows fetched from the cursor at once by the streaming methods
+
 
 class Table:
+    model = None    # Entity class the rows are fetched as, see model.base_model.Model, None to fetch tuples
+
     def __init__(self,
                  table_name_: str):
         """
         Class constructor
         """
-        # Open sql connection
+        # Sql connection, borrowed from the connection pool on first use and returned by close()
         self.db = SqlConnection()
         self.table_name = table_name_.lower()
+        self.source_name = self.table_name  # Table or view the rows are read from
+        self.__columns = None       # Names of the columns, fetched on first use
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Returns the sql connection to the connection pool
+        """
+        self.db.close()
 
     def create_table(self,
                      sql_script_file_: str = '',
@@ -56,7 +74,7 @@ class Table:
                 sql_script_ = file_.read()
 
             # Execute CREATE TABLE command
-            self.db.execute(sql_script_)
+            self.db.execute_script(sql_script_)
 
             return True
 
@@ -79,13 +97,32 @@ class Table:
         return False
 
     def execute(self,
-                sql_command_) -> sqlite3.Cursor:
+                sql_command_: str,
+                params_: tuple | dict = ()) -> sqlite3.Cursor:
+        """
+        Executes a parameterized command on the sql
+        :param sql_command_: SQL command, with ? placeholders for the values
+        :param params_: values bound to the placeholders
+        """
+        try:
+            # Execute SQL command
+            return self.db.execute(sql_command_, params_)
+        except Exception as e:
+            print(f'SQL execution error over {self.table_name} table.\nMethod: {inspect.stack()[0][0].f_code.co_name}.',
+                  {sys.exc_info()[0]}, e)
+            raise e
+
+    def executemany(self,
+                    sql_command_: str,
+                    params_seq_) -> sqlite3.Cursor:
         """
-        Executes a command on the sql
+        Executes a parameterized command on the sql once for each set of values
+        :param sql_command_: SQL command, with ? placeholders for the values
+        :param params_seq_: iterable with the values bound to the placeholders on each execution
         """
         try:
             # Execute SQL command
-            return self.db.execute(sql_command_)
+            return self.db.executemany(sql_command_, params_seq_)
         except Exception as e:
             print(f'SQL execution error over {self.table_name} table.\nMethod: {inspect.stack()[0][0].f_code.co_name}.',
                   {sys.exc_info()[0]}, e)
@@ -98,18 +135,255 @@ class Table:
         :param order_by_: orders the result set of a query by the specified column list
         :return: list with all table rows
         """
-        command_ = f'SELECT * FROM \'{self.table_name}\''
+        return self.__select_all(order_by_).fetchall()
+
+    def iter_rows(self,
+                  order_by_: str = 'id ASC',
+                  batch_size_: int = DEFAULT_FETCH_BATCH_SIZE):
+        """
+        Streams all the rows of the table, like fechtall() but they are fetched in batches while they are iterated, so
+          at most one batch is held in memory. The connection stays borrowed until the iteration ends or is closed.
+        :param order_by_: orders the result set of a query by the specified column list
+        :param batch_size_: number of rows fetched from the cursor at once
+        """
+        yield from self.__stream(self.__select_all(order_by_), batch_size_)
+
+    def __select_all(self,
+                     order_by_: str):
+        """
+        Cursor over all the rows of the table
+        """
+        command_ = f'SELECT * FROM \'{self.source_name}\''
+        if not string_helper.is_none_empty_space(order_by_):
+            command_ += f' ORDER BY {order_by_}'
+        return self.db.get(command_, model_=self.model)
+
+    def fetch_page(self,
+                   order_by_: str = 'id ASC',
+                   limit_: int = 100,
+                   offset_: int = 0) -> []:
+        """
+        Fetches a page of rows of the table
+        :param order_by_: orders the result set of a query by the specified column list
+        :param limit_: maximum number of rows to fetch
+        :param offset_: number of rows to skip, in the given order, before the first row fetched
+        :return: list with the rows of the page
+        """
+        command_ = f'SELECT * FROM \'{self.source_name}\''
         if not string_helper.is_none_empty_space(order_by_):
             command_ += f' ORDER BY {order_by_}'
-        return self.db.get(command_).fetchall()
+        command_ += ' LIMIT ? OFFSET ?'
+        return self.db.get(command_, (limit_, offset_), self.model).fetchall()
+
+    def search(self,
+               filters_: dict = None,
+               order_by_: tuple = ('id',),
+               descending_: bool = False,
+               limit_: int = -1,
+               offset_: int = 0) -> []:
+        """
+        Fetches the rows of the table that match the filters, sorted and paginated by the database, so indexes on the
+          filtered and sorted columns are used instead of fetching the whole table
+        :param filters_: values to match by column, see filter_clause()
+        :param order_by_: columns to order the rows by, the last one should be unique (e.g. id) to get a stable order
+        :param descending_: flag to order the rows descending
+        :param limit_: maximum number of rows to fetch, -1 for no limit
+        :param offset_: number of rows to skip, in the given order, before the first row fetched
+        :return: list with the rows found
+        """
+        return self.__search_cursor(filters_, order_by_, descending_, limit_, offset_).fetchall()
+
+    def iter_search(self,
+                    filters_: dict = None,
+                    order_by_: tuple = ('id',),
+                    descending_: bool = False,
+                    batch_size_: int = DEFAULT_FETCH_BATCH_SIZE):
+        """
+        Streams the rows of the table that match the filters, like search() but they are fetched in batches while they
+          are iterated, see iter_rows()
+        :param batch_size_: number of rows fetched from the cursor at once
+        """
+        yield from self.__stream(self.__search_cursor(filters_, order_by_, descending_), batch_size_)
+
+    def __search_cursor(self,
+                        filters_: dict,
+                        order_by_: tuple,
+                        descending_: bool,
+                        limit_: int = -1,
+                        offset_: int = 0):
+        """
+        Cursor over the rows of the table that match the filters, see search()
+        """
+        where_, params_ = self.__where(filters_)
+        command_ = (f'SELECT * FROM \'{self.source_name}\'{where_} '
+                    f'ORDER BY {self.order_clause(order_by_, descending_)} LIMIT ? OFFSET ?')
+        return self.db.get(command_, params_ + (limit_, offset_), self.model)
+
+    def __stream(self,
+                 cursor_,
+                 batch_size_: int):
+        """
+        Yields the rows of a cursor, fetching them in batches. Each batch is fetched on behalf of the request that
+          iterates the stream, so only that request interrupts it, see ConnectionPool.interrupt.
+        """
+        if batch_size_ < 1:
+            raise ValueError('The batch size must be greater than zero.')
+
+        try:
+            while True:
+                self.db.claim()
+                rows_ = cursor_.fetchmany(batch_size_)
+                if not rows_:
+                    break
+                yield from rows_
+        finally:
+            # Also when the iteration is abandoned, so the statement does not keep the connection reading
+            cursor_.close()
+
+    def search_count(self,
+                     filters_: dict = None) -> int:
+        """
+        Counts the rows of the table that match the filters, see search()
+        """
+        where_, params_ = self.__where(filters_)
+        return self.db.get_value(f'SELECT COUNT(*) FROM \'{self.count_source(filters_)}\'{where_}', 0, params_)
+
+    def count_source(self,
+                     filters_: dict = None) -> str:
+        """
+        Table or view the rows are counted on, see count() and search_count(): the source of the rows, unless a
+          subclass reads them from a view with a row per row of the table, and the filters do not need its columns
+        :param filters_: filters of the count, see filter_clause()
+        """
+        return self.source_name
+
+    def filter_clause(self,
+                      filters_: dict) -> tuple:
+        """
+        Translates filters into the conditions of a WHERE clause. Filters whose value is None or empty are ignored.
+        :param filters_: values by filter name, which is a column name to match it, or a column name ended in _prefix
+          to match the values of the column starting with it, case-insensitive
+        :return: tuple (list of conditions with ? placeholders, list of the values bound to them)
+        """
+        columns_ = self.columns()
+        conditions_ = []
+        params_ = []
+        for filter_, value_ in filters_.items():
+            if value_ is None or value_ == '':
+                continue
+
+            if filter_.endswith('_prefix'):
+                column_ = filter_[:-len('_prefix')]
+                # LIKE is case-insensitive, like the NOCASE indexes which are used to find the prefix
+                condition_ = f'{column_} LIKE ? ESCAPE \'\\\''
+                value_ = ''.join('\\' + char_ if char_ in '\\%_' else char_ for char_ in str(value_)) + '%'
+            else:
+                column_ = filter_
+                condition_ = f'{column_} = ?'
+
+            if column_ not in columns_:
+                raise ValueError(f'Unknown column {column_} in {self.table_name} table.')
+            conditions_.append(condition_)
+            params_.append(value_)
+
+        return conditions_, params_
+
+    def order_clause(self,
+                     order_by_: tuple,
+                     descending_: bool = False) -> str:
+        """
+        Translates columns into an ORDER BY clause, validating them
+        :param order_by_: columns to order the rows by
+        :param descending_: flag to order the rows descending
+        """
+        columns_ = self.columns()
+        unknown_ = [column_ for column_ in order_by_ if column_ not in columns_]
+        if unknown_ or not order_by_:
+            raise ValueError(f'Invalid columns to order {self.table_name} table: {", ".join(unknown_)}.')
+
+        direction_ = 'DESC' if descending_ else 'ASC'
+        return ', '.join(f'{column_} {direction_}' for column_ in order_by_)
+
+    def __where(self,
+                filters_: dict) -> tuple:
+        """
+        WHERE clause, and the values bound to it, for the filters
+        """
+        if not filters_:
+            return '', ()
+        conditions_, params_ = self.filter_clause(filters_)
+        if not conditions_:
+            return '', ()
+        return ' WHERE ' + ' AND '.join(conditions_), tuple(params_)
+
+    def lookup(self,
+               column_: str) -> []:
+        """
+        Fetches the values of a column, ordered, e.g. the options of a combobox
+        :param column_: column whose values are fetched
+        :return: list of values
+        """
+        command_ = f'SELECT {column_} FROM \'{self.source_name}\' ORDER BY {self.order_clause((column_,))}'
+        return [row_[0] for row_ in self.db.get(command_).fetchall()]
+
+    def count(self) -> int:
+        """
+        Counts the rows of the table
+        """
+        return self.db.get_value(f'SELECT COUNT(*) FROM \'{self.count_source()}\'', 0)
+
+    def fetch_by_id(self,
+                    id_: int):
+        """
+        Fetches a single row of the table
+        :param id_: identifier of the row
+        :return: the row, or None if there is no row with that identifier
+        """
+        command_ = f'SELECT * FROM \'{self.source_name}\' WHERE id = ?'
+        return self.db.get(command_, (id_,), self.model).fetchone()
+
+    def columns(self) -> []:
+        """
+        Names of the columns of the table, in the order they are fetched
+        """
+        if self.__columns is None:
+            self.__columns = [row_[1] for row_ in
+                              self.db.get(f'PRAGMA table_info(\'{self.source_name}\')').fetchall()]
+        return self.__columns
+
+    def save_record(self,
+                    id_: int | None,
+                    values_: dict) -> int:
+        """
+        Save a record in the database, from its values by column name
+        :param id_: identifier of the record, None or 0 to insert a new one
+        :param values_: values of the record, by column name
+        :return: identifier of the saved record, assigned by the database if it is a new one
+        """
+        columns_ = self.columns()
+        unknown_ = [column_ for column_ in values_ if column_ not in columns_ or column_ == 'id']
+        if unknown_ or not values_:
+            raise ValueError(f'Invalid columns for {self.table_name} table: {", ".join(unknown_)}.')
+
+        names_ = list(values_)
+        params_ = tuple(values_[name_] for name_ in names_)
+        if id_ is None or id_ == 0:
+            command_ = (f'INSERT INTO \'{self.table_name}\' ({", ".join(names_)}) '
+                        f'VALUES ({", ".join("?" * len(names_))})')
+            return self.execute(command_, params_).lastrowid
+
+        command_ = (f'UPDATE \'{self.table_name}\' SET {", ".join(f"{name_} = ?" for name_ in names_)} '
+                    f'WHERE id = ?')
+        self.execute(command_, params_ + (id_,))
+        return id_
 
     def delete(self,
                id_: int):
         """
         Delete a record from the database
         """
-        command_ = f'DELETE FROM \'{self.table_name}\' WHERE id = {id_}'
-        return self.db.execute(command_)
+        command_ = f'DELETE FROM \'{self.table_name}\' WHERE id = ?'
+        return self.db.execute(command_, (id_,))
 
     def table_exists(self) -> bool:
         """
@@ -118,6 +392,6 @@ class Table:
         if string_helper.is_none_empty_space(self.table_name):
             raise ValueError('Table name is required.')
 
-        command_ = f'SELECT COUNT(*) FROM sqlite_master WHERE type = \'table\' AND name = \'{self.table_name}\''
-        counter_ = self.db.get_value(command_, 0)
+        command_ = 'SELECT COUNT(*) FROM sqlite_master WHERE type = \'table\' AND name = ?'
+        counter_ = self.db.get_value(command_, 0, (self.table_name,))
         return counter_ > 0
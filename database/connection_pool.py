@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# atexit: module which defines functions to register and unregister cleanup functions.
+import atexit
+# contextlib: module which provides utilities for common tasks involving the with statement.
+import contextlib
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# queue: module which implements multi-producer, multi-consumer queues, useful in threaded programming.
+import queue
+# sqlite3: C library that provides a lightweight disk-based sql without a separate server,
+#          process and allows accessing the sql using a nonstandard variant of the SQL query language
+import sqlite3
+# sys: module which provides access to some variables used or maintained by the interpreter and to functions that
+#      interact strongly with the interpreter.
+import sys
+# threading: module which constructs higher-level threading interfaces on top of the lower level _thread module.
+import threading
+
+# --- App modules ---
+from . import query_tracer
+
+DEFAULT_DATABASE_FILE = 'movies.db'
+DEFAULT_POOL_SIZE = 4               # Maximum number of connections opened at the same time
+DEFAULT_POOL_TIMEOUT = 5.0          # Seconds to wait for a free connection when the pool is exhausted
+DEFAULT_CACHED_STATEMENTS = 256     # Prepared statements kept per connection by the sqlite3 statement cache
+DEFAULT_PROFILE = 'interactive'
+
+# Engine profiles: PRAGMAs applied to every connection, in order. cache_size is in KiB when negative, mmap_size in
+#   bytes.
+PROFILES = {
+    # GUI: WAL lets readers run while a write commits, NORMAL synchronous is durable across application crashes (only
+    #   a power loss may lose the last commits, never corrupt the database)
+    'interactive': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,           # 16 MB
+        'mmap_size': 256 * 1024 ** 2,
+        'temp_store': 'MEMORY',
+    },
+    # Imports: no fsync and a large page cache, a crash during the import may corrupt the database, so it is meant
+    #   for imports that can be repeated from their files
+    'bulk_load': {
+        'busy_timeout': 30000,
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -256000,          # 256 MB
+        'mmap_size': 1024 ** 3,
+        'temp_store': 'MEMORY',
+    },
+    # Reports and read replicas: the database is opened read-only, reads are served from the memory map
+    'read_only': {
+        'busy_timeout': 5000,
+        'query_only': 'ON',
+        'cache_size': -64000,           # 64 MB
+        'mmap_size': 1024 ** 3,
+        'temp_store': 'MEMORY',
+    },
+    # In-memory read replica (see read_replica): its tables are read without locks, so the writes applied to it are
+    #   not blocked by the streams still open. Each read is consistent, its rows are read at once while no
+    #   transaction is being applied (see read_replica.ReplicaCursor)
+    'replica': {
+        'read_uncommitted': 'ON',
+        'query_only': 'ON',
+        'temp_store': 'MEMORY',
+    },
+}
+READ_ONLY_PROFILES = ('read_only',)
+REPLICA_PROFILE = 'replica'     # The database of its pools is the URI of a memory database
+
+
+def default_database() -> str:
+    """
+    Identifies the application directory, and inside it the database file
+    :return: full path of the database file
+    """
+    folder_ = os.path.abspath(os.path.dirname(str(sys.modules['__main__'].__file__)))
+    return os.path.join(folder_, DEFAULT_DATABASE_FILE)
+
+
+# Request being run by each thread, see request()
+_requests = threading.local()
+
+
+@contextlib.contextmanager
+def request(request_):
+    """
+    Runs a with block on behalf of a request (e.g. the future of a database worker request): the connections borrowed
+      or claimed meanwhile are bound to it, so the request can be interrupted on its own, see ConnectionPool.interrupt
+    """
+    _requests.current = request_
+    try:
+        yield
+    finally:
+        _requests.current = None
+
+
+def current_request():
+    return getattr(_requests, 'current', None)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of long-lived SQLite connections, all of them opened with the same configuration.
+    Connections are borrowed with acquire() and handed back with release(), so they are reused instead of being opened
+      and closed for each SQL statement.
+    """
+    def __init__(self,
+                 database_: str,
+                 max_size_: int = DEFAULT_POOL_SIZE,
+                 timeout_: float = DEFAULT_POOL_TIMEOUT,
+                 profile_: str | None = DEFAULT_PROFILE):
+        """
+        Class constructor
+        :param database_: full path of the SQLite database file, or the URI of the memory database with the replica
+          profile
+        :param max_size_: maximum number of connections opened at the same time
+        :param timeout_: seconds to wait for a free connection when all of them are borrowed
+        :param profile_: name of the engine profile applied to every connection, see PROFILES, None to keep the
+          SQLite defaults
+        """
+        if max_size_ < 1:
+            raise ValueError('The pool size must be greater than zero.')
+        if profile_ is not None and profile_ not in PROFILES:
+            raise ValueError(f'Unknown engine profile: {profile_}. Available: {", ".join(PROFILES)}.')
+
+        self.database = database_
+        self.max_size = max_size_
+        self.timeout = timeout_
+        self.profile = profile_
+
+        self.__idle = queue.LifoQueue()     # LIFO, so the most recently used (warm) connection is reused first
+        self.__opened = 0
+        self.__borrowed = {}                # borrowed connection -> request it works for, see request()
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+    @property
+    def opened(self) -> int:
+        """
+        Number of connections currently opened by the pool, either idle or borrowed
+        """
+        return self.__opened
+
+    def __open(self) -> sqlite3.Connection:
+        """
+        Opens a new connection, always with the same settings
+        """
+        # check_same_thread is disabled because a connection can be borrowed by different threads over its lifetime,
+        #   although only one of them uses it at a time
+        database_ = self.database
+        uri_ = self.profile in READ_ONLY_PROFILES or self.profile == REPLICA_PROFILE
+        if self.profile in READ_ONLY_PROFILES:
+            # --- Python modules ---
+            # urllib.request: module which defines functions and classes which help in opening URLs, here to build
+            #                 file: URIs. Imported on first use, since it loads the whole HTTP stack.
+            import urllib.request
+            database_ = f'file:{urllib.request.pathname2url(os.path.abspath(database_))}?mode=ro'
+        connection_ = sqlite3.connect(database_, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                                      cached_statements=DEFAULT_CACHED_STATEMENTS, uri=uri_)
+
+        # Enforce the foreign keys, e.g. movies.genre_id, which SQLite does not do by default
+        connection_.execute('PRAGMA foreign_keys = ON')
+        for pragma_, value_ in PROFILES.get(self.profile, {}).items():
+            connection_.execute(f'PRAGMA {pragma_} = {value_}')
+
+        tracer_ = query_tracer.get_tracer()
+        if tracer_ is not None:
+            tracer_.attach(connection_)
+        return connection_
+
+    def open_dedicated(self) -> sqlite3.Connection:
+        """
+        Opens a connection outside the pool, with the same settings, e.g. for a cache that must watch the changes
+          made through the pooled connections. The caller owns it and must close it.
+        """
+        return self.__open()
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Borrows a connection from the pool, opening a new one if the pool is not yet full
+        :return: connection that must be returned with release()
+        """
+        connection_ = self.__take()
+        with self.__lock:
+            self.__borrowed[connection_] = current_request()
+        return connection_
+
+    def __take(self) -> sqlite3.Connection:
+        """
+        Takes an idle connection, or opens a new one, or waits for one to be released
+        """
+        if self.__closed:
+            raise RuntimeError('The connection pool is closed.')
+
+        # Reuse an idle connection, if any
+        try:
+            return self.__idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        # Open a new connection while the pool is not full
+        with self.__lock:
+            can_open_ = self.__opened < self.max_size
+            if can_open_:
+                self.__opened += 1
+        if can_open_:
+            try:
+                return self.__open()
+            except Exception:
+                with self.__lock:
+                    self.__opened -= 1
+                raise
+
+        # Pool exhausted, wait for a connection to be released
+        try:
+            return self.__idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f'No database connection released within {self.timeout} seconds.')
+
+    def release(self,
+                connection_: sqlite3.Connection):
+        """
+        Returns a borrowed connection to the pool
+        :param connection_: connection obtained with acquire()
+        """
+        if connection_ is None:
+            return
+
+        with self.__lock:
+            self.__borrowed.pop(connection_, None)
+
+        # A pending transaction must not leak to the next borrower
+        if connection_.in_transaction:
+            connection_.rollback()
+
+        if self.__closed:
+            self.__discard(connection_)
+        else:
+            self.__idle.put(connection_)
+
+    def claim(self,
+              connection_: sqlite3.Connection):
+        """
+        Binds a borrowed connection to the request being run by the calling thread, e.g. a stream that goes on
+          reading on behalf of a later request than the one which borrowed the connection
+        """
+        with self.__lock:
+            if connection_ in self.__borrowed:
+                self.__borrowed[connection_] = current_request()
+
+    def interrupt(self,
+                  request_) -> int:
+        """
+        Interrupts the SQL statements running on the connections bound to a request, which fail with
+          sqlite3.OperationalError. The connections of other requests, e.g. their suspended streams, are not affected.
+        :param request_: request, see request()
+        :return: number of connections interrupted
+        """
+        if request_ is None:
+            return 0
+        with self.__lock:
+            connections_ = [connection_ for connection_, owner_ in self.__borrowed.items() if owner_ is request_]
+            for connection_ in connections_:
+                connection_.interrupt()
+        return len(connections_)
+
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        Borrows a connection for the duration of a with block
+        """
+        connection_ = self.acquire()
+        try:
+            yield connection_
+        finally:
+            self.release(connection_)
+
+    def close_all(self):
+        """
+        Closes every idle connection and prevents new ones from being opened. Connections still borrowed are closed
+          as soon as they are released.
+        """
+        self.__closed = True
+        while True:
+            try:
+                connection_ = self.__idle.get_nowait()
+            except queue.Empty:
+                break
+            self.__discard(connection_)
+
+    def __discard(self,
+                  connection_: sqlite3.Connection):
+        with self.__lock:
+            self.__opened -= 1
+        connection_.close()
+
+
+# Process-wide pool, created on first use
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Gets the process-wide connection pool, creating it with the default settings if needed
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(default_database())
+        return _pool
+
+
+def configure(database_: str = None,
+              max_size_: int = DEFAULT_POOL_SIZE,
+              timeout_: float = DEFAULT_POOL_TIMEOUT,
+              profile_: str | None = DEFAULT_PROFILE) -> ConnectionPool:
+    """
+    Replaces the process-wide connection pool, e.g. to point the application to another database file.
+    The previous pool, if any, is shut down.
+    :param database_: full path of the SQLite database file, if it is None the default database is used
+    :param max_size_: maximum number of connections opened at the same time
+    :param timeout_: seconds to wait for a free connection when all of them are borrowed
+    :param profile_: name of the engine profile applied to every connection, see PROFILES
+    :return: the new pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+        _pool = ConnectionPool(database_ or default_database(), max_size_, timeout_, profile_)
+        return _pool
+
+
+def shutdown():
+    """
+    Closes every pooled connection. It must be called when the application exits.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+
+# Safety net in case the application does not call shutdown() explicitly
+atexit.register(shutdown)
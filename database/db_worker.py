@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# concurrent.futures: module which provides a high-level interface for asynchronously executing callables.
+from concurrent.futures import Future
+# queue: module which implements multi-producer, multi-consumer queues, useful in threaded programming.
+import queue
+# threading: module which constructs higher-level threading interfaces on top of the lower level _thread module.
+import threading
+
+# --- App modules ---
+from . import connection_pool
+from . import read_replica
+
+
+class DbWorker:
+    """
+    Dedicated thread that runs the database requests, one at a time and in order of arrival, so the caller (e.g. the
+      Tk main loop) is never blocked by database I/O. Each request is answered through a future.
+    """
+    def __init__(self):
+        """
+        Class constructor
+        """
+        self.__requests = queue.Queue()
+        self.__latest = {}                  # key -> future of the latest request submitted with that key
+        self.__running = None               # future of the request being run
+        self.__lock = threading.Lock()
+        self.__thread = threading.Thread(target=self.__run, name='DbWorker', daemon=True)
+        self.__thread.start()
+
+    def submit(self,
+               function_,
+               *args_,
+               key_: str = None,
+               **kwargs_) -> Future:
+        """
+        Queues a request to run function_(*args_, **kwargs_) on the worker thread
+        :param function_: callable that accesses the database
+        :param key_: optional request key, a new request supersedes the previous request with the same key: it is
+          cancelled if it did not start yet, otherwise its SQL statement is interrupted and its result is reported as
+          superseded by is_latest()
+        :return: future with the result of the request
+        """
+        future_ = Future()
+        if key_ is not None:
+            with self.__lock:
+                previous_ = self.__latest.get(key_)
+                self.__latest[key_] = future_
+            if previous_ is not None and not previous_.cancel():
+                self.__interrupt(previous_)
+
+        self.__requests.put((future_, function_, args_, kwargs_))
+        return future_
+
+    def is_latest(self,
+                  key_: str,
+                  future_: Future) -> bool:
+        """
+        Indicates whether a future belongs to the latest request submitted with a key, i.e. it was not superseded
+        """
+        if key_ is None:
+            return True
+        with self.__lock:
+            return self.__latest.get(key_) is future_
+
+    def stop(self,
+             wait_: bool = True):
+        """
+        Stops the worker thread after the requests already queued
+        :param wait_: flag to wait for the thread to finish
+        """
+        self.__requests.put(None)
+        if wait_ and threading.current_thread() is not self.__thread:
+            self.__thread.join()
+
+    def __interrupt(self,
+                    future_: Future):
+        """
+        Interrupts the SQL statement of a request, if it is still running, so the worker moves on to the next one. Only
+          the connections bound to that request are interrupted, not the streams left open by other requests.
+        """
+        with self.__lock:
+            # Holding the lock, the worker cannot start the next request meanwhile
+            if self.__running is future_:
+                connection_pool.get_pool().interrupt(future_)
+                read_replica.interrupt(future_)
+
+    def __run(self):
+        while True:
+            request_ = self.__requests.get()
+            if request_ is None:
+                break
+
+            future_, function_, args_, kwargs_ = request_
+            # Cancelled (superseded) requests are skipped
+            if not future_.set_running_or_notify_cancel():
+                continue
+
+            with self.__lock:
+                self.__running = future_
+            try:
+                with connection_pool.request(future_):
+                    result_ = function_(*args_, **kwargs_)
+                future_.set_result(result_)
+            except BaseException as e:
+                future_.set_exception(e)
+            finally:
+                with self.__lock:
+                    self.__running = None
+
+
+# Process-wide worker, created on first use
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker() -> DbWorker:
+    """
+    Gets the process-wide database worker, starting it if needed
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = DbWorker()
+        return _worker
+
+
+def shutdown():
+    """
+    Stops the database worker, after the requests already queued. It must be called when the application exits,
+      before the connection pool is shut down.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is not None:
+            _worker.stop()
+            _worker = None
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# sqlite3: C library that provides a lightweight disk-based sql without a separate server,
+#          process and allows accessing the sql using a nonstandard variant of the SQL query language
+import sqlite3
+# threading: module which constructs higher-level threading interfaces on top of the lower level _thread module.
+import threading
+
+# --- App modules ---
+from . import connection_pool
+from model.genre_model import Genre
+
+
+class GenreRepository:
+    """
+    In-process cache of the genres, with lookups by id and by name that need no round trip to the database.
+    The cache is validated in two steps on a dedicated connection: PRAGMA data_version changes only when another
+      connection (e.g. a pooled one, or another process) commits a change to the database, and only then the version of
+      the genres, bumped by triggers on each change of the genres table, is read. So the genres are read again only
+      after they really changed, not after every commit of the movies.
+    """
+    def __init__(self,
+                 pool_: connection_pool.ConnectionPool):
+        """
+        Class constructor
+        :param pool_: connection pool, whose settings are used to open the dedicated connection
+        """
+        self.database = pool_.database
+        self.__connection = pool_.open_dedicated()
+        self.__lock = threading.Lock()
+        self.__data_version = None      # data_version of the database when the genres were checked, None to read them
+        self.__genres_version = None    # Version of the genres when they were read, None if it is not tracked
+
+        self.__genres = []              # Genres ordered by name
+        self.__by_id = {}               # id -> Genre
+        self.__by_name = {}             # case-folded name -> Genre
+
+    def all(self) -> []:
+        """
+        Gets the genres, ordered by name
+        :return: list of model.genre_model.Genre
+        """
+        self.__refresh()
+        return list(self.__genres)
+
+    def names(self) -> []:
+        """
+        Gets the names of the genres, ordered
+        """
+        self.__refresh()
+        return [genre_.name for genre_ in self.__genres]
+
+    def by_id(self,
+              id_: int) -> Genre | None:
+        """
+        Gets a genre by its identifier
+        :return: the genre, or None if there is no genre with that identifier
+        """
+        self.__refresh()
+        return self.__by_id.get(id_)
+
+    def by_name(self,
+                name_: str) -> Genre | None:
+        """
+        Gets a genre by its name, ignoring case and surrounding spaces
+        :return: the genre, or None if there is no genre with that name
+        """
+        self.__refresh()
+        return self.__by_name.get(name_.strip().casefold()) if name_ else None
+
+    def name_map(self,
+                 connection_: sqlite3.Connection = None) -> dict:
+        """
+        Gets the genres by case-folded name, to look up many names with a single check of the cache
+        :param connection_: connection the version of the genres is checked on instead, e.g. the one a movie is saved
+          on: a writer does not pay for the dedicated connection to catch up with its own commits, and within a
+          transaction the genres are the ones it sees
+        """
+        self.__refresh(connection_)
+        return dict(self.__by_name)
+
+    def invalidate(self):
+        """
+        Forces the genres to be read again on the next lookup
+        """
+        with self.__lock:
+            self.__data_version = None
+            self.__genres_version = None
+
+    def close(self):
+        """
+        Closes the dedicated connection
+        """
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+    def __refresh(self,
+                  connection_: sqlite3.Connection = None):
+        """
+        Reads the genres again if the database changed since they were read
+        :param connection_: connection the version of the genres is checked on, see name_map
+        """
+        with self.__lock:
+            if self.__connection is None:
+                raise RuntimeError('The genre repository is closed.')
+
+            if connection_ is not None and self.__genres_version is not None:
+                if self.__read_genres_version(connection_) == self.__genres_version:
+                    return
+
+            data_version_ = self.__connection.execute('PRAGMA data_version').fetchone()[0]
+            if data_version_ == self.__data_version:
+                return
+
+            genres_version_ = self.__read_genres_version(self.__connection)
+            if genres_version_ is not None and genres_version_ == self.__genres_version:
+                # Another table changed
+                self.__data_version = data_version_
+                return
+
+            try:
+                cursor_ = self.__connection.execute('SELECT id, name, created_on FROM genres ORDER BY name ASC')
+                cursor_.row_factory = Genre.row_factory(cursor_.description)
+                self.__genres = cursor_.fetchall()
+            except sqlite3.OperationalError as e:
+                if 'no such table' not in str(e):
+                    raise e
+                # Genres table does not exist yet
+                self.__genres = []
+
+            self.__by_id = {genre_.id: genre_ for genre_ in self.__genres}
+            self.__by_name = {genre_.name.strip().casefold(): genre_ for genre_ in self.__genres}
+            self.__data_version = data_version_
+            self.__genres_version = genres_version_
+
+    @staticmethod
+    def __read_genres_version(connection_: sqlite3.Connection) -> int | None:
+        """
+        Reads the version of the genres on a connection
+        :return: the version, None if the database does not track it yet (it is added by a migration)
+        """
+        try:
+            rows_ = connection_.execute('SELECT version FROM genres_version WHERE id = 1').fetchall()
+        except sqlite3.OperationalError as e:
+            if 'no such table' not in str(e):
+                raise e
+            return None
+        return rows_[0][0] if rows_ else None
+
+
+# Process-wide repository, created on first use
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_repository() -> GenreRepository:
+    """
+    Gets the process-wide genre repository, over the database of the process-wide connection pool
+    """
+    global _repository
+    pool_ = connection_pool.get_pool()
+    with _repository_lock:
+        if _repository is None or _repository.database != pool_.database:
+            if _repository is not None:
+                _repository.close()
+            _repository = GenreRepository(pool_)
+        return _repository
+
+
+def shutdown():
+    """
+    Closes the process-wide genre repository
+    """
+    global _repository
+    with _repository_lock:
+        if _repository is not None:
+            _repository.close()
+            _repository = None
@@ -1,18 +1,58 @@
 # -*- coding: utf-8 -*-
 
+# --- Python modules ---
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+
 # --- App modules ---
+from . import genre_repository
 from .base_table_class import Table
-from .sql_connection import SqlConnection
+from helper import string_helper
+from model import genre_model
 
 
 class Genres(Table):
     """
     Table representation Genres
     """
+    model = genre_model.Genre
+
     def __init__(self):
         """
         Class constructor
         """
-        # Open sql connection
         super().__init__(type(self).__name__)
-        self.db = SqlConnection()
+
+    def create_table(self,
+                     sql_script_file_: str = '',
+                     drop_if_exists_: bool = False) -> bool:
+        """
+        Creates the table, along with the version of the genres that the genre cache checks, see Table.create_table
+        """
+        if not super().create_table(sql_script_file_, drop_if_exists_):
+            return False
+
+        with open(os.path.join(self.db.sql_scripts_folder(), f'create_{self.table_name}_version.sql'), 'r') as file_:
+            self.db.execute_script(file_.read())
+        return True
+
+    def save_record(self,
+                    id_: int | None,
+                    values_: dict) -> int:
+        """
+        Save a genre in the database, validating its name
+        :return: identifier of the saved record, assigned by the database if it is a new one
+        """
+        if string_helper.is_none_empty_space(values_.get('name')):
+            raise ValueError('The genre name cannot be empty.')
+
+        return super().save_record(id_, dict(values_, name=values_['name'].strip()))
+
+    def lookup(self,
+               column_: str) -> []:
+        """
+        Fetches the values of a column, ordered. The names come from the genre cache.
+        """
+        if column_ == 'name':
+            return genre_repository.get_repository().names()
+        return super().lookup(column_)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# importlib: package which provides the implementation of the import statement.
+import importlib
+# json: module which exposes an API to encode and decode JSON documents.
+import json
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# pkgutil: module which provides utilities for the import system, in particular package support.
+import pkgutil
+# re: module which provides regular expression matching operations.
+import re
+# sqlite3: C library that provides a lightweight disk-based sql without a separate server,
+#          process and allows accessing the sql using a nonstandard variant of the SQL query language
+import sqlite3
+
+# --- App modules ---
+from . import connection_pool, versions
+from .sql_connection import SqlConnection
+
+DEFAULT_BACKFILL_CHUNK_SIZE = 5000      # Rows updated on each transaction of a backfill
+BACKFILLS_TABLE = 'schema_backfills'    # Backfills scheduled by the migrations and not yet completed
+MIGRATION_NAME_PATTERN = re.compile(r'^v(\d+)_(\w+)$')
+
+
+class Schema:
+    """
+    Operations available to the migrations, on the connection that applies them. All of them are idempotent, and
+      none rewrites a whole table: ADD COLUMN and CREATE INDEX only touch the schema and the new index, and backfills
+      are deferred until the schema changes are committed, then run in small transactions.
+    """
+    def __init__(self,
+                 connection_: sqlite3.Connection):
+        """
+        Class constructor
+        :param connection_: connection with the transaction of the migrations open
+        """
+        self.connection = connection_
+
+    def execute(self,
+                command_: str,
+                params_: tuple | dict = ()) -> sqlite3.Cursor:
+        """
+        Executes a parameterized command, within the transaction
+        """
+        return self.connection.execute(command_, params_)
+
+    def run_script(self,
+                   sql_script_file_: str):
+        """
+        Executes the statements of a script of the sql folder, one by one so they stay within the transaction
+          (executescript() would commit it)
+        :param sql_script_file_: file name of the script, in the sql folder
+        """
+        with open(os.path.join(SqlConnection.sql_scripts_folder(), sql_script_file_), 'r') as file_:
+            sql_script_ = file_.read()
+
+        statement_ = ''
+        for line_ in sql_script_.splitlines(keepends=True):
+            statement_ += line_
+            if sqlite3.complete_statement(statement_):
+                self.connection.execute(statement_)
+                statement_ = ''
+        if statement_.strip() and not all(line_.strip().startswith('--') or not line_.strip()
+                                          for line_ in statement_.splitlines()):
+            raise ValueError(f'Incomplete SQL statement at the end of {sql_script_file_}.')
+
+    def table_exists(self,
+                     table_name_: str) -> bool:
+        return self.__object_exists('table', table_name_)
+
+    def index_exists(self,
+                     index_name_: str) -> bool:
+        return self.__object_exists('index', index_name_)
+
+    def columns(self,
+                table_name_: str) -> []:
+        """
+        Names of the columns of a table
+        """
+        return [row_[1] for row_ in self.connection.execute(f'PRAGMA table_info(\'{table_name_}\')').fetchall()]
+
+    def add_column(self,
+                   table_name_: str,
+                   column_: str,
+                   definition_: str) -> bool:
+        """
+        Adds a column to a table, if it does not have it yet. SQLite only changes the schema, the rows are not
+          rewritten, so it is instantaneous no matter the size of the table.
+        :param table_name_: table to add the column to
+        :param column_: name of the column
+        :param definition_: type and constraints of the column, e.g. 'INTEGER NOT NULL DEFAULT 0'. NOT NULL columns
+          need a default value.
+        :return: True if the column was added, False if it already existed
+        """
+        if column_ in self.columns(table_name_):
+            return False
+        self.connection.execute(f'ALTER TABLE {table_name_} ADD COLUMN {column_} {definition_}')
+        return True
+
+    def add_index(self,
+                  index_name_: str,
+                  table_name_: str,
+                  columns_: tuple,
+                  unique_: bool = False) -> bool:
+        """
+        Creates an index, if it does not exist yet
+        :param columns_: indexed columns, each one may include COLLATE and ASC/DESC
+        :return: True if the index was created, False if it already existed
+        """
+        if self.index_exists(index_name_):
+            return False
+        self.connection.execute(f'CREATE {"UNIQUE " if unique_ else ""}INDEX IF NOT EXISTS {index_name_} '
+                                f'ON {table_name_} ({", ".join(columns_)})')
+        return True
+
+    def backfill(self,
+                 table_name_: str,
+                 assignments_: str,
+                 where_: str,
+                 params_: tuple = (),
+                 chunk_size_: int = DEFAULT_BACKFILL_CHUNK_SIZE):
+        """
+        Schedules an update of the existing rows, e.g. of a column just added, run after the schema changes are
+          committed in transactions of chunk_size_ rows, so writers are never blocked for long. It is saved in the
+          database along with the schema changes, so if it is interrupted, the next upgrade() completes it.
+        :param table_name_: table to update
+        :param assignments_: SET clause, e.g. 'genre_id = (SELECT ...)'
+        :param where_: condition of the rows still to update, it must no longer hold once a row is updated, e.g.
+          'genre_id IS NULL'
+        :param params_: values bound to the placeholders of assignments_ and where_, in that order
+        :param chunk_size_: rows updated on each transaction
+        """
+        if chunk_size_ < 1:
+            raise ValueError('The chunk size must be greater than zero.')
+        self.connection.execute(f'CREATE TABLE IF NOT EXISTS {BACKFILLS_TABLE} '
+                                f'(id INTEGER PRIMARY KEY, table_name TEXT, assignments TEXT, where_clause TEXT, '
+                                f'params TEXT, chunk_size INTEGER)')
+        self.connection.execute(f'INSERT INTO {BACKFILLS_TABLE} '
+                                f'(table_name, assignments, where_clause, params, chunk_size) VALUES (?, ?, ?, ?, ?)',
+                                (table_name_, assignments_, where_, json.dumps(list(params_)), chunk_size_))
+
+    def __object_exists(self,
+                        type_: str,
+                        name_: str) -> bool:
+        command_ = 'SELECT COUNT(*) FROM sqlite_master WHERE type = ? AND name = ?'
+        return self.connection.execute(command_, (type_, name_)).fetchone()[0] > 0
+
+
+def discover() -> []:
+    """
+    Finds the migrations of the versions package
+    :return: list of tuples (version, name, module), ordered by version
+    """
+    migrations_ = []
+    for module_info_ in pkgutil.iter_modules(versions.__path__):
+        match_ = MIGRATION_NAME_PATTERN.match(module_info_.name)
+        if match_ is None:
+            continue
+        module_ = importlib.import_module(f'{versions.__name__}.{module_info_.name}')
+        migrations_.append((int(match_.group(1)), match_.group(2), module_))
+
+    migrations_.sort(key=lambda migration_: migration_[0])
+    numbers_ = [migration_[0] for migration_ in migrations_]
+    if len(set(numbers_)) != len(numbers_):
+        raise ValueError(f'Duplicated migration versions: {numbers_}.')
+    return migrations_
+
+
+def current_version(connection_: sqlite3.Connection) -> int:
+    """
+    Schema version of a database, stored in its header as PRAGMA user_version
+    """
+    return connection_.execute('PRAGMA user_version').fetchone()[0]
+
+
+def upgrade(pool_: connection_pool.ConnectionPool = None) -> []:
+    """
+    Brings the schema of the database up to date. It must be called at startup, before the tables are used.
+    The pending migrations are applied in order within a single transaction, so either all of them or none are
+      applied, then the backfills they scheduled are run in chunks.
+    :param pool_: connection pool of the database, if it is None the process-wide pool is used
+    :return: names of the migrations applied
+    """
+    pool_ = pool_ or connection_pool.get_pool()
+    migrations_ = discover()
+    latest_ = migrations_[-1][0] if migrations_ else 0
+
+    with pool_.connection() as connection_:
+        version_ = current_version(connection_)
+        if version_ > latest_:
+            raise RuntimeError(f'The database schema version {version_} is newer than this application '
+                               f'(version {latest_}).')
+
+        applied_ = []
+        schema_ = Schema(connection_)
+        if version_ < latest_:
+            # Tables may be rebuilt, so foreign keys are checked once at the end (the pragma is ignored within a
+            #   transaction)
+            connection_.execute('PRAGMA foreign_keys = OFF')
+            try:
+                connection_.execute('BEGIN IMMEDIATE')
+                # Read it again holding the write lock, another process may have upgraded the database meanwhile
+                version_ = current_version(connection_)
+                for number_, name_, module_ in migrations_:
+                    if number_ > version_:
+                        module_.upgrade(schema_)
+                        applied_.append(name_)
+
+                violations_ = connection_.execute('PRAGMA foreign_key_check').fetchall()
+                if violations_:
+                    raise sqlite3.IntegrityError(f'Migrations break {len(violations_)} foreign keys, e.g. '
+                                                 f'{violations_[0]}.')
+
+                connection_.execute(f'PRAGMA user_version = {latest_}')
+                connection_.commit()
+            except BaseException:
+                connection_.rollback()
+                raise
+            finally:
+                connection_.execute('PRAGMA foreign_keys = ON')
+
+        # Backfills commit chunk by chunk, including those left by an interrupted upgrade
+        if schema_.table_exists(BACKFILLS_TABLE):
+            __run_backfills(connection_)
+
+    return applied_
+
+
+def __run_backfills(connection_: sqlite3.Connection):
+    """
+    Runs the pending backfills in order, each one chunk_size rows per transaction until no row matches its condition
+    """
+    command_ = (f'SELECT id, table_name, assignments, where_clause, params, chunk_size FROM {BACKFILLS_TABLE} '
+                f'ORDER BY id')
+    for id_, table_name_, assignments_, where_, params_, chunk_size_ in connection_.execute(command_).fetchall():
+        update_ = (f'UPDATE {table_name_} SET {assignments_} '
+                   f'WHERE rowid IN (SELECT rowid FROM {table_name_} WHERE {where_} LIMIT ?)')
+        params_ = tuple(json.loads(params_)) + (chunk_size_,)
+        while True:
+            updated_ = connection_.execute(update_, params_).rowcount
+            connection_.commit()
+            if updated_ < chunk_size_:
+                break
+
+        connection_.execute(f'DELETE FROM {BACKFILLS_TABLE} WHERE id = ?', (id_,))
+        connection_.commit()
@@ -1,78 +1,402 @@
 # -*- coding: utf-8 -*-
 
+# --- Python modules ---
+# itertools: module which implements a number of iterator building blocks.
+import itertools
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# re: module which provides regular expression matching operations.
+import re
+# sqlite3: C library that provides a lightweight disk-based sql without a separate server,
+#          process and allows accessing the sql using a nonstandard variant of the SQL query language
+import sqlite3
+
 # --- App modules ---
+from . import genre_repository
 from .base_table_class import Table
 from helper import string_helper
 from model import movie_model
-from .sql_connection import SqlConnection
+
+DEFAULT_SAVE_MANY_CHUNK_SIZE = 10000    # Rows sent to the database on each executemany() call
+DEFAULT_SEARCH_TEXT_LIMIT = 50          # Rows returned by a full-text search
+FULL_TEXT_TABLE_SUFFIX = '_fts'
+VIEW_SUFFIX = '_view'
 
 
 class Movies(Table):
     """
     Table representation Movies
     """
+    model = movie_model.Movie
+
     def __init__(self):
         """
         Class constructor
         """
-        # Open sql connection
         super().__init__(type(self).__name__)
-        self.db = SqlConnection()
+        self.__full_text = None     # Whether the full-text index exists, checked on first use
+
+        # Movies are read from a view, which joins the name of their genre as the gender column
+        self.source_name = self.table_name + VIEW_SUFFIX
+
+        self.__insert_command = f"""
+            INSERT INTO {self.table_name}
+            (
+                name,
+                director,
+                genre_id,
+                duration,
+                available
+            )
+            VALUES (?, ?, ?, ?, ?)"""
+
+        self.__update_command = f"""
+            UPDATE  {self.table_name}
+               SET  name      = ?,
+                    director  = ?,
+                    genre_id  = ?,
+                    duration  = ?,
+                    available = ?
+             WHERE  id = ?"""
 
     def save(self,
-             movie: movie_model.Movie):
+             movie: movie_model.Movie) -> int:
         """
         Save a record in the database
+        :return: identifier of the saved record, assigned by the database if it is a new one
+        """
+        # Validate data, the genres are checked on the connection of the write, which sees its own commits at once
+        self.db.connect()
+        genres_ = genre_repository.get_repository().name_map(self.db.connection)
+        self.__validate(movie, genres_)
+
+        if movie.id is None or movie.id == 0:
+            return self.__insert(movie, genres_)
+        else:
+            self.__update(movie, genres_)
+            return movie.id
+
+    def drop_table(self) -> bool:
         """
+        Drops the table in database, its view and its full-text index
+        :return: True if table was dropped successfully, otherwise False
+        """
+        self.drop_full_text_index()
+        self.db.execute(f'DROP VIEW IF EXISTS {self.source_name}')
+        return super().drop_table()
+
+    def create_full_text_index(self) -> bool:
+        """
+        Creates the full-text index over the name and director of the movies, kept in sync by triggers. It is
+          optional, since it requires SQLite built with FTS5.
+        :return: True if the index was created, False if FTS5 is not available
+        """
+        sql_script_ = ''
+        for sql_script_file_ in (f'create_{self.table_name}_fts.sql', f'create_{self.table_name}_fts_triggers.sql'):
+            with open(os.path.join(self.db.sql_scripts_folder(), sql_script_file_), 'r') as file_:
+                sql_script_ += file_.read() + '\n'
+
+        try:
+            self.db.execute_script(sql_script_)
+        except sqlite3.OperationalError as e:
+            if 'fts5' not in str(e):
+                raise e
+            # SQLite was built without FTS5
+            self.db.rollback()
+            return False
+
+        self.__full_text = True
+        return True
 
-        # Validate data
+    def drop_full_text_index(self) -> bool:
+        """
+        Drops the full-text index, if it exists
+        :return: True if the index was dropped, otherwise False
+        """
+        if not self.full_text_index_exists():
+            return False
+
+        self.db.execute_script(f"""
+            DROP TRIGGER IF EXISTS {self.__full_text_table}_ai;
+            DROP TRIGGER IF EXISTS {self.__full_text_table}_ad;
+            DROP TRIGGER IF EXISTS {self.__full_text_table}_au;
+            DROP TABLE IF EXISTS {self.__full_text_table};""")
+        self.__full_text = False
+        return True
+
+    def full_text_index_exists(self) -> bool:
+        """
+        Identifies if the full-text index exists in the database
+        """
+        if self.__full_text is None:
+            command_ = 'SELECT COUNT(*) FROM sqlite_master WHERE type = \'table\' AND name = ?'
+            self.__full_text = self.db.get_value(command_, 0, (self.__full_text_table,)) > 0
+        return self.__full_text
+
+    def search_text(self,
+                    text_: str,
+                    limit_: int = DEFAULT_SEARCH_TEXT_LIMIT) -> []:
+        """
+        Searches the movies whose name or director contain words starting with each word of the text, best matches
+          first. Uses the full-text index if it exists, otherwise every movie is scanned.
+        :param text_: text typed by the user, e.g. 'tomo mck'
+        :param limit_: maximum number of rows to fetch
+        :return: list with the rows found, ranked
+        """
+        words_ = self.__words(text_)
+        if not words_:
+            return []
+
+        if self.full_text_index_exists():
+            command_ = f"""
+                SELECT  {self.source_name}.*
+                  FROM  {self.__full_text_table}
+                        INNER JOIN {self.source_name} ON {self.source_name}.id = {self.__full_text_table}.rowid
+                 WHERE  {self.__full_text_table} MATCH ?
+                 ORDER  BY rank
+                 LIMIT  ?"""
+            return self.db.get(command_, (self.__match_query(words_), limit_), self.model).fetchall()
+
+        conditions_, params_ = self.filter_clause({'text': text_})
+        command_ = f'SELECT * FROM {self.source_name} WHERE {" AND ".join(conditions_)} ORDER BY name, id LIMIT ?'
+        return self.db.get(command_, tuple(params_) + (limit_,), self.model).fetchall()
+
+    def filter_clause(self,
+                      filters_: dict) -> tuple:
+        """
+        Translates filters into the conditions of a WHERE clause, see Table.filter_clause(). The movies can also be
+          filtered by text, matching words of their name or director, see search_text(), and by genre name.
+        """
+        filters_ = dict(filters_)
+        words_ = self.__words(filters_.pop('text', None))
+
+        # The genre is filtered by its id, a small integer key served by the genre index
+        genre_name_ = filters_.pop('gender', None)
+        if not string_helper.is_none_empty_space(genre_name_):
+            genre_ = genre_repository.get_repository().by_name(genre_name_)
+            filters_['genre_id'] = 0 if genre_ is None else genre_.id
+
+        conditions_, params_ = super().filter_clause(filters_)
+        if not words_:
+            return conditions_, params_
+
+        if self.full_text_index_exists():
+            conditions_.append(f'id IN (SELECT rowid FROM {self.__full_text_table} '
+                               f'WHERE {self.__full_text_table} MATCH ?)')
+            params_.append(self.__match_query(words_))
+        else:
+            for word_ in words_:
+                conditions_.append('(name LIKE ? OR director LIKE ?)')
+                params_.extend((f'%{word_}%', f'%{word_}%'))
+
+        return conditions_, params_
+
+    def count_source(self,
+                     filters_: dict = None) -> str:
+        """
+        Counts the movies on the table, without the join of the view: it has a row per movie, and every filter is
+          translated to columns of the table, see filter_clause()
+        """
+        return self.table_name
+
+    def search(self,
+               filters_: dict = None,
+               order_by_: tuple = ('id',),
+               descending_: bool = False,
+               limit_: int = -1,
+               offset_: int = 0) -> []:
+        """
+        Fetches the movies that match the filters, see Table.search(). Sorted by genre, whose name comes from the view
+          and has no index, they are fetched genre by genre in the order of the names, each genre served by the genre
+          index, instead of sorting all the movies on each page. Only the genres before the offset are counted.
+        """
+        if not order_by_ or order_by_[0] != 'gender':
+            return super().search(filters_, order_by_, descending_, limit_, offset_)
+        self.order_clause(order_by_, descending_)   # Validate the columns
+
+        # Every movie has a genre (foreign key), so they are all in the cache. Genres with the same name go by id.
+        genres_ = sorted(genre_repository.get_repository().all(), key=lambda genre_: (genre_.name, genre_.id),
+                         reverse=descending_)
+
+        # A genre filter leaves only its genre to go through
+        filters_ = dict(filters_ or {})
+        genre_name_ = filters_.pop('gender', None)
+        if not string_helper.is_none_empty_space(genre_name_):
+            genre_ = genre_repository.get_repository().by_name(genre_name_)
+            genres_ = [] if genre_ is None else [genre_]
+        genre_id_ = filters_.pop('genre_id', None)
+        if genre_id_ is not None and genre_id_ != '':
+            genres_ = [genre_ for genre_ in genres_ if genre_.id == int(genre_id_)]
+
+        rows_ = []
+        for genre_ in genres_:
+            genre_filters_ = dict(filters_, genre_id=genre_.id)
+            if offset_ > 0:
+                count_ = self.search_count(genre_filters_)
+                if offset_ >= count_:
+                    offset_ -= count_
+                    continue
+
+            rows_ += super().search(genre_filters_, order_by_[1:] or ('id',), descending_,
+                                    limit_ - len(rows_) if limit_ >= 0 else -1, offset_)
+            offset_ = 0
+            if 0 <= limit_ <= len(rows_):
+                break
+        return rows_
+
+    @property
+    def __full_text_table(self) -> str:
+        return self.table_name + FULL_TEXT_TABLE_SUFFIX
+
+    @staticmethod
+    def __words(text_: str | None) -> []:
+        """
+        Words of a text to search, ignoring punctuation, which FTS5 would parse as query syntax
+        """
+        return re.findall(r'\w+', text_) if text_ else []
+
+    @staticmethod
+    def __match_query(words_: []) -> str:
+        """
+        FTS5 query matching rows with words starting with each one, quoted so they are never parsed as operators
+        """
+        return ' '.join(f'"{word_}"*' for word_ in words_)
+
+    def count_by_genre(self) -> []:
+        """
+        Counts the movies of each genre, grouping them by genre id, which is read from the genre index alone
+        :return: list of tuples (genre name, number of movies), ordered by genre name
+        """
+        command_ = f'SELECT genre_id, COUNT(*) FROM {self.table_name} GROUP BY genre_id'
+        genres_ = genre_repository.get_repository()
+        counts_ = []
+        for genre_id_, count_ in self.db.get(command_).fetchall():
+            genre_ = genres_.by_id(genre_id_)
+            counts_.append(('' if genre_ is None else genre_.name, count_))
+        return sorted(counts_)
+
+    @staticmethod
+    def filters(name_prefix_: str = None,
+                director_: str = None,
+                genre_: str = None,
+                available_: bool = None,
+                text_: str = None) -> dict:
+        """
+        Filters to search movies, see Table.search(). Each one is served by an index of the table.
+        :param name_prefix_: beginning of the movie name, case-insensitive
+        :param director_: director of the movie
+        :param genre_: main genre of the movie
+        :param available_: availability of the movie
+        :param text_: words of the name or director of the movie, see search_text()
+        :return: filters by column, those which are None are not applied
+        """
+        return {'name_prefix': name_prefix_, 'director': director_, 'gender': genre_, 'available': available_,
+                'text': text_}
+
+    def save_record(self,
+                    id_: int | None,
+                    values_: dict) -> int:
+        """
+        Save a movie in the database, from its values by column name, as the generic forms of the view do
+        :return: identifier of the saved record, assigned by the database if it is a new one
+        """
+        return self.save(movie_model.Movie(id_,
+                                           values_.get('name'),
+                                           values_.get('director'),
+                                           values_.get('gender'),
+                                           values_.get('duration'),
+                                           values_.get('available')))
+
+    def save_many(self,
+                  movies_,
+                  chunk_size_: int = DEFAULT_SAVE_MANY_CHUNK_SIZE,
+                  progress_callback_=None) -> int:
+        """
+        Save many records in the database within a single transaction, sending them in chunks with executemany()
+        :param movies_: iterable of movie_model.Movie, consumed lazily so it can be a generator streaming from a file
+        :param chunk_size_: number of rows sent to the database on each executemany() call
+        :param progress_callback_: callable invoked after each chunk with the number of rows saved so far
+        :return: number of rows saved
+        """
+        if chunk_size_ < 1:
+            raise ValueError('The chunk size must be greater than zero.')
+
+        saved_ = 0
+        iterator_ = iter(movies_)
+        # Read before the transaction starts, the genre cache connection could be blocked by it
+        genres_ = genre_repository.get_repository().name_map()
+        try:
+            while True:
+                chunk_ = list(itertools.islice(iterator_, chunk_size_))
+                if not chunk_:
+                    break
+
+                inserts_ = []
+                updates_ = []
+                for movie_ in chunk_:
+                    self.__validate(movie_, genres_)
+                    if movie_.id is None or movie_.id == 0:
+                        inserts_.append(self.__values(movie_, genres_))
+                    else:
+                        updates_.append(self.__values(movie_, genres_) + (movie_.id,))
+
+                # Keep the transaction open until all chunks are sent
+                if inserts_:
+                    self.db.executemany(self.__insert_command, inserts_, commit_=False)
+                if updates_:
+                    self.db.executemany(self.__update_command, updates_, commit_=False)
+
+                saved_ += len(chunk_)
+                if progress_callback_ is not None:
+                    progress_callback_(saved_)
+
+            self.db.commit()
+        except Exception:
+            # All or nothing: discard the rows sent so far
+            self.db.rollback()
+            raise
+
+        return saved_
+
+    @staticmethod
+    def __validate(movie: movie_model.Movie,
+                   genres_: dict):
+        """
+        Validate the data of a movie before saving it
+        :param genres_: genres by case-folded name, see GenreRepository.name_map()
+        """
         if string_helper.is_none_empty_space(movie.name):
             raise ValueError('The movie name cannot be empty.')
         if string_helper.is_none_empty_space(movie.director):
             raise ValueError('The movie director cannot be empty.')
         if string_helper.is_none_empty_space(movie.gender):
             raise ValueError('The movie gender cannot be empty.')
+        if movie.gender.strip().casefold() not in genres_:
+            raise ValueError(f'The movie gender {movie.gender.strip()} is not a known genre.')
         if string_helper.is_none_empty_space(movie.duration):
             raise ValueError('The movie duration cannot be empty.')
 
-        if movie.id is None or movie.id == 0:
-            self.__insert(movie)
-        else:
-            self.__update(movie)
+    @staticmethod
+    def __values(movie: movie_model.Movie,
+                 genres_: dict) -> tuple:
+        """
+        Values of a movie, in the order of the placeholders of the INSERT and UPDATE commands
+        :param genres_: genres by case-folded name, to translate the genre of the movie into its id
+        """
+        return (movie.name.strip(),
+                movie.director.strip(),
+                genres_[movie.gender.strip().casefold()].id,
+                movie.duration.strip(),
+                movie.available)
 
     def __insert(self,
-                 movie: movie_model.Movie):
-        sql_command_ = f"""
-            INSERT INTO {self.table_name}
-            (
-                name,
-                director,
-                gender,
-                duration,
-                available
-            )
-            VALUES
-            (
-                '{movie.name.strip()}',
-                '{movie.director.strip()}',
-                '{movie.gender.strip()}',
-                '{movie.duration.strip()}',
-                {movie.available}
-            )"""
-
+                 movie: movie_model.Movie,
+                 genres_: dict) -> int:
         # Execute command in sql
-        self.execute(sql_command_)
+        return self.execute(self.__insert_command, self.__values(movie, genres_)).lastrowid
 
     def __update(self,
-                 movie: movie_model.Movie):
-        sql_command_ = f"""
-            UPDATE  {self.table_name}
-               SET  name      = '{movie.name.strip()}',
-                    director  = '{movie.director.strip()}',
-                    gender    = '{movie.gender.strip()}',
-                    duration  = '{movie.duration.strip()}',
-                    available = {movie.available}
-             WHERE  id = {movie.id}"""
-
+                 movie: movie_model.Movie,
+                 genres_: dict):
         # Execute command in sql
-        self.execute(sql_command_)
+        self.execute(self.__update_command, self.__values(movie, genres_) + (movie.id,))
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+"""
+Opt-in SQL query tracer. The statements run through SqlConnection are logged with their parameters, duration, rows
+  and the virtual machine steps they took (counted by a progress handler); the plan of the statements slower than a
+  threshold is captured with EXPLAIN QUERY PLAN, and the report flags the full table scans and the sorts without an
+  index. Every statement run on the connections, including the ones run around SqlConnection (e.g. by triggers,
+  migrations or executescript), is counted by a trace callback.
+Each connection is attached when the pool opens it, so the tracer must be enabled before (see python main.py
+  --trace-sql).
+"""
+
+# --- Python modules ---
+# collections: module which implements specialized container datatypes.
+import collections
+# contextlib: module which provides utilities for common tasks involving the with statement.
+import contextlib
+# json: module which exposes an API to encode and decode JSON documents.
+import json
+# sqlite3: C library that provides a lightweight disk-based sql without a separate server,
+#          process and allows accessing the sql using a nonstandard variant of the SQL query language
+import sqlite3
+# threading: module which constructs higher-level threading interfaces on top of the lower level _thread module.
+import threading
+# time: module which provides various time-related functions.
+import time
+
+DEFAULT_SLOW_QUERY_MS = 50.0        # Statements slower than this get their plan captured
+DEFAULT_MAX_QUERIES = 5000          # Last statements kept in the log
+PROGRESS_STEPS = 1000               # Virtual machine steps between calls of the progress handler
+ENVIRONMENT_VARIABLE = 'MOVIE_CATALOG_TRACE_SQL'
+EXPLAINED_KEYWORDS = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class Query:
+    """
+    Statement run through SqlConnection, and what it cost
+    """
+    __slots__ = ('text', 'params', 'started', 'duration_ms', 'rows', 'steps', 'thread')
+
+    def __init__(self,
+                 text_: str,
+                 params_):
+        """
+        Class constructor
+        """
+        self.text = ' '.join(text_.split())     # On a single line
+        self.params = params_
+        self.started = time.time()
+        self.duration_ms = 0.0      # Until the statement returned its 1º row, or finished if it returns none
+        self.rows = 0               # Returned, counted while they are fetched, or changed by a write
+        self.steps = 0              # Virtual machine steps, in multiples of PROGRESS_STEPS
+        self.thread = threading.current_thread().name
+
+    def counting(self,
+                 row_factory_=None):
+        """
+        Row factory which counts the rows fetched, built on another one, if any
+        """
+        def count(cursor_, row_: tuple):
+            self.rows += 1
+            return row_ if row_factory_ is None else row_factory_(cursor_, row_)
+
+        return count
+
+    def as_dict(self) -> dict:
+        return {'text': self.text, 'params': repr(self.params), 'started': self.started,
+                'duration_ms': round(self.duration_ms, 3), 'rows': self.rows, 'steps': self.steps,
+                'thread': self.thread}
+
+
+class QueryTracer:
+    """
+    Log of the statements run on the connections attached to it
+    """
+    def __init__(self,
+                 slow_ms_: float = DEFAULT_SLOW_QUERY_MS,
+                 max_queries_: int = DEFAULT_MAX_QUERIES):
+        """
+        Class constructor
+        :param slow_ms_: statements slower than these milliseconds get their plan captured, 0 to capture every plan
+        :param max_queries_: number of statements kept in the log, the oldest ones are discarded
+        """
+        self.slow_ms = slow_ms_
+        self.queries = collections.deque(maxlen=max_queries_)
+        self.plans = {}                             # statement text -> rows of its EXPLAIN QUERY PLAN
+        self.slow = collections.Counter()           # statement text -> times it was slow
+        self.statements = collections.Counter()     # statement text -> times it ran, by the trace callback
+        self.__lock = threading.Lock()
+        self.__running = {}                         # connection -> query being run on it
+        self.__explaining = threading.local()       # Set while a plan is captured, so it is not traced
+
+    def attach(self,
+               connection_: sqlite3.Connection):
+        """
+        Traces the statements of a connection
+        """
+        connection_.set_trace_callback(self.__on_statement)
+
+        def on_progress() -> int:
+            query_ = self.__running.get(connection_)
+            if query_ is not None:
+                query_.steps += PROGRESS_STEPS
+            return 0    # Go on
+
+        connection_.set_progress_handler(on_progress, PROGRESS_STEPS)
+
+    @contextlib.contextmanager
+    def trace(self,
+              connection_: sqlite3.Connection,
+              command_: str,
+              params_=(),
+              explain_: bool = True):
+        """
+        Times a statement run on a connection, logging it on exit, and capturing its plan if it was slow
+        :param connection_: connection the statement runs on
+        :param command_: SQL command
+        :param params_: values bound to the placeholders of the command
+        :param explain_: flag to capture the plan if it is slow, False for scripts and executemany
+        :return: the query logged, whose rows may be set by the caller
+        """
+        query_ = Query(command_, params_)
+        self.__running[connection_] = query_
+        start_ = time.perf_counter_ns()
+        try:
+            yield query_
+        finally:
+            query_.duration_ms = (time.perf_counter_ns() - start_) / 1e6
+            self.__running.pop(connection_, None)
+            with self.__lock:
+                self.queries.append(query_)
+
+        if query_.duration_ms >= self.slow_ms:
+            with self.__lock:
+                self.slow[query_.text] += 1
+            if explain_ and query_.text not in self.plans:
+                self.plans[query_.text] = self.__explain(connection_, command_, params_)
+
+    def __explain(self,
+                  connection_: sqlite3.Connection,
+                  command_: str,
+                  params_) -> []:
+        """
+        Plan of a statement: the detail of each row of its EXPLAIN QUERY PLAN, indented by depth
+        """
+        if not command_.lstrip().upper().startswith(EXPLAINED_KEYWORDS):
+            return []
+
+        self.__explaining.active = True
+        try:
+            rows_ = connection_.execute(f'EXPLAIN QUERY PLAN {command_}', params_).fetchall()
+        except sqlite3.Error as e:
+            return [f'(no plan: {e})']
+        finally:
+            self.__explaining.active = False
+
+        depths_ = {0: 0}
+        plan_ = []
+        for id_, parent_, _, detail_ in rows_:
+            depths_[id_] = depths_.get(parent_, 0) + 1
+            plan_.append('  ' * (depths_[id_] - 1) + detail_)
+        return plan_
+
+    def __on_statement(self,
+                       statement_: str):
+        """
+        Trace callback, invoked by SQLite with the text of each statement it starts, including the ones of triggers
+        """
+        if getattr(self.__explaining, 'active', False):
+            return
+        with self.__lock:
+            self.statements[' '.join(statement_.split())] += 1
+
+    @staticmethod
+    def warnings(plan_: []) -> []:
+        """
+        Problems of a plan: full table scans, and sorts or groupings without an index
+        """
+        warnings_ = []
+        for detail_ in plan_:
+            detail_ = detail_.strip()
+            if detail_.startswith('SCAN ') and ' USING ' not in detail_ and ' VIRTUAL TABLE ' not in detail_:
+                warnings_.append(f'full table scan: {detail_}')
+            elif detail_.startswith('USE TEMP B-TREE'):
+                warnings_.append(f'no index: {detail_}')
+        return warnings_
+
+    def report(self) -> str:
+        """
+        Report of the statements logged: the slowest ones by total time, then the plans captured and their problems
+        """
+        with self.__lock:
+            queries_ = list(self.queries)
+            slow_ = dict(self.slow)
+            plans_ = dict(self.plans)
+
+        totals_ = {}
+        for query_ in queries_:
+            count_, total_ms_, rows_, steps_ = totals_.get(query_.text, (0, 0.0, 0, 0))
+            totals_[query_.text] = (count_ + 1, total_ms_ + query_.duration_ms, rows_ + query_.rows,
+                                    steps_ + query_.steps)
+
+        lines_ = [f'{len(queries_)} statements logged, {sum(slow_.values())} slower than {self.slow_ms:g} ms', '',
+                  f'{"calls":>7} {"total ms":>10} {"mean ms":>9} {"rows":>9} {"steps":>11}  statement']
+        for text_, (count_, total_ms_, rows_, steps_) in sorted(totals_.items(), key=lambda item_: -item_[1][1])[:20]:
+            lines_.append(f'{count_:>7} {total_ms_:>10.2f} {total_ms_ / count_:>9.3f} {rows_:>9} {steps_:>11}  '
+                          f'{text_[:160]}')
+
+        for text_, plan_ in plans_.items():
+            lines_ += ['', f'{"SLOW" if text_ in slow_ else "PLAN"} {text_[:160]}']
+            lines_ += [f'    {detail_}' for detail_ in plan_]
+            lines_ += [f'  ! {warning_}' for warning_ in self.warnings(plan_)]
+        return '\n'.join(lines_)
+
+    def dump(self,
+             file_name_: str):
+        """
+        Writes the log as JSON: the statements, the plans captured, with their problems, and the statements counted
+        """
+        with self.__lock:
+            log_ = {'queries': [query_.as_dict() for query_ in self.queries],
+                    'plans': [{'text': text_, 'plan': plan_, 'warnings': self.warnings(plan_), 'slow': self.slow[text_]}
+                              for text_, plan_ in self.plans.items()],
+                    'statements': dict(self.statements.most_common())}
+        with open(file_name_, 'w', encoding='utf-8') as file_:
+            json.dump(log_, file_, indent=2)
+
+
+# Process-wide tracer, None while tracing is disabled
+_tracer = None
+
+
+def enable(slow_ms_: float = DEFAULT_SLOW_QUERY_MS,
+           max_queries_: int = DEFAULT_MAX_QUERIES) -> QueryTracer:
+    """
+    Enables tracing, before the connections are opened, see QueryTracer
+    """
+    global _tracer
+    if _tracer is None:
+        _tracer = QueryTracer(slow_ms_, max_queries_)
+    return _tracer
+
+
+def get_tracer() -> QueryTracer | None:
+    """
+    Gets the process-wide tracer, None if tracing is disabled
+    """
+    return _tracer
+
+
+def disable():
+    global _tracer
+    _tracer = None
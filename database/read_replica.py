@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+"""
+Optional in-memory read replica of the database: it is loaded from the database file with the sqlite3 backup API on
+  first use, then each write committed through SqlConnection is applied to it too, so the reads (data grid, search,
+  sort, counts, lookups) are served from memory and the database file is only used for durability.
+The writes are applied right after they are committed, in the same order. Values that SQLite computes when a statement
+  runs (e.g. CURRENT_TIMESTAMP defaults) may differ by the time elapsed between both writes.
+The writes are recorded from the moment the replica is enabled, and the commits and the load of the replica exclude
+  each other, so a transaction is either in the copy loaded or applied to it once committed. The readers do not lock
+  the tables of the replica (see the replica profile), instead each statement is read to the end at once, waiting
+  while a transaction is being applied, so it never sees one half applied, nor one applied while it is read.
+Enabled by python main.py --read-replica, the writes made around SqlConnection (e.g. by migrations) must be done before
+  it is loaded.
+"""
+
+# --- Python modules ---
+# contextlib: module which provides utilities for common tasks involving the with statement.
+import contextlib
+# sqlite3: C library that provides a lightweight disk-based sql without a separate server,
+#          process and allows accessing the sql using a nonstandard variant of the SQL query language
+import sqlite3
+# threading: module which constructs higher-level threading interfaces on top of the lower level _thread module.
+import threading
+
+# --- App modules ---
+from . import connection_pool
+
+READ_KEYWORDS = ('SELECT', 'WITH', 'PRAGMA', 'EXPLAIN', 'VALUES')   # Statements that are not applied to the replica
+EXECUTE = 'execute'
+EXECUTE_MANY = 'executemany'
+EXECUTE_SCRIPT = 'executescript'
+
+
+def is_write(command_: str) -> bool:
+    """
+    Identifies whether a statement may change the database, so it must be applied to the replica
+    """
+    return not command_.lstrip().upper().startswith(READ_KEYWORDS)
+
+
+class ReplayLock:
+    """
+    Lock between the readers of the replica, which run at the same time, and the application of a transaction, which
+      runs alone. New readers wait while a transaction is waiting to be applied, so the readers cannot starve it.
+    """
+    def __init__(self):
+        self.__condition = threading.Condition()
+        self.__readers = 0
+        self.__replaying = False
+
+    @contextlib.contextmanager
+    def reading(self):
+        with self.__condition:
+            while self.__replaying:
+                self.__condition.wait()
+            self.__readers += 1
+        try:
+            yield
+        finally:
+            with self.__condition:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__condition.notify_all()
+
+    @contextlib.contextmanager
+    def replaying(self):
+        with self.__condition:
+            while self.__replaying:
+                self.__condition.wait()
+            self.__replaying = True
+            while self.__readers:
+                self.__condition.wait()
+        try:
+            yield
+        finally:
+            with self.__condition:
+                self.__replaying = False
+                self.__condition.notify_all()
+
+
+class ReplicaCursor(sqlite3.Cursor):
+    """
+    Cursor of the reads served from the replica. Its statement is run to the end at once, holding the replay lock as a
+      reader, then its rows are fetched from memory. So a stream on the replica sees the rows as they were when it
+      started, as on the database file, and the transactions applied meanwhile do not show in its rest, e.g. a row
+      returned twice, or skipped, because a change moved it.
+    """
+    def __init__(self,
+                 connection_: sqlite3.Connection):
+        super().__init__(connection_)
+        self.__rows = []
+        self.__position = 0     # Of the next row to fetch
+
+    def execute(self, *args_, **kwargs_):
+        with _replay_lock.reading():
+            super().execute(*args_, **kwargs_)
+            # As they are stored, the row factory (e.g. of a model) is set once the statement is run, see SqlConnection
+            row_factory_, self.row_factory = self.row_factory, None
+            try:
+                self.__rows = super().fetchall()
+            finally:
+                self.row_factory = row_factory_
+        self.__position = 0
+        return self
+
+    def __fetch(self,
+                size_: int) -> []:
+        """
+        Next rows of the statement, built by the row factory, if any
+        """
+        rows_ = self.__rows[self.__position:self.__position + size_]
+        self.__position += len(rows_)
+        if self.__position >= len(self.__rows):
+            # Not kept once fetched
+            self.__rows, self.__position = [], 0
+        row_factory_ = self.row_factory
+        return rows_ if row_factory_ is None else [row_factory_(self, row_) for row_ in rows_]
+
+    def fetchone(self):
+        rows_ = self.__fetch(1)
+        return rows_[0] if rows_ else None
+
+    def fetchmany(self,
+                  size=None):
+        return self.__fetch(self.arraysize if size is None else size)
+
+    def fetchall(self):
+        return self.__fetch(len(self.__rows))
+
+    def __next__(self):
+        rows_ = self.__fetch(1)
+        if not rows_:
+            raise StopIteration
+        return rows_[0]
+
+
+class ReadReplica:
+    """
+    In-memory copy of a database, read through its own pool of connections
+    """
+    def __init__(self,
+                 source_pool_: connection_pool.ConnectionPool,
+                 max_size_: int = connection_pool.DEFAULT_POOL_SIZE):
+        """
+        Class constructor, which loads the copy of the database
+        :param source_pool_: pool of the database file
+        :param max_size_: maximum number of connections opened at the same time to read the copy
+        """
+        # Shared cache, so all the connections of the process see the same memory database, and their reads do not
+        #   lock its tables (see the replica profile), otherwise an open stream would block the writes
+        self.database = f'file:replica-{id(self)}?mode=memory&cache=shared'
+        # The memory database lives while a connection to it is open: the one the writes are applied on
+        self.__writer = sqlite3.connect(self.database, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                                        uri=True)
+        self.__lock = threading.Lock()
+        with source_pool_.connection() as source_:
+            source_.backup(self.__writer)
+        self.pool = connection_pool.ConnectionPool(self.database, max_size_, source_pool_.timeout,
+                                                   connection_pool.REPLICA_PROFILE)
+
+    def commit(self,
+               commit_,
+               writes_: []):
+        """
+        Commits a transaction on the database file, then applies its writes to the replica. Both are done holding the
+          lock of the replica, so the transactions of different connections are applied in the order they committed.
+        :param commit_: callable which commits the transaction, e.g. the commit of the connection
+        :param writes_: statements of the transaction, tuples (method, command, params), method is EXECUTE,
+          EXECUTE_MANY or EXECUTE_SCRIPT
+        """
+        with self.__lock:
+            commit_()
+            with _replay_lock.replaying():
+                for method_, command_, params_ in writes_:
+                    if method_ == EXECUTE_SCRIPT:
+                        self.__writer.executescript(command_)
+                    else:
+                        getattr(self.__writer, method_)(command_, params_)
+                self.__writer.commit()
+
+    def close(self):
+        self.pool.close_all()
+        self.__writer.close()
+
+
+_enabled = False
+# Process-wide replica, loaded on first use
+_replica = None
+_replica_lock = threading.Lock()       # Held while the replica is loaded, and while a transaction is committed
+_replay_lock = ReplayLock()
+
+
+def enable():
+    """
+    Enables the replica, which is loaded on the 1º read. The writes are recorded from now on.
+    """
+    global _enabled
+    _enabled = True
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def get_replica(load_: bool = True) -> ReadReplica | None:
+    """
+    Gets the process-wide replica, loading it from the database of the connection pool if needed
+    :param load_: flag to load it, if it is not yet, False to get it only if it is already loaded
+    :return: the replica, None if it is not enabled, or not loaded and load_ is False
+    """
+    global _replica
+    if not _enabled:
+        return None
+    replica_ = _replica
+    if replica_ is not None or not load_:
+        return replica_
+    with _replica_lock:
+        if _replica is None:
+            _replica = ReadReplica(connection_pool.get_pool())
+        return _replica
+
+
+def commit(commit_,
+           writes_: []):
+    """
+    Commits a transaction on the database file, and applies its writes to the replica if it is loaded. The replica is
+      not loaded meanwhile, so a transaction committed while it is being loaded is applied to it once loaded.
+    :param commit_: callable which commits the transaction, see ReadReplica.commit
+    :param writes_: statements of the transaction, recorded since the replica was enabled, see ReadReplica.commit
+    """
+    with _replica_lock:
+        if _replica is None:
+            commit_()
+        else:
+            _replica.commit(commit_, writes_)
+
+
+def interrupt(request_) -> int:
+    """
+    Interrupts the SQL statements running on the replica connections bound to a request, see ConnectionPool.interrupt
+    """
+    return 0 if _replica is None else _replica.pool.interrupt(request_)
+
+
+def shutdown():
+    """
+    Discards the replica, closing its connections. It must be called when the application exits.
+    """
+    global _replica
+    with _replica_lock:
+        if _replica is not None:
+            _replica.close()
+            _replica = None
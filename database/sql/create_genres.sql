@@ -1,11 +1,3 @@
-PRAGMA temp_store = 2;              -- Store temp table in memory, not on disk
-
-PRAGMA foreign_keys = OFF;          -- Disable the enforcement of foreign key constraints.
-
-DROP TABLE IF EXISTS genres;
-
-PRAGMA foreign_keys = ON;           -- Enable the enforcement of foreign key constraints.
-
 CREATE TABLE IF NOT EXISTS genres
 (
   id         INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -0,0 +1,23 @@
+-- Version of the genres, bumped by each change of the table, so the genre cache is read again only when they changed
+CREATE TABLE IF NOT EXISTS genres_version
+(
+  id      INTEGER PRIMARY KEY CHECK (id = 1),
+  version INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO genres_version (id, version) VALUES (1, 0);
+
+-- The table may have been created again, with other rows
+UPDATE genres_version SET version = version + 1;
+
+CREATE TRIGGER IF NOT EXISTS genres_version_ai AFTER INSERT ON genres BEGIN
+  UPDATE genres_version SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS genres_version_ad AFTER DELETE ON genres BEGIN
+  UPDATE genres_version SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS genres_version_au AFTER UPDATE ON genres BEGIN
+  UPDATE genres_version SET version = version + 1;
+END;
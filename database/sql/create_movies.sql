@@ -1,28 +1,37 @@
-PRAGMA temp_store = 2;              -- Store temp table in memory, not on disk
-
-PRAGMA foreign_keys = OFF;          -- Disable the enforcement of foreign key constraints.
-
-DROP TABLE IF EXISTS movies;
-
-PRAGMA foreign_keys = ON;           -- Enable the enforcement of foreign key constraints.
-
 CREATE TABLE IF NOT EXISTS movies
 (
   id         INTEGER PRIMARY KEY AUTOINCREMENT,
   name       VARCHAR(100) NOT NULL,
   director   VARCHAR(100) NOT NULL,
-  gender     VARCHAR(50)  NOT NULL,
+  genre_id   INTEGER      NOT NULL REFERENCES genres (id),
   duration   VARCHAR(10)  NOT NULL,
   --  SQLite does not have a separate Boolean storage class. Instead, Boolean values are stored as integers 0 (false) and 1 (true).
   available  INTEGER      NOT NULL DEFAULT 0,
   created_on TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Index to scroll the movies ordered by name without sorting the whole table
+CREATE INDEX IF NOT EXISTS movies_name_idx ON movies (name, id);
+-- Index to search the movies by the beginning of their name, case-insensitive like LIKE
+CREATE INDEX IF NOT EXISTS movies_name_nocase_idx ON movies (name COLLATE NOCASE);
+-- Indexes to filter and sort the movies by other columns, then by name. The genre one also serves the joins and the
+--   counts by genre.
+CREATE INDEX IF NOT EXISTS movies_director_idx ON movies (director, name, id);
+CREATE INDEX IF NOT EXISTS movies_genre_idx ON movies (genre_id, name, id);
+CREATE INDEX IF NOT EXISTS movies_duration_idx ON movies (duration, name, id);
+CREATE INDEX IF NOT EXISTS movies_available_idx ON movies (available, name, id);
+
+-- Movies with the name of their genre, in the gender column, which is how the application reads them
+CREATE VIEW IF NOT EXISTS movies_view AS
+SELECT  m.id, m.name, m.director, m.genre_id, g.name AS gender, m.duration, m.available, m.created_on
+  FROM  movies m
+        LEFT JOIN genres g ON g.id = m.genre_id;
+
 INSERT  INTO movies
 (
         name,
         director,
-        gender,
+        genre_id,
         duration,
         available
 )
@@ -30,7 +39,7 @@ VALUES
 (
         'The Tomorrow War',
         'Chris McKay',
-        'Science fiction',
+        (SELECT id FROM genres WHERE name = 'Science fiction'),
         '2h 20min',
         1
 );
@@ -0,0 +1,19 @@
+-- Full-text index over the name and director of the movies, optional since it requires SQLite built with FTS5.
+-- It is an external content table: it stores only the index, the text is read from the movies table.
+
+DROP TABLE IF EXISTS movies_fts;
+
+CREATE VIRTUAL TABLE movies_fts USING fts5
+(
+  name,
+  director,
+  content = 'movies',
+  content_rowid = 'id',
+  tokenize = 'unicode61 remove_diacritics 2',
+  prefix = '2 3'                    -- Index prefixes of 2 and 3 characters, for typeahead search
+);
+
+-- Index the movies already saved
+INSERT INTO movies_fts (movies_fts) VALUES ('rebuild');
+
+-- The triggers that keep it in sync with the movies table are in create_movies_fts_triggers.sql
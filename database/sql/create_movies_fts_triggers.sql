@@ -0,0 +1,13 @@
+-- Keep the full-text index in sync with the movies table
+CREATE TRIGGER IF NOT EXISTS movies_fts_ai AFTER INSERT ON movies BEGIN
+  INSERT INTO movies_fts (rowid, name, director) VALUES (new.id, new.name, new.director);
+END;
+
+CREATE TRIGGER IF NOT EXISTS movies_fts_ad AFTER DELETE ON movies BEGIN
+  INSERT INTO movies_fts (movies_fts, rowid, name, director) VALUES ('delete', old.id, old.name, old.director);
+END;
+
+CREATE TRIGGER IF NOT EXISTS movies_fts_au AFTER UPDATE OF name, director ON movies BEGIN
+  INSERT INTO movies_fts (movies_fts, rowid, name, director) VALUES ('delete', old.id, old.name, old.director);
+  INSERT INTO movies_fts (rowid, name, director) VALUES (new.id, new.name, new.director);
+END;
@@ -0,0 +1,48 @@
+-- Moves movies.gender, a copy of the genre name, to movies.genre_id, a foreign key to genres (id).
+-- SQLite cannot change the type of a column, so the table is rebuilt, keeping the ids. It runs within the transaction
+--   of the migrations, with the enforcement of foreign keys disabled.
+
+-- Every genre named by a movie must exist
+INSERT  INTO genres (name)
+SELECT  DISTINCT TRIM(m.gender)
+  FROM  movies m
+ WHERE  NOT EXISTS (SELECT 1 FROM genres g WHERE g.name = TRIM(m.gender) COLLATE NOCASE);
+
+CREATE TABLE movies_new
+(
+  id         INTEGER PRIMARY KEY AUTOINCREMENT,
+  name       VARCHAR(100) NOT NULL,
+  director   VARCHAR(100) NOT NULL,
+  genre_id   INTEGER      NOT NULL REFERENCES genres (id),
+  duration   VARCHAR(10)  NOT NULL,
+  --  SQLite does not have a separate Boolean storage class. Instead, Boolean values are stored as integers 0 (false) and 1 (true).
+  available  INTEGER      NOT NULL DEFAULT 0,
+  created_on TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT  INTO movies_new (id, name, director, genre_id, duration, available, created_on)
+SELECT  m.id, m.name, m.director,
+        (SELECT MIN(g.id) FROM genres g WHERE g.name = TRIM(m.gender) COLLATE NOCASE),
+        m.duration, m.available, m.created_on
+  FROM  movies m;
+
+-- Keep the last id assigned, so the ids of deleted movies are not reused
+DELETE FROM sqlite_sequence WHERE name = 'movies_new';
+UPDATE sqlite_sequence SET name = 'movies_new' WHERE name = 'movies';
+
+DROP VIEW IF EXISTS movies_view;
+DROP TABLE movies;
+ALTER TABLE movies_new RENAME TO movies;
+
+CREATE INDEX IF NOT EXISTS movies_name_idx ON movies (name, id);
+CREATE INDEX IF NOT EXISTS movies_name_nocase_idx ON movies (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS movies_director_idx ON movies (director, name, id);
+CREATE INDEX IF NOT EXISTS movies_genre_idx ON movies (genre_id, name, id);
+CREATE INDEX IF NOT EXISTS movies_duration_idx ON movies (duration, name, id);
+CREATE INDEX IF NOT EXISTS movies_available_idx ON movies (available, name, id);
+
+-- Compatibility view, with the genre name in the gender column as before
+CREATE VIEW IF NOT EXISTS movies_view AS
+SELECT  m.id, m.name, m.director, m.genre_id, g.name AS gender, m.duration, m.available, m.created_on
+  FROM  movies m
+        LEFT JOIN genres g ON g.id = m.genre_id;
@@ -1,32 +1,44 @@
 # -*- coding: utf-8 -*-
 
+# contextlib: module which provides utilities for common tasks involving the with statement.
+import contextlib
 # os: library that allows access to OperatingSystem-dependent functionalities
 import os
 # sqlite3: C library that provides a lightweight disk-based sql without a separate server,
 #          process and allows accessing the sql using a nonstandard variant of the SQL query language
 import sqlite3
-# sys: module which provides access to variables used or maintained by the interpreter and to functions that
-#      interact strongly with the interpreter
-import sys
+
+# --- App modules ---
+from . import connection_pool
+from . import query_tracer
+from . import read_replica
 
 
 class SqlConnection:
     """
-    SQL sql connection
+    SQL sql connection, borrowed from the process-wide connection pool. If the read replica is enabled, the reads are
+      served from it, see read_replica.
     """
     def __init__(self):
-        # Identify the application directory, set as db folder
-        # Set sql folder
-        self.folder = os.path.abspath(os.path.dirname(str(sys.modules['__main__'].__file__)))
-        # Define the sql engine - we are working with SQLite for this example
-        self.database = os.path.join(self.folder, 'movies.db')
-        # Set sql connection, object that represents the sql
-        self.connection = sqlite3.connect(self.database, detect_types=sqlite3.PARSE_DECLTYPES)
-        # Create a Cursor, object that with its execute() method allows to perform SQL commands
-        self.cursor = self.connection.cursor()
+        # Get the process-wide pool, which knows the sql engine - we are working with SQLite for this example
+        self.pool = connection_pool.get_pool()
+        self.database = self.pool.database
+        self.folder = os.path.dirname(self.database)
+        # Connection, object that represents the sql, is borrowed from the pool on first use
+        self.connection = None
+        self.__transactions = 0     # Depth of the transaction() blocks being run
+        # Connection to the read replica, borrowed from its pool on the 1º read
+        self.replica_connection = None
+        self.__replica_pool = None
+        self.primary = False        # Flag to read from the database file, even if the read replica is enabled
+        self.__writes = []          # Statements run since the last commit, applied to the read replica on commit
 
     def __del__(self):
-        self.connection = None
+        try:
+            self.close()
+        except Exception:
+            # The interpreter may be shutting down, nothing else to do
+            pass
 
     @staticmethod
     def sql_scripts_folder() -> str:
@@ -36,24 +48,124 @@ class SqlConnection:
         return folder_
 
     def connect(self):
-        self.connection = sqlite3.connect(self.database)
+        if self.connection is None:
+            self.connection = self.pool.acquire()
 
     def commit(self):
-        if self.connection is not None:
+        # Within a transaction() block, the commit is deferred until it ends
+        if self.connection is None or self.__transactions:
+            return
+        writes_, self.__writes = self.__writes, []
+        if writes_:
+            # Applied to the replica, if it is loaded, otherwise once loaded it includes them
+            read_replica.commit(self.connection.commit, writes_)
+        else:
             self.connection.commit()
 
+    def rollback(self):
+        self.__writes = []
+        if self.connection is not None:
+            self.connection.rollback()
+
+    def claim(self):
+        """
+        Binds the connections borrowed to the request being run by the calling thread, see ConnectionPool.claim
+        """
+        if self.connection is not None:
+            self.pool.claim(self.connection)
+        if self.replica_connection is not None:
+            self.__replica_pool.claim(self.replica_connection)
+
+    def __write(self,
+                method_: str,
+                command_: str,
+                params_=()):
+        """
+        Keeps a statement run, to apply it to the read replica once it is committed, if it is enabled. It is kept even
+          if the replica is not loaded yet, as it may be loaded before the statement is committed.
+        """
+        if read_replica.is_enabled() and read_replica.is_write(command_):
+            self.__writes.append((method_, command_, params_))
+
+    def __reader(self) -> sqlite3.Connection:
+        """
+        Connection the reads are run on: the read replica, if it is enabled, unless this connection has to read its
+          own uncommitted writes, or it is flagged as primary
+        """
+        if self.primary or self.__writes or (self.connection is not None and self.connection.in_transaction):
+            replica_ = None
+        else:
+            replica_ = read_replica.get_replica()
+        if replica_ is None:
+            if self.connection is None:
+                self.connect()
+            return self.connection
+
+        if self.replica_connection is None:
+            self.__replica_pool = replica_.pool
+            self.replica_connection = replica_.pool.acquire()
+        return self.replica_connection
+
+    def __cursor(self,
+                 connection_: sqlite3.Connection) -> sqlite3.Cursor:
+        """
+        Cursor of a read, on the replica its steps are not run while a transaction is being applied to it
+        """
+        if connection_ is self.replica_connection:
+            return connection_.cursor(read_replica.ReplicaCursor)
+        return connection_.cursor()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Runs the statements of a with block within a single transaction, which takes the write lock at once: the
+          commits requested meanwhile are deferred until the block ends, and everything is rolled back if it raises.
+          Blocks can be nested, only the outermost one commits.
+        """
+        if self.connection is None:
+            self.connect()
+        if not self.__transactions and not self.connection.in_transaction:
+            self.connection.execute('BEGIN IMMEDIATE')
+            self.__write(read_replica.EXECUTE, 'BEGIN')
+
+        self.__transactions += 1
+        try:
+            yield self
+        except BaseException:
+            self.__transactions -= 1
+            if not self.__transactions:
+                self.rollback()
+            raise
+
+        self.__transactions -= 1
+        self.commit()
+
     def close(self):
+        """
+        Commits pending changes and returns the connections to their pools
+        """
+        if self.replica_connection is not None:
+            connection_, self.replica_connection = self.replica_connection, None
+            self.__replica_pool.release(connection_)
         if self.connection is not None:
-            self.connection.commit()
-            self.connection.close()
+            try:
+                self.__transactions = 0
+                self.commit()
+            finally:
+                connection_, self.connection = self.connection, None
+                self.__writes = []
+                self.pool.release(connection_)
 
     def execute(self,
                 command_: str,
+                params_: tuple | dict = (),
                 commit_: bool = True) -> sqlite3.Cursor:
         """
-        Execute command on the DB, returns a cursor.
+        Execute a single parameterized command on the DB, returns a cursor.
+        The statement is prepared once and then reused from the sqlite3 statement cache of the connection.
 
-        :param command_: SQL command to execute
+        :param command_: SQL command to execute, with ? (or :name) placeholders
+        :param params_: values bound to the placeholders of the command
         :param commit_: flag to close or not, the save transaction in the DB.
 
         :return: cursor with no specific result
@@ -61,43 +173,149 @@ class SqlConnection:
         if self.connection is None:
             self.connect()
         cursor = self.connection.cursor()
-        cursor.executescript(command_)
+        # Committed on its own, the statement is run in autocommit mode, so it commits by itself, without the BEGIN
+        #   and COMMIT statements the sqlite3 module runs around it otherwise. Not with the read replica, whose writes
+        #   are committed in order with its load, see read_replica.commit().
+        autocommit_ = (commit_ and not self.__transactions and not self.connection.in_transaction
+                       and not read_replica.is_enabled())
+        if autocommit_:
+            isolation_level_, self.connection.isolation_level = self.connection.isolation_level, None
+        try:
+            tracer_ = query_tracer.get_tracer()
+            if tracer_ is None:
+                cursor.execute(command_, params_)
+            else:
+                with tracer_.trace(self.connection, command_, params_) as query_:
+                    cursor.execute(command_, params_)
+                    query_.rows = max(cursor.rowcount, 0)
+        finally:
+            if autocommit_:
+                self.connection.isolation_level = isolation_level_
+        self.__write(read_replica.EXECUTE, command_, params_)
 
         if commit_:
-            self.connection.commit()
-            self.connection.close()
+            self.commit()
+
+        return cursor
+
+    def executemany(self,
+                    command_: str,
+                    params_seq_,
+                    commit_: bool = True) -> sqlite3.Cursor:
+        """
+        Execute a parameterized command on the DB once for each set of values, returns a cursor.
+
+        :param command_: SQL command to execute, with ? (or :name) placeholders
+        :param params_seq_: iterable with the values bound to the placeholders on each execution
+        :param commit_: flag to close or not, the save transaction in the DB.
+
+        :return: cursor with no specific result
+        """
+        if self.connection is None:
+            self.connect()
+        if read_replica.is_enabled():
+            # Applied again to the replica, so it cannot be a one-pass iterator
+            params_seq_ = list(params_seq_)
+        cursor = self.connection.cursor()
+        tracer_ = query_tracer.get_tracer()
+        if tracer_ is None:
+            cursor.executemany(command_, params_seq_)
+        else:
+            with tracer_.trace(self.connection, command_, explain_=False) as query_:
+                cursor.executemany(command_, params_seq_)
+                query_.rows = max(cursor.rowcount, 0)
+        self.__write(read_replica.EXECUTE_MANY, command_, params_seq_)
+
+        if commit_:
+            self.commit()
+
+        return cursor
+
+    def execute_script(self,
+                       script_: str,
+                       commit_: bool = True) -> sqlite3.Cursor:
+        """
+        Execute a script with several SQL commands on the DB (e.g. table creation scripts), returns a cursor.
+
+        :param script_: SQL commands to execute, separated by semicolons
+        :param commit_: flag to close or not, the save transaction in the DB.
+
+        :return: cursor with no specific result
+        """
+        if self.connection is None:
+            self.connect()
+        cursor = self.connection.cursor()
+        tracer_ = query_tracer.get_tracer()
+
+        def run():
+            if tracer_ is None:
+                cursor.executescript(script_)
+            else:
+                with tracer_.trace(self.connection, script_, explain_=False):
+                    cursor.executescript(script_)
+
+        if read_replica.is_enabled():
+            # The script commits the pending transaction before it runs, so both are applied to the replica now
+            writes_, self.__writes = self.__writes + [(read_replica.EXECUTE_SCRIPT, script_, None)], []
+            read_replica.commit(run, writes_)
+        else:
+            run()
+
+        if commit_:
+            self.commit()
 
         return cursor
 
     def get(self,
-            command_: str) -> sqlite3.Cursor:
+            command_: str,
+            params_: tuple | dict = (),
+            model_: type = None) -> sqlite3.Cursor:
         """
         SELECT type query against the DB, returns a cursor.
         :param command_: SQL command to execute
+        :param params_: values bound to the placeholders of the command
+        :param model_: entity class (see model.base_model.Model) the rows are fetched as, None to fetch tuples
         :return: cursor with the result set of the SELECT
         """
-        if self.connection is None:
-            self.connect()
-        cursor = self.connection.cursor()
-        cursor.execute(command_)
+        connection_ = self.__reader()
+        cursor = self.__cursor(connection_)
+        tracer_ = query_tracer.get_tracer()
+        if tracer_ is None:
+            cursor.execute(command_, params_)
+            if model_ is not None:
+                # The rows are built on fetch, so the factory can be matched to the columns of the executed statement
+                cursor.row_factory = model_.row_factory(cursor.description)
+        else:
+            with tracer_.trace(connection_, command_, params_) as query_:
+                cursor.execute(command_, params_)
+            # The rows are counted while the caller fetches them
+            cursor.row_factory = query_.counting(model_.row_factory(cursor.description) if model_ else None)
 
         return cursor
 
     def get_value(self,
                   command_: str,
-                  default_value_: object = None):
+                  default_value_: object = None,
+                  params_: tuple | dict = ()):
         """
         SELECT type query against the DB, returns a scalar
         :param command_: SQL command to execute
         :param default_value_: default value to return
+        :param params_: values bound to the placeholders of the command
         :return: scalar with the result of the SELECT
         :rtype: Any
         """
-        if self.connection is None:
-            self.connect()
-        cursor = self.connection.cursor()
-        cursor.execute(command_)
-        row = cursor.fetchone()
+        connection_ = self.__reader()
+        cursor = self.__cursor(connection_)
+        tracer_ = query_tracer.get_tracer()
+        if tracer_ is None:
+            cursor.execute(command_, params_)
+            row = cursor.fetchone()
+        else:
+            with tracer_.trace(connection_, command_, params_) as query_:
+                cursor.execute(command_, params_)
+                row = cursor.fetchone()
+                query_.rows = 1 if row else 0
         if row:
             value = row[0]
         else:
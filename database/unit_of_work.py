@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+
+"""
+Optional write-behind unit of work: the saves and deletions of records are queued in memory, shown at once by the view,
+  and written later as a single transaction (see flush()), instead of one commit per record.
+The queue is journaled to a file next to the database, so the pending changes survive a crash and are recovered on the
+  next start. Each queued change of an existing record keeps a fingerprint of the record as it was read, and it is
+  rejected on flush if the record was changed or deleted meanwhile by someone else.
+"""
+
+# --- Python modules ---
+# json: module which exposes an API to encode and decode JSON documents.
+import json
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# sqlite3: C library that provides a lightweight disk-based sql without a separate server,
+#          process and allows accessing the sql using a nonstandard variant of the SQL query language
+import sqlite3
+# threading: module which constructs higher-level threading interfaces on top of the lower level _thread module.
+import threading
+# uuid: module which provides immutable UUID objects and functions to generate them.
+import uuid
+
+# --- App modules ---
+from . import connection_pool
+from .sql_connection import SqlConnection
+
+FLUSH_IDLE_MS = 2000        # The view flushes the queue once no record was changed for this time...
+FLUSH_INTERVAL_MS = 10000   # ...or at the latest this time after the 1º change queued
+JOURNAL_SUFFIX = '-pending'
+FLUSHES_TABLE = 'unit_of_work_flushes'      # Token of the last flush committed, see migration 0003
+SAVE = 'save'
+DELETE = 'delete'
+
+
+class Operation:
+    """
+    Change of a record waiting to be written. Immutable, a later change of the same record replaces it.
+    """
+    __slots__ = ('kind', 'table', 'id', 'values', 'base')
+
+    def __init__(self,
+                 kind_: str,
+                 table_: str,
+                 id_: int,
+                 values_: dict = None,
+                 base_: str = None):
+        """
+        Class constructor
+        :param kind_: SAVE or DELETE
+        :param table_: name of the table, see database.TABLES
+        :param id_: identifier of the record, negative for a new record, until it is written
+        :param values_: values of the saved record, by column name
+        :param base_: fingerprint of the record when the change was queued, None for a new record
+        """
+        self.kind = kind_
+        self.table = table_
+        self.id = id_
+        self.values = values_ or {}
+        self.base = base_
+
+    def __str__(self):
+        return f'{self.kind} {self.table} {self.id}'
+
+    def as_dict(self) -> dict:
+        return {'kind': self.kind, 'table': self.table, 'id': self.id, 'values': self.values, 'base': self.base}
+
+    @classmethod
+    def from_dict(cls,
+                  dict_: dict):
+        return cls(dict_['kind'], dict_['table'], dict_['id'], dict_['values'], dict_['base'])
+
+
+class UnitOfWork:
+    """
+    Queue of the changes of records, written as a single transaction on flush. Changes are queued and flushed on the
+      database worker thread, see database.db_worker.
+    """
+    def __init__(self,
+                 journal_file_: str):
+        """
+        Class constructor, which recovers the changes left in the journal by a previous run
+        :param journal_file_: file where the queue is journaled
+        """
+        self.journal_file = journal_file_
+        self.__pending = {}     # (table, id) -> operation, in order of arrival
+        self.__assigned = {}    # temporary id -> id assigned by the database on flush
+        self.__next_id = -1     # Temporary id of the next new record
+        self.__lock = threading.Lock()
+        self.__recover()
+
+    def __len__(self):
+        return len(self.__pending)
+
+    def save(self,
+             table_name_: str,
+             id_: int | None,
+             values_: dict) -> tuple:
+        """
+        Queues the saving of a record
+        :param table_name_: name of the table, see database.TABLES
+        :param id_: identifier of the record, None or 0 to insert a new one
+        :param values_: values of the record, by column name, as the generic forms of the view save them
+        :return: tuple (id, row), the id is temporary (negative) for a new record, and the row is the record as it
+          will be once written
+        """
+        if id_ is None or id_ == 0:
+            with self.__lock:
+                id_ = self.__next_id
+                self.__next_id -= 1
+            base_row_ = base_ = None
+        else:
+            id_ = self.__assigned.get(id_, id_)
+            base_row_, base_ = self.__base_row(table_name_, id_)
+
+        operation_ = self.__register(Operation(SAVE, table_name_, id_, dict(values_), base_),
+                                     new_=base_row_ is None and id_ < 0)
+        return operation_.id, self.__row(table_name_, operation_, base_row_)
+
+    def delete(self,
+               table_name_: str,
+               id_: int) -> tuple:
+        """
+        Queues the deletion of a record
+        :return: tuple (id, None) of the deleted record
+        """
+        id_ = self.__assigned.get(id_, id_)
+        _, base_ = self.__base_row(table_name_, id_)
+        self.__register(Operation(DELETE, table_name_, id_, base_=base_))
+        return id_, None
+
+    def pending_row(self,
+                    table_name_: str,
+                    id_: int) -> tuple:
+        """
+        Record as it will be once the queued change is written
+        :return: tuple (pending, row), pending is False if the record has no queued change, row is None if it is
+          going to be deleted
+        """
+        id_ = self.__assigned.get(id_, id_)
+        operation_ = self.__pending.get((table_name_, id_))
+        if operation_ is None:
+            return False, None
+        if operation_.kind == DELETE:
+            return True, None
+        return True, self.__row(table_name_, operation_, self.__base_row(table_name_, id_)[0] if id_ > 0 else None)
+
+    def __register(self,
+                   operation_: Operation,
+                   new_: bool = False,
+                   journal_: bool = True) -> Operation:
+        """
+        Queues a change, merged with the one already queued for the same record, if any
+        :param new_: flag of the 1º change of a new record, which has just got its temporary id
+        :param journal_: flag to journal the change, False while the journal is recovered
+        :return: change queued for the record
+        """
+        key_ = (operation_.table, operation_.id)
+        with self.__lock:
+            previous_ = self.__pending.get(key_)
+            if operation_.id < 0 and previous_ is None and not new_:
+                raise ValueError(f'Unknown new record {operation_.id} of {operation_.table} table.')
+
+            if previous_ is not None:
+                if previous_.kind == DELETE:
+                    raise ValueError(f'The record {operation_.id} of {operation_.table} table was deleted.')
+                # The record is as it was when its 1º change was queued
+                operation_ = Operation(operation_.kind, operation_.table, operation_.id,
+                                       {**previous_.values, **operation_.values}, previous_.base)
+
+            # Journaled before it is queued, so a change reported as queued is never lost
+            if journal_:
+                self.__append({'operation': operation_.as_dict()})
+
+            # Moved to the end, in order of arrival. A new record deleted before it was written needs nothing.
+            self.__pending.pop(key_, None)
+            if operation_.kind == SAVE or operation_.id > 0:
+                self.__pending[key_] = operation_
+
+        return operation_
+
+    def flush(self) -> tuple:
+        """
+        Writes the queued changes as a single transaction. A change rejected by a conflict or by the validation of its
+          table is discarded, the other ones are written anyway.
+        :return: tuple (ids, rejected), ids maps the temporary ids of the new records to the ids assigned by the
+          database, rejected is a list of tuples (operation, reason)
+        """
+        # --- App modules ---
+        from . import TABLES
+
+        with self.__lock:
+            operations_ = list(self.__pending.values())
+        if not operations_:
+            return {}, []
+
+        ids_ = {}
+        rejected_ = []
+        token_ = uuid.uuid4().hex
+        db_ = SqlConnection()
+        tables_ = {}
+        try:
+            with db_.transaction():
+                for operation_ in operations_:
+                    table_ = tables_.get(operation_.table)
+                    if table_ is None:
+                        table_ = tables_[operation_.table] = TABLES[operation_.table]()
+                        table_.db = db_     # Every table writes within the same transaction
+
+                    reason_ = self.__conflict(table_, operation_)
+                    if reason_ is not None:
+                        rejected_.append((operation_, reason_))
+                        continue
+
+                    db_.execute('SAVEPOINT operation', commit_=False)
+                    try:
+                        id_ = self.__apply(table_, operation_)
+                    except (ValueError, sqlite3.Error) as e:
+                        db_.execute('ROLLBACK TO operation', commit_=False)
+                        db_.execute('RELEASE operation', commit_=False)
+                        rejected_.append((operation_, str(e)))
+                        continue
+                    db_.execute('RELEASE operation', commit_=False)
+
+                    if operation_.id < 0:
+                        ids_[operation_.id] = id_
+
+                # Tells the recovery whether this transaction was committed, if the journal is not cleared: the token
+                #   is in the database only once it is
+                db_.execute(f'DELETE FROM {FLUSHES_TABLE}', commit_=False)
+                db_.execute(f'INSERT INTO {FLUSHES_TABLE} (token) VALUES (?)', (token_,), commit_=False)
+                self.__append({'flush': {'token': token_}})
+        finally:
+            db_.close()
+
+        with self.__lock:
+            for operation_ in operations_:
+                key_ = (operation_.table, operation_.id)
+                if self.__pending.get(key_) is operation_:
+                    del self.__pending[key_]
+            self.__assigned.update(ids_)
+            self.__rewrite(self.__pending.values())
+
+        return ids_, rejected_
+
+    def __conflict(self,
+                   table_,
+                   operation_: Operation) -> str | None:
+        """
+        Reason why a queued change cannot be written, None if the record is still as it was when it was queued
+        """
+        if operation_.id < 0:
+            return None
+        fingerprint_ = self.__fingerprint(table_, operation_.id)
+        if fingerprint_ is None:
+            return None if operation_.kind == DELETE else 'the record was deleted by someone else'
+        if fingerprint_ != operation_.base:
+            return 'the record was changed by someone else'
+        return None
+
+    @staticmethod
+    def __apply(table_,
+                operation_: Operation) -> int:
+        """
+        Writes a queued change
+        :return: identifier of the record, assigned by the database if it is a new one
+        """
+        if operation_.kind == DELETE:
+            table_.delete(operation_.id)
+            return operation_.id
+        return table_.save_record(operation_.id if operation_.id > 0 else None, operation_.values)
+
+    @staticmethod
+    def __base_row(table_name_: str,
+                   id_: int) -> tuple:
+        """
+        Record as it is in the database, and its fingerprint, (None, None) if it does not exist (e.g. it is new)
+        """
+        if id_ < 0:
+            return None, None
+
+        # --- App modules ---
+        from . import TABLES
+        with TABLES[table_name_]() as table_:
+            # Compared with the record on flush, which is read from the database file, not from the read replica
+            table_.db.primary = True
+            return table_.fetch_by_id(id_), UnitOfWork.__fingerprint(table_, id_)
+
+    @staticmethod
+    def __fingerprint(table_,
+                      id_: int) -> str | None:
+        """
+        Fingerprint of the values of a record as they are stored in its table, to detect whether it changed, None if it
+          does not exist. The values joined by the source of the rows (e.g. the genre name of the movies view) are left
+          out, so a change of another record, e.g. a genre renamed, does not change it.
+        """
+        row_ = table_.db.get(f'SELECT * FROM \'{table_.table_name}\' WHERE id = ?', (id_,)).fetchone()
+        return None if row_ is None else repr(tuple(row_))
+
+    @staticmethod
+    def __row(table_name_: str,
+              operation_: Operation,
+              base_row_):
+        """
+        Record as it will be once a queued save is written: the record in the database, if any, with the values saved
+        """
+        # --- App modules ---
+        from . import TABLES
+        model_ = TABLES[table_name_].model
+        row_ = model_.__new__(model_)
+        for name_ in model_.__slots__:
+            setattr(row_, name_, getattr(base_row_, name_, None))
+        for name_, value_ in operation_.values.items():
+            if name_ in model_.__slots__:
+                setattr(row_, name_, value_)
+        row_.id = operation_.id
+        return row_
+
+    @staticmethod
+    def __flushed(token_: str | None) -> bool:
+        """
+        Identifies whether the transaction of a flush was committed, by the token it wrote
+        """
+        db_ = SqlConnection()
+        # Read from the database file, not from the read replica
+        db_.primary = True
+        try:
+            return db_.get_value(f'SELECT COUNT(*) FROM {FLUSHES_TABLE} WHERE token = ?', 0, (token_,)) > 0
+        except sqlite3.OperationalError as e:
+            if 'no such table' not in str(e):
+                raise e
+            # The database was not upgraded yet, so no flush was committed
+            return False
+        finally:
+            db_.close()
+
+    def __append(self,
+                 entry_: dict):
+        """
+        Appends an entry to the journal, forcing it to disk before the change is reported as queued
+        """
+        with open(self.journal_file, 'a', encoding='utf-8') as file_:
+            file_.write(json.dumps(entry_) + '\n')
+            file_.flush()
+            os.fsync(file_.fileno())
+
+    def __rewrite(self,
+                  operations_):
+        """
+        Replaces the journal by the changes still queued, removing it if there are none. The file is replaced
+          atomically, so a crash leaves either the old journal or the new one.
+        """
+        operations_ = list(operations_)
+        if not operations_:
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            return
+
+        temporary_file_ = self.journal_file + '.tmp'
+        with open(temporary_file_, 'w', encoding='utf-8') as file_:
+            for operation_ in operations_:
+                file_.write(json.dumps({'operation': operation_.as_dict()}) + '\n')
+            file_.flush()
+            os.fsync(file_.fileno())
+        os.replace(temporary_file_, self.journal_file)
+
+    def __recover(self):
+        """
+        Queues again the changes left in the journal. The ones of a flush which was committed before the journal could
+          be cleared are discarded: the flush journaled a token, which its transaction wrote in the database.
+        """
+        try:
+            with open(self.journal_file, 'r', encoding='utf-8') as file_:
+                lines_ = file_.readlines()
+        except FileNotFoundError:
+            return
+
+        for line_ in lines_:
+            try:
+                entry_ = json.loads(line_)
+            except ValueError:
+                # Last line, cut by the crash while it was being written: that change was never reported as queued
+                break
+
+            if 'flush' in entry_:
+                if self.__flushed(entry_['flush'].get('token')):
+                    self.__pending.clear()
+                continue
+
+            operation_ = Operation.from_dict(entry_['operation'])
+            self.__next_id = min(self.__next_id, operation_.id - 1)
+            self.__register(operation_, new_=operation_.kind == SAVE, journal_=False)
+
+        self.__rewrite(self.__pending.values())
+
+
+# Process-wide unit of work, created on first use
+_unit_of_work = None
+_unit_of_work_lock = threading.Lock()
+
+
+def get_unit_of_work() -> UnitOfWork:
+    """
+    Gets the process-wide unit of work, journaled next to the database of the connection pool, recovering the changes
+      left by a previous run
+    """
+    global _unit_of_work
+    with _unit_of_work_lock:
+        if _unit_of_work is None:
+            _unit_of_work = UnitOfWork(connection_pool.get_pool().database + JOURNAL_SUFFIX)
+        return _unit_of_work
+
+
+def shutdown():
+    """
+    Writes the changes still queued, if any. It must be called when the application exits, after the database worker
+      is stopped and before the connection pool is shut down.
+    """
+    global _unit_of_work
+    with _unit_of_work_lock:
+        if _unit_of_work is not None:
+            _unit_of_work.flush()
+            _unit_of_work = None
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+"""
+versions package contains the schema migrations, applied in order by database.migrations.
+
+Each module is named v<version>_<description>.py, version being a number greater than the one before, and defines
+  upgrade(schema_), which receives a database.migrations.Schema. Migrations must be idempotent: tables may not exist
+  yet, or may already be up to date, e.g. when they were created from the current creation scripts.
+"""
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+"""
+Moves movies.gender, a copy of the genre name, to movies.genre_id, a foreign key to genres (id)
+"""
+
+
+def upgrade(schema_):
+    if not schema_.table_exists('movies') or 'genre_id' in schema_.columns('movies'):
+        return
+
+    if not schema_.table_exists('genres'):
+        schema_.run_script('create_genres.sql')
+
+    schema_.run_script('migrate_0001_movies_genre_id.sql')
+
+    # The triggers of the full-text index were dropped along with the old table
+    if schema_.table_exists('movies_fts'):
+        schema_.run_script('create_movies_fts_triggers.sql')
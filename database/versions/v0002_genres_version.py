@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+"""
+Adds the version of the genres, kept up to date by triggers, which the genre cache checks instead of the version of
+  the whole database
+"""
+
+
+def upgrade(schema_):
+    if schema_.table_exists('genres'):
+        schema_.run_script('create_genres_version.sql')
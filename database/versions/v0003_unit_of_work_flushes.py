@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+"""
+Adds the token of the last flush of the unit of work, written in the transaction of the flush, so the recovery knows
+  whether a flush interrupted by a crash was committed
+"""
+
+
+def upgrade(schema_):
+    schema_.execute('CREATE TABLE IF NOT EXISTS unit_of_work_flushes '
+                    '(token TEXT PRIMARY KEY, flushed_on TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)')
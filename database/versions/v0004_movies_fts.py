@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+"""
+Adds the full-text index of the movies to the databases created without it, indexing the movies already saved. It is
+  optional, since it requires SQLite built with FTS5, otherwise the text search keeps scanning the movies.
+"""
+
+# --- Python modules ---
+# sqlite3: C library that provides a lightweight disk-based sql without a separate server,
+#          process and allows accessing the sql using a nonstandard variant of the SQL query language
+import sqlite3
+
+
+def upgrade(schema_):
+    if not schema_.table_exists('movies') or schema_.table_exists('movies_fts'):
+        return
+
+    try:
+        schema_.run_script('create_movies_fts.sql')
+    except sqlite3.OperationalError as e:
+        if 'fts5' not in str(e):
+            raise e
+        # SQLite was built without FTS5
+        return
+
+    schema_.run_script('create_movies_fts_triggers.sql')
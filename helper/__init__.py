@@ -1,4 +1,8 @@
 # -*- coding: utf-8 -*-
 
+# Imported first, since the startup is timed from it
+from . import startup
 from . import layout
+from . import layout_compiler
+from . import profiling
 from . import string_helper
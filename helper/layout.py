@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 
+# --- Python modules ---
+# itertools: module which implements a number of iterator building blocks.
+import itertools
+
 BACKGROUND_COLOR = '#D6EAF8'        # Visit: https://htmlcolorcodes.com
 DEFAULT_CONTAINER_WIDTH = 640
 DEFAULT_CONTAINER_HEIGHT = 480
@@ -10,25 +14,33 @@ DEFAULT_TOP_MARGIN = 5
 DEFAULT_ROW_HEIGHT = 20             # Default height for widgets
 DEFAULT_LABEL_WIDTH = 80
 DEFAULT_INPUT_WIDGET_WIDTH = 213    # Default width for input widgets, like (entry, combobox, ...)
+DEFAULT_SHORT_INPUT_WIDGET_WIDTH = int(DEFAULT_INPUT_WIDGET_WIDTH / 2)
 DEFAULT_BUTTON_HEIGHT = DEFAULT_ROW_HEIGHT + int(DEFAULT_ROW_HEIGHT / 2)
 DEFAULT_BUTTON_WIDTH = 120
 DEFAULT_BUTTON_LEFT_MARGIN = DEFAULT_TOP_MARGIN - 3
 
-DEFAULT_TREEVIEW_GRID_ROWS_COUNT = 10
+DEFAULT_TREEVIEW_GRID_ROWS_COUNT = 12
 DEFAULT_TREEVIEW_DATAGRID_WIDTH = 0     # Interpreted as the full width of the container
 DEFAULT_TREEVIEW_DATAGRID_HEIGHT = int((DEFAULT_TOP_MARGIN + DEFAULT_ROW_HEIGHT) * DEFAULT_TREEVIEW_GRID_ROWS_COUNT)
+DEFAULT_TREEVIEW_HEADING_HEIGHT = DEFAULT_ROW_HEIGHT + DEFAULT_TOP_MARGIN
+DEFAULT_TREEVIEW_VIRTUAL_THRESHOLD = 5000   # Above this number of rows the datagrid scrolls virtually
+DEFAULT_TREEVIEW_LOAD_CHUNK_SIZE = 500     # Rows inserted into the datagrid on each step of a load
 
 DEFAULT_GRID_ROWS_HEIGHT = (DEFAULT_ROW_HEIGHT,                 # 1º row
                             DEFAULT_ROW_HEIGHT,                 # 2º row
                             int(DEFAULT_ROW_HEIGHT / 2),        # 3º row
                             DEFAULT_BUTTON_HEIGHT,              # 4º row
                             int(DEFAULT_ROW_HEIGHT / 2),        # 5º row
-                            DEFAULT_TREEVIEW_DATAGRID_HEIGHT)   # 6º row
+                            DEFAULT_ROW_HEIGHT,                 # 6º row
+                            DEFAULT_TREEVIEW_DATAGRID_HEIGHT,   # 7º row
+                            DEFAULT_ROW_HEIGHT)                 # 8º row
 
 DEFAULT_GRID_COLUMNS_WIDTH = (DEFAULT_LABEL_WIDTH,              # 1º column
                               DEFAULT_INPUT_WIDGET_WIDTH,       # 2º column
                               DEFAULT_LABEL_WIDTH,              # 3º column
-                              DEFAULT_INPUT_WIDGET_WIDTH)       # 4º column
+                              DEFAULT_SHORT_INPUT_WIDGET_WIDTH,  # 4º column, spanned with the 5º by input widgets
+                              DEFAULT_INPUT_WIDGET_WIDTH - DEFAULT_SHORT_INPUT_WIDGET_WIDTH
+                              - DEFAULT_LEFT_MARGIN)            # 5º column
 
 DEFAULT_V_SCROLLBAR_WIDTH = 15
 DEFAULT_H_SCROLLBAR_HEIGHT = 15
@@ -39,11 +51,20 @@ class FakeGridLayout:
     Class to simulate a Grid (rows x columns) inside the Container based on the Place layout manager,
       thus calculating for each widget absolute coordinates (x, y).
     """
+    __slots__ = ('__rows_height', '__columns_width', '__rows_y', '__columns_x')
+
     def __init__(self,
                  rows_height_: () = DEFAULT_GRID_ROWS_HEIGHT,
                  columns_width_: () = DEFAULT_GRID_COLUMNS_WIDTH):
-        self.__rows_height = rows_height_
-        self.__columns_width = columns_width_
+        self.__rows_height = tuple(rows_height_)
+        self.__columns_width = tuple(columns_width_)
+
+        # Precompute once the coordinate of each row/column (plus the one after the last), from the cumulative
+        #   heights/widths and the margins, so the coordinate of the n-th row/column is just [n - 1]
+        self.__rows_y = tuple(offset_ + DEFAULT_TOP_MARGIN * (i_ + 1) for i_, offset_ in
+                              enumerate(itertools.accumulate(self.__rows_height, initial=0)))
+        self.__columns_x = tuple(offset_ + DEFAULT_LEFT_MARGIN * (i_ + 1) for i_, offset_ in
+                                 enumerate(itertools.accumulate(self.__columns_width, initial=0)))
 
     def get_place(self,
                   row_number_: int,
@@ -51,10 +72,93 @@ class FakeGridLayout:
         """
         Calculates the exact coordinates (x, y) to place the widget inside the parent container, obtained from a
           fake-grid mimicked by GRID_ROWS_HEIGHT and GRID_COLUMNS_WIDTH
-        :param row_number_: where the widget will be placed inside the container
-        :param col_number_: where the widget will be placed inside the container
+        :param row_number_: where the widget will be placed inside the container, starting at 1
+        :param col_number_: where the widget will be placed inside the container, starting at 1
         :return: coordinates (x, y) to Place the widget inside the container
         """
-        x_ = sum(self.__columns_width[:col_number_ - 1]) + DEFAULT_LEFT_MARGIN * col_number_
-        y_ = sum(self.__rows_height[:row_number_ - 1]) + DEFAULT_TOP_MARGIN * row_number_
+        try:
+            return self.__columns_x[col_number_ - 1], self.__rows_y[row_number_ - 1]
+        except IndexError:
+            return self.__get_place_beyond(row_number_, col_number_)
+
+    def get_cell(self,
+                 row_number_: int,
+                 col_number_: int,
+                 rowspan_: int = 1,
+                 colspan_: int = 1) -> ():
+        """
+        Calculates the exact geometry (x, y, width, height) of a cell of the fake-grid, which may span several rows
+          and/or columns, including the margins between them
+        :param row_number_: 1º row of the cell, starting at 1
+        :param col_number_: 1º column of the cell, starting at 1
+        :param rowspan_: number of rows spanned by the cell
+        :param colspan_: number of columns spanned by the cell
+        :return: geometry (x, y, width, height) to Place the widget inside the container
+        """
+        try:
+            x_ = self.__columns_x[col_number_ - 1]
+            y_ = self.__rows_y[row_number_ - 1]
+            return (x_, y_,
+                    self.__columns_x[col_number_ - 1 + colspan_] - x_ - DEFAULT_LEFT_MARGIN,
+                    self.__rows_y[row_number_ - 1 + rowspan_] - y_ - DEFAULT_TOP_MARGIN)
+        except IndexError:
+            raise ValueError(f'Cell ({row_number_}, {col_number_}) spanning {rowspan_} x {colspan_} is out of the '
+                             f'{len(self.__rows_height)} x {len(self.__columns_width)} grid.')
+
+    def get_cells(self,
+                  cells_) -> []:
+        """
+        Calculates the geometry (x, y, width, height) of many cells in a single call
+        :param cells_: iterable of tuples (row, col, rowspan, colspan)
+        :return: list with the geometry of each cell, in the same order
+        """
+        return [self.get_cell(*cell_) for cell_ in cells_]
+
+    def get_row_strip(self,
+                      row_number_: int,
+                      items_count_: int,
+                      item_width_: int = DEFAULT_BUTTON_WIDTH,
+                      spacing_: int = DEFAULT_BUTTON_LEFT_MARGIN,
+                      container_width_: int = DEFAULT_CONTAINER_WIDTH) -> []:
+        """
+        Calculates the geometry (x, y, width, height) of a strip of items (e.g. buttons) aligned to the right of a
+          row, which does not respect the columns of the grid
+        :param row_number_: row of the strip, starting at 1
+        :param items_count_: number of items in the strip
+        :param item_width_: width of each item
+        :param spacing_: space before each item
+        :param container_width_: width of the container, the strip ends a left margin before its right border
+        :return: list with the geometry of each item, from left to right
+        """
+        _, y_, _, height_ = self.get_cell(row_number_, 1)
+        step_ = spacing_ + item_width_
+        x_ = container_width_ - step_ * items_count_ - DEFAULT_LEFT_MARGIN
+        return [(x_ + step_ * i_, y_, item_width_, height_) for i_ in range(items_count_)]
+
+    def place_many(self,
+                   cells_) -> []:
+        """
+        Calculates the coordinates (x, y) of many cells in a single call
+        :param cells_: iterable of tuples (row, col, rowspan, colspan), or just (row, col)
+        :return: list with the coordinates (x, y) of each cell, in the same order
+        """
+        rows_y_ = self.__rows_y
+        columns_x_ = self.__columns_x
+        try:
+            return [(columns_x_[cell_[1] - 1], rows_y_[cell_[0] - 1]) for cell_ in cells_]
+        except IndexError:
+            return [self.get_place(cell_[0], cell_[1]) for cell_ in cells_]
+
+    def __get_place_beyond(self,
+                           row_number_: int,
+                           col_number_: int) -> ():
+        """
+        Coordinates of rows/columns beyond the grid, placed after the last one as if the ones in between had no size
+        """
+        columns_count_ = len(self.__columns_width)
+        rows_count_ = len(self.__rows_height)
+        x_ = (self.__columns_x[min(col_number_ - 1, columns_count_)]
+              + DEFAULT_LEFT_MARGIN * max(0, col_number_ - 1 - columns_count_))
+        y_ = (self.__rows_y[min(row_number_ - 1, rows_count_)]
+              + DEFAULT_TOP_MARGIN * max(0, row_number_ - 1 - rows_count_))
         return x_, y_
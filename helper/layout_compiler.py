@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# hashlib: module which implements a common interface to many different secure hash and message digest algorithms.
+import hashlib
+# json: module which exposes an API to encode and decode JSON documents.
+import json
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# tempfile: module which creates temporary files and directories.
+import tempfile
+
+# --- App modules ---
+from helper import layout
+
+DEFAULT_CACHE_FOLDER = os.path.join(os.path.expanduser('~'), '.cache', 'movieCatalog', 'layout')
+PLAN_VERSION = 1            # Increase it when the plan format changes, thus invalidating the cached plans
+
+# Sections of a form spec whose items are placed in a fake cell, given by their 'cell': (row, col[, rowspan, colspan])
+CELL_SECTIONS = ('fields', 'datagrid', 'status')
+
+
+def layout_key(spec_: dict) -> dict:
+    """
+    Layout constants a placement plan depends on
+    :param spec_: form spec, which may override the grid rows height and columns width
+    """
+    return {
+        'rows_height': list(spec_.get('rows_height', layout.DEFAULT_GRID_ROWS_HEIGHT)),
+        'columns_width': list(spec_.get('columns_width', layout.DEFAULT_GRID_COLUMNS_WIDTH)),
+        'container': [layout.DEFAULT_CONTAINER_WIDTH, layout.DEFAULT_CONTAINER_HEIGHT],
+        'margins': [layout.DEFAULT_LEFT_MARGIN, layout.DEFAULT_TOP_MARGIN],
+        'buttons': [layout.DEFAULT_BUTTON_WIDTH, layout.DEFAULT_BUTTON_LEFT_MARGIN],
+        'version': PLAN_VERSION,
+    }
+
+
+def spec_hash(spec_: dict) -> str:
+    """
+    Hash of a form spec and the layout constants, which identifies its placement plan
+    """
+    key_ = json.dumps({'spec': spec_, 'layout': layout_key(spec_)}, sort_keys=True, default=str)
+    return hashlib.sha256(key_.encode('utf-8')).hexdigest()
+
+
+def compile_form(spec_: dict) -> []:
+    """
+    Compiles a declarative form spec into a flat placement plan, translating every fake cell into its geometry
+    :param spec_: form spec, a dictionary with the sections:
+      fields: list of {'kind': label|entry|combobox|checkbox, 'cell': (row, col[, rowspan, colspan]), ...}
+      buttons: {'row': row, 'commands': (command, ...)}, a strip of buttons aligned to the right of the row
+      datagrid: {'cell': (...), 'columns': (...)}
+      status: {'cell': (...)}
+    :return: list of placements {'section', 'index', 'kind', 'x', 'y', 'width', 'height'}, index being the position
+      of the item inside its section
+    """
+    key_ = layout_key(spec_)
+    fake_grid_ = layout.FakeGridLayout(key_['rows_height'], key_['columns_width'])
+
+    plan_ = []
+    for section_ in CELL_SECTIONS:
+        items_ = spec_.get(section_)
+        if items_ is None:
+            continue
+        if isinstance(items_, dict):
+            items_ = (items_,)
+        cells_ = fake_grid_.get_cells(tuple(item_['cell']) + (1, 1)[len(item_['cell']) - 2:] for item_ in items_)
+        for index_, (item_, cell_) in enumerate(zip(items_, cells_)):
+            plan_.append(_placement(section_, index_, item_.get('kind', section_), cell_))
+
+    buttons_ = spec_.get('buttons')
+    if buttons_ is not None:
+        strip_ = fake_grid_.get_row_strip(buttons_['row'], len(buttons_['commands']),
+                                          container_width_=key_['container'][0])
+        for index_, cell_ in enumerate(strip_):
+            plan_.append(_placement('buttons', index_, 'button', cell_))
+
+    return plan_
+
+
+def _placement(section_: str,
+                index_: int,
+                kind_: str,
+                cell_: tuple) -> dict:
+    x_, y_, width_, height_ = cell_
+    return {'section': section_, 'index': index_, 'kind': kind_, 'x': x_, 'y': y_, 'width': width_, 'height': height_}
+
+
+def get_plan(spec_: dict,
+             cache_folder_: str = DEFAULT_CACHE_FOLDER) -> []:
+    """
+    Gets the placement plan of a form spec from the disk cache, compiling and caching it if it is not there
+    :param spec_: form spec, see compile_form()
+    :param cache_folder_: folder of the cached plans, if it is None the plan is always compiled
+    :return: placement plan
+    """
+    if cache_folder_ is None:
+        return compile_form(spec_)
+
+    file_name_ = os.path.join(cache_folder_, f'{spec_.get("name", "form")}-{spec_hash(spec_)}.json')
+    try:
+        with open(file_name_, 'r', encoding='utf-8') as file_:
+            return json.load(file_)
+    except (OSError, ValueError):
+        # Not cached yet, or unreadable
+        pass
+
+    plan_ = compile_form(spec_)
+    try:
+        # Write to a temporary file then rename it, so a plan is never read half written
+        os.makedirs(cache_folder_, exist_ok=True)
+        handle_, temp_name_ = tempfile.mkstemp(dir=cache_folder_, suffix='.tmp')
+        with os.fdopen(handle_, 'w', encoding='utf-8') as file_:
+            json.dump(plan_, file_)
+        os.replace(temp_name_, file_name_)
+    except OSError:
+        # The cache is an optimization, the plan is valid anyway
+        pass
+
+    return plan_
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+"""
+Opt-in instrumentation: timers of the calls of chosen methods, aggregated in memory (count, total, percentiles), which
+  are shown in Help -> Diagnostics and dumped on exit as JSON, or as a cProfile report of the Tk main thread.
+Methods are only wrapped by instrument(), so nothing is measured, nor slowed down, unless profiling is enabled (see
+  python main.py --profile).
+"""
+
+# --- Python modules ---
+# cProfile: module which provides deterministic profiling of Python programs.
+import cProfile
+# functools: module for higher-order functions: functions that act on or return other functions.
+import functools
+# json: module which exposes an API to encode and decode JSON documents.
+import json
+# random: module which implements pseudo-random number generators for various distributions.
+import random
+# threading: module which constructs higher-level threading interfaces on top of the lower level _thread module.
+import threading
+# time: module which provides various time-related functions.
+import time
+
+DEFAULT_MAX_SAMPLES = 10000                 # Durations kept per timer, beyond it a uniform sample of all of them
+ENVIRONMENT_VARIABLE = 'MOVIE_CATALOG_PROFILE'
+PROFILER_SUFFIXES = ('.prof', '.pstats')    # Report files written as cProfile statistics, instead of JSON
+
+
+class Timer:
+    """
+    Durations of the calls of a method
+    """
+    __slots__ = ('name', 'count', 'total_ns', 'max_ns', 'samples')
+
+    def __init__(self,
+                 name_: str):
+        """
+        Class constructor
+        """
+        self.name = name_
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.samples = []
+
+    def add(self,
+            elapsed_ns_: int,
+            random_: random.Random):
+        """
+        Adds the duration of a call, keeping a bounded uniform sample of the durations (reservoir sampling)
+        """
+        self.count += 1
+        self.total_ns += elapsed_ns_
+        self.max_ns = max(self.max_ns, elapsed_ns_)
+        if len(self.samples) < DEFAULT_MAX_SAMPLES:
+            self.samples.append(elapsed_ns_)
+        else:
+            index_ = random_.randrange(self.count)
+            if index_ < DEFAULT_MAX_SAMPLES:
+                self.samples[index_] = elapsed_ns_
+
+    def summary(self) -> dict:
+        """
+        Statistics of the calls, in milliseconds
+        """
+        samples_ = sorted(self.samples)
+        return {'name': self.name,
+                'count': self.count,
+                'total_ms': self.total_ns / 1e6,
+                'mean_ms': self.total_ns / self.count / 1e6 if self.count else 0.0,
+                'p50_ms': percentile(samples_, 50) / 1e6,
+                'p90_ms': percentile(samples_, 90) / 1e6,
+                'p99_ms': percentile(samples_, 99) / 1e6,
+                'max_ms': self.max_ns / 1e6}
+
+
+def percentile(sorted_: [],
+               percent_: float) -> float:
+    """
+    Nearest-rank percentile of sorted values, 0 if there are none
+    """
+    if not sorted_:
+        return 0
+    rank_ = max(1, -(-len(sorted_) * percent_ // 100))
+    return sorted_[int(rank_) - 1]
+
+
+_enabled = False
+_timers = {}                # name -> Timer
+_lock = threading.Lock()    # Calls are timed on the Tk main thread and on the database worker thread
+_random = random.Random(0)
+_profiler = None            # cProfile of the Tk main thread, if the report is a cProfile one
+
+
+def enable(report_file_: str = None):
+    """
+    Enables profiling, before the methods are instrumented
+    :param report_file_: file the report will be dumped to, a cProfile report of the calling thread if it ends with
+      .prof or .pstats, which is started now
+    """
+    global _enabled, _profiler
+    _enabled = True
+    if report_file_ is not None and report_file_.lower().endswith(PROFILER_SUFFIXES) and _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def record(name_: str,
+           elapsed_ns_: int):
+    """
+    Adds the duration of a call to the timer of a name
+    """
+    with _lock:
+        timer_ = _timers.get(name_)
+        if timer_ is None:
+            timer_ = _timers[name_] = Timer(name_)
+        timer_.add(elapsed_ns_, _random)
+
+
+def timed(name_: str):
+    """
+    Decorator which times the calls of a function under a name
+    """
+    def decorator(function_):
+        @functools.wraps(function_)
+        def wrapper(*args_, **kwargs_):
+            start_ = time.perf_counter_ns()
+            try:
+                return function_(*args_, **kwargs_)
+            finally:
+                record(name_, time.perf_counter_ns() - start_)
+
+        wrapper.timed = True
+        return wrapper
+
+    return decorator
+
+
+def instrument(class_: type,
+               names_: tuple = None):
+    """
+    Times the calls of methods of a class, replacing them in the class by timed wrappers. Does nothing if profiling is
+      not enabled. Generator methods are left as they are, since only their creation could be timed.
+    :param class_: class whose methods are timed, the methods it inherits are timed on their own class
+    :param names_: names of the methods, private ones (e.g. '__save') without mangling, by default all the public
+      methods defined by the class
+    """
+    if not _enabled:
+        return
+
+    # --- Python modules ---
+    # inspect: module which provides several useful functions to help get information about live objects. Imported on
+    #          first use, since it is slow to import and only needed when profiling.
+    import inspect
+
+    if names_ is None:
+        names_ = tuple(name_ for name_, value_ in vars(class_).items() if not name_.startswith('_') and
+                       (inspect.isfunction(value_) or isinstance(value_, (staticmethod, classmethod))))
+
+    for name_ in names_:
+        attribute_ = name_
+        if name_.startswith('__') and not name_.endswith('__'):
+            attribute_ = f'_{class_.__name__}{name_}'
+        value_ = vars(class_)[attribute_]
+
+        function_ = value_.__func__ if isinstance(value_, (staticmethod, classmethod)) else value_
+        if getattr(function_, 'timed', False) or inspect.isgeneratorfunction(function_):
+            continue
+
+        wrapper_ = timed(f'{class_.__name__}.{name_}')(function_)
+        setattr(class_, attribute_, type(value_)(wrapper_) if function_ is not value_ else wrapper_)
+
+
+def summary() -> []:
+    """
+    Statistics of every timer, the ones with the most total time first
+    """
+    with _lock:
+        summaries_ = [timer_.summary() for timer_ in _timers.values()]
+    return sorted(summaries_, key=lambda summary_: summary_['total_ms'], reverse=True)
+
+
+def reset():
+    """
+    Discards the durations measured so far
+    """
+    with _lock:
+        _timers.clear()
+
+
+def dump(report_file_: str):
+    """
+    Writes the report: cProfile statistics if the file ends with .prof or .pstats, otherwise the timers as JSON
+    """
+    if report_file_.lower().endswith(PROFILER_SUFFIXES):
+        if _profiler is not None:
+            _profiler.disable()
+            _profiler.dump_stats(report_file_)
+        return
+
+    with open(report_file_, 'w', encoding='utf-8') as file_:
+        json.dump(summary(), file_, indent=2)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""
+Startup timing: milestones of the application startup, in seconds since this module was imported, which main.py does
+  first of all, so regressions of the cold start show up (see python main.py --startup-report).
+"""
+
+# --- Python modules ---
+# time: module which provides various time-related functions.
+import time
+
+IMPORTS = 'imports'             # Modules of the application imported
+FIRST_PAINT = 'first paint'     # Skeleton of the main window shown, without data
+DATA_READY = 'data ready'       # Rows of the data grid loaded
+LOAD_FAILED = 'load failed'     # A request failed before the data was ready, so it may never be
+
+_started = time.perf_counter()
+_marks = {}                     # milestone -> seconds since started, only its 1º time
+_listeners = {}                 # milestone -> callables invoked when it is reached
+
+
+def mark(milestone_: str):
+    """
+    Records that a milestone was reached, only the first time
+    """
+    if milestone_ in _marks:
+        return
+    _marks[milestone_] = time.perf_counter() - _started
+    for listener_ in _listeners.pop(milestone_, ()):
+        listener_()
+
+
+def on_mark(milestone_: str,
+            listener_):
+    """
+    Invokes a callable when a milestone is reached, at once if it already was
+    """
+    if milestone_ in _marks:
+        listener_()
+    else:
+        _listeners.setdefault(milestone_, []).append(listener_)
+
+
+def elapsed(milestone_: str) -> float | None:
+    """
+    Seconds since startup until a milestone, None if it was not reached yet
+    """
+    return _marks.get(milestone_)
+
+
+def report() -> str:
+    """
+    Milestones reached, in order, with the time since startup and since the previous one
+    """
+    lines_ = []
+    previous_ = 0.0
+    for milestone_, seconds_ in sorted(_marks.items(), key=lambda item_: item_[1]):
+        lines_.append(f'{milestone_:<12} {seconds_ * 1e3:>9.1f} ms  (+{(seconds_ - previous_) * 1e3:.1f} ms)')
+        previous_ = seconds_
+    return '\n'.join(lines_)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""
+Bulk import of movies into the catalog database, from a CSV or JSON file.
+
+CSV files need a header row with the columns: name, director, genre (or gender), duration, available.
+JSON files may contain an array of objects with those keys, or one object per line (JSON Lines, .jsonl), which is
+  streamed line by line.
+
+Usage: python import_movies.py movies.csv [--chunk-size 10000] [--database movies.db] [--profile bulk_load]
+"""
+
+# --- Python modules ---
+# argparse: module which makes it easy to write user-friendly command-line interfaces.
+import argparse
+# csv: module which implements classes to read and write tabular data in CSV format.
+import csv
+# json: module which exposes an API to encode and decode JSON documents.
+import json
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# sys: module which provides access to some variables used or maintained by the interpreter and to functions that
+#      interact strongly with the interpreter.
+import sys
+# time: module which provides various time-related functions.
+import time
+
+# --- App modules ---
+from database import connection_pool, genre_repository, migrations
+from database.movies_table import Movies, DEFAULT_SAVE_MANY_CHUNK_SIZE
+from model.movie_model import Movie
+
+TRUE_VALUES = ('1', 'true', 'yes', 'y')
+
+
+def to_movie(record_: dict) -> Movie:
+    """
+    Builds a movie from a record read from a file
+    :param record_: dictionary with the movie data
+    :return: new movie, without id, so it will be inserted
+    """
+    available_ = record_.get('available', False)
+    if isinstance(available_, str):
+        available_ = available_.strip().lower() in TRUE_VALUES
+
+    return Movie(None,
+                 str(record_.get('name') or ''),
+                 str(record_.get('director') or ''),
+                 str(record_.get('genre') or record_.get('gender') or ''),
+                 str(record_.get('duration') or ''),
+                 bool(available_))
+
+
+def read_csv(file_name_: str):
+    """
+    Streams the movies of a CSV file
+    """
+    with open(file_name_, 'r', newline='', encoding='utf-8') as file_:
+        for record_ in csv.DictReader(file_):
+            yield to_movie(record_)
+
+
+def read_json(file_name_: str):
+    """
+    Streams the movies of a JSON Lines file, or loads a JSON file with an array of movies
+    """
+    with open(file_name_, 'r', encoding='utf-8') as file_:
+        if file_name_.lower().endswith(('.jsonl', '.ndjson')):
+            for line_ in file_:
+                if line_.strip():
+                    yield to_movie(json.loads(line_))
+        else:
+            for record_ in json.load(file_):
+                yield to_movie(record_)
+
+
+def main() -> int:
+    parser_ = argparse.ArgumentParser(description='Bulk import of movies into the catalog database.')
+    parser_.add_argument('file', help='CSV, JSON or JSON Lines file with the movies to import')
+    parser_.add_argument('--format', choices=('csv', 'json'), default=None,
+                         help='file format, by default inferred from the file extension')
+    parser_.add_argument('--chunk-size', type=int, default=DEFAULT_SAVE_MANY_CHUNK_SIZE,
+                         help='rows sent to the database on each batch')
+    parser_.add_argument('--database', default=None, help='database file, by default the application database')
+    parser_.add_argument('--profile', choices=tuple(connection_pool.PROFILES), default='bulk_load',
+                         help='engine profile of the connections, see database.connection_pool.PROFILES')
+    args_ = parser_.parse_args()
+
+    format_ = args_.format
+    if format_ is None:
+        format_ = 'csv' if args_.file.lower().endswith('.csv') else 'json'
+    movies_ = read_csv(args_.file) if format_ == 'csv' else read_json(args_.file)
+
+    connection_pool.configure(None if args_.database is None else os.path.abspath(args_.database),
+                              profile_=args_.profile)
+
+    start_ = time.perf_counter()
+
+    def progress(saved_: int):
+        print(f'\r{saved_} movies imported ({time.perf_counter() - start_:.1f} s)', end='', file=sys.stderr)
+
+    try:
+        migrations.upgrade()
+        with Movies() as table_:
+            saved_ = table_.save_many(movies_, args_.chunk_size, progress)
+    except Exception as e:
+        print(f'\nImport canceled, no movie was imported. {sys.exc_info()[0]}: {e}', file=sys.stderr)
+        return 1
+    finally:
+        genre_repository.shutdown()
+        connection_pool.shutdown()
+
+    print(f'\r{saved_} movies imported in {time.perf_counter() - start_:.1f} s', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,15 @@
 __author__ = "Nestor D R"
 __version__ = "0.0.1"
 
+# --- App modules ---
+# helper.startup: startup timing, imported before anything else since the startup is timed from it
+from helper import startup
+
 # --- Python modules ---
+# argparse: module which makes it easy to write user-friendly command-line interfaces.
+import argparse
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
 # sys: module which provides access to some variables used or maintained by the interpreter and to functions that
 #      interact strongly with the interpreter.
 import sys
@@ -11,11 +19,91 @@ import sys
 import tkinter as tk
 
 # --- App modules ---
+# helper: package with layout and profiling elements
+from helper import profiling
 # view: package with user interface elements
 from view import gui
+# The database package is imported once the window is shown, see upgrade_schema()
+
+DEFAULT_PROFILE_REPORT = 'profile.json'
+DEFAULT_QUERY_LOG = 'queries.json'
+# As in database.query_tracer, repeated so the database package is not imported before the window is shown
+DEFAULT_SLOW_QUERY_MS = 50.0
+TRACE_SQL_ENVIRONMENT_VARIABLE = 'MOVIE_CATALOG_TRACE_SQL'
+
+
+def install_profiling(report_file_: str):
+    """
+    Times the database calls and the handlers of the application, see helper.profiling
+    :param report_file_: file the report is dumped to on exit
+    """
+    profiling.enable(report_file_)
+
+    # --- App modules ---
+    from database import base_table_class, genres_table, movies_table, sql_connection
+    profiling.instrument(sql_connection.SqlConnection, ('execute', 'executemany', 'execute_script', 'get', 'get_value'))
+    for class_ in (base_table_class.Table, genres_table.Genres, movies_table.Movies):
+        profiling.instrument(class_)
+    profiling.instrument(gui.Application, ('__edit', '__save', '__delete', '__load_datagrid_', '__load_datagrid_chunk',
+                                           '__refresh_datagrid_row_', '__fetch_datagrid_chunk'))
+
+
+def install_query_tracer(slow_ms_: float):
+    """
+    Traces the SQL statements, before any connection is opened, see database.query_tracer
+    :param slow_ms_: statements slower than these milliseconds get their plan captured
+    """
+    # --- App modules ---
+    from database import query_tracer
+    query_tracer.enable(slow_ms_)
+
+
+def upgrade_schema():
+    """
+    Brings the schema of the database up to date. Runs on the database worker thread, before any other request.
+    """
+    # --- App modules ---
+    from database import migrations
+    migrations.upgrade()
 
 
 def main():
+    parser_ = argparse.ArgumentParser(description='Movie Catalog')
+    parser_.add_argument('--startup-report', action='store_true',
+                         help='print the startup timing once the data is loaded, and exit')
+    parser_.add_argument('--profile', metavar='REPORT', nargs='?', const=DEFAULT_PROFILE_REPORT,
+                         default=os.environ.get(profiling.ENVIRONMENT_VARIABLE) or None,
+                         help=f'time the database calls and the handlers, shown in Help -> Diagnostics, and dump them '
+                              f'on exit to REPORT, as JSON, or as cProfile statistics if it ends with .prof, by '
+                              f'default {DEFAULT_PROFILE_REPORT}, also enabled by the '
+                              f'{profiling.ENVIRONMENT_VARIABLE} environment variable')
+    parser_.add_argument('--trace-sql', metavar='LOG', nargs='?', const=DEFAULT_QUERY_LOG,
+                         default=os.environ.get(TRACE_SQL_ENVIRONMENT_VARIABLE) or None,
+                         help=f'log the SQL statements with their parameters, duration and rows, capturing the plan '
+                              f'of the slow ones, print a report on exit and dump the log to LOG, by default '
+                              f'{DEFAULT_QUERY_LOG}, also enabled by the {TRACE_SQL_ENVIRONMENT_VARIABLE} environment '
+                              f'variable')
+    parser_.add_argument('--slow-query-ms', metavar='MS', type=float, default=DEFAULT_SLOW_QUERY_MS,
+                         help=f'duration from which a statement is slow and gets its plan captured, 0 to capture every '
+                              f'plan, by default {DEFAULT_SLOW_QUERY_MS:g} ms')
+    parser_.add_argument('--write-behind', action='store_true',
+                         help='queue the saves and deletions, journaled next to the database, and write them together '
+                              'once no record changes for a while, and on exit')
+    parser_.add_argument('--read-replica', action='store_true',
+                         help='serve the reads from an in-memory copy of the database, loaded on start, and write each '
+                              'change to both')
+    args_ = parser_.parse_args()
+    startup.mark(startup.IMPORTS)
+
+    if args_.profile:
+        install_profiling(args_.profile)
+    if args_.trace_sql:
+        install_query_tracer(args_.slow_query_ms)
+    if args_.read_replica:
+        # --- App modules ---
+        from database import read_replica
+        read_replica.enable()
+
     # Create an instance of the Tk class, which is a top level window known as the root window
     root_ = tk.Tk()
 
@@ -28,12 +116,44 @@ def main():
 
     root_.resizable(False, False)
 
-    # Create element container frame widget inside the root window
-    main_app_ = gui.Application(root_)
+    # Create element container frame widget inside the root window, the schema of the database is brought up to date
+    #   before its data is loaded
+    main_app_ = gui.Application(root_, startup_=upgrade_schema, write_behind_=args_.write_behind)
+
+    if args_.startup_report:
+        reported_ = []
+
+        def report():
+            # Only once, on the 1º of both milestones reached
+            if not reported_:
+                reported_.append(True)
+                print(startup.report(), file=sys.stderr)
+                # Once the callback which reached the milestone has finished
+                root_.after_idle(root_.destroy)
+        # Also if the data could not be loaded, the report then ends at the failure
+        startup.on_mark(startup.DATA_READY, report)
+        startup.on_mark(startup.LOAD_FAILED, report)
 
     # Show everything on the display, and responds to user input until the program terminates.
     main_app_.mainloop()
 
+    # Release database resources: finish pending requests, write the queued changes, then close every pooled connection
+    from database import connection_pool, db_worker, genre_repository, read_replica, unit_of_work
+    db_worker.shutdown()
+    unit_of_work.shutdown()
+    read_replica.shutdown()
+    genre_repository.shutdown()
+    connection_pool.shutdown()
+
+    if args_.profile:
+        profiling.dump(args_.profile)
+
+    if args_.trace_sql:
+        from database import query_tracer
+        tracer_ = query_tracer.get_tracer()
+        print(tracer_.report(), file=sys.stderr)
+        tracer_.dump(args_.trace_sql)
+
 
 # Use of __name__ & __main__
 # When the Python interpreter reads a code file, it completely executes the code in it.
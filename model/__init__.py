@@ -4,4 +4,6 @@
 model package contains sql access elements
 """
 
+from . import base_model
+from . import genre_model
 from . import movie_model
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+class Model:
+    """
+    Base of the entities: slotted, so there is no per-instance __dict__ and a large number of them, e.g. a whole
+      catalog, takes a fraction of the memory of regular objects
+    """
+    __slots__ = ()
+
+    @classmethod
+    def row_factory(cls,
+                    description_: tuple):
+        """
+        sqlite3 row factory which builds the entities straight from the rows of a cursor, without an intermediate tuple
+          copy. The columns are matched to the attributes by name, once for each set of columns; the attributes without
+          a column are set to None, and the columns without an attribute are ignored.
+        :param description_: description of the cursor, with the name of each column of its rows
+        """
+        names_ = tuple(column_[0] for column_ in description_)
+        key_ = (cls, names_)
+        build_ = _row_factories.get(key_)
+        if build_ is None:
+            # Straight-line code, one assignment per attribute, like dataclasses generates __init__: a loop over
+            #   setters would cost more than the tuple copy it saves
+            lines_ = [f'    entity_.{name_} = row_[{index_}]' for index_, name_ in enumerate(names_)
+                      if name_ in cls.__slots__]
+            lines_ += [f'    entity_.{name_} = None' for name_ in cls.__slots__ if name_ not in names_]
+            source_ = '\n'.join(['def build(cursor_, row_):', '    entity_ = new_(cls_)', *lines_,
+                                 '    return entity_'])
+            namespace_ = {'new_': object.__new__, 'cls_': cls}
+            exec(source_, namespace_)
+            build_ = _row_factories[key_] = namespace_['build']
+        return build_
+
+
+# Row factories already built, by (entity class, names of the columns)
+_row_factories = {}
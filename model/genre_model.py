@@ -1,17 +1,25 @@
 # -*- coding: utf-8 -*-
 
-class Genre:
+# --- App modules ---
+from .base_model import Model
+
+
+class Genre(Model):
     """
     Genre entity
     """
+    __slots__ = ('id', 'name', 'created_on')
+
     def __init__(self,
                  id_: int,
-                 name_: str):
+                 name_: str,
+                 created_on_=None):
         """
         Class constructor
         """
         self.id = id_
         self.name = name_
+        self.created_on = created_on_
 
     def __str__(self):
         return f'Genre [{self.id}, {self.name}]'
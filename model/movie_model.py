@@ -1,25 +1,35 @@
 # -*- coding: utf-8 -*-
 
-class Movie:
+# --- App modules ---
+from .base_model import Model
+
+
+class Movie(Model):
     """
     Movie entity
     """
+    __slots__ = ('id', 'name', 'director', 'genre_id', 'gender', 'duration', 'available', 'created_on')
+
     def __init__(self,
                  id_: int,
                  name_: str,
                  director_: str,
                  gender_: str,
                  duration_: str,
-                 available_: bool):
+                 available_: bool,
+                 genre_id_: int = None,
+                 created_on_=None):
         """
         Class constructor
         """
         self.id = id_
         self.name = name_
         self.director = director_
+        self.genre_id = genre_id_
         self.gender = gender_
         self.duration = duration_
         self.available = available_
+        self.created_on = created_on_
 
     def __str__(self):
         return f'Movie [{self.id}, {self.name}, {self.director}, {self.gender}, {self.duration}, {self.available}]'
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# shutil: module which offers a number of high-level operations on files and collections of files.
+import shutil
+# tempfile: module which creates temporary files and directories.
+import tempfile
+# unittest: unit testing framework.
+import unittest
+
+# --- App modules ---
+from database import connection_pool, genre_repository, migrations
+from database.genres_table import Genres
+from database.movies_table import Movies
+from model.movie_model import Movie
+
+SOURCE_DATABASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'movies.db')
+
+
+class GenreRepositoryTest(unittest.TestCase):
+    """
+    The genres are read again only when the genres table changed, not on every commit to the database
+    """
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        connection_pool.configure(os.path.join(self.folder, 'movies.db'))
+        migrations.upgrade()
+        with Genres() as genres_:
+            genres_.create_table()
+        with Movies() as movies_:
+            movies_.create_table()
+
+    def tearDown(self):
+        genre_repository.shutdown()
+        connection_pool.shutdown()
+        shutil.rmtree(self.folder)
+
+    def test_movie_save_does_not_reload_genres(self):
+        cached_ = genre_repository.get_repository().by_name('Western')
+        with Movies() as movies_:
+            movies_.save(Movie(None, 'Rio Bravo', 'Howard Hawks', 'Western', '2h 21min', True))
+            movies_.save(Movie(None, 'Stagecoach', 'John Ford', 'Western', '1h 36min', False))
+
+        # A reload builds new Genre objects
+        self.assertIs(genre_repository.get_repository().by_name('Western'), cached_)
+
+    def test_genre_save_reloads_genres(self):
+        cached_ = genre_repository.get_repository().by_name('Western')
+        with Genres() as genres_:
+            genres_.save_record(None, {'name': 'Musical'})
+
+        self.assertIsNotNone(genre_repository.get_repository().by_name('Musical'))
+        self.assertIsNot(genre_repository.get_repository().by_name('Western'), cached_)
+
+    def test_movie_save_sees_new_genre(self):
+        with Genres() as genres_:
+            genres_.save_record(None, {'name': 'Musical'})
+        with Movies() as movies_:
+            id_ = movies_.save(Movie(None, 'Singin\' in the Rain', 'Stanley Donen', 'musical', '1h 43min', True))
+            self.assertEqual(movies_.fetch_by_id(id_).gender, 'Musical')
+
+    def test_genres_version_migration(self):
+        genre_repository.shutdown()
+        connection_pool.shutdown()
+        database_ = os.path.join(self.folder, 'copy.db')
+        shutil.copyfile(SOURCE_DATABASE, database_)
+        connection_pool.configure(database_)
+        migrations.upgrade()
+
+        cached_ = genre_repository.get_repository().by_name('Western')
+        with Movies() as movies_:
+            movies_.save(Movie(None, 'Rio Bravo', 'Howard Hawks', 'Western', '2h 21min', True))
+        self.assertIs(genre_repository.get_repository().by_name('Western'), cached_)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# shutil: module which offers a number of high-level operations on files and collections of files.
+import shutil
+# tempfile: module which creates temporary files and directories.
+import tempfile
+# unittest: unit testing framework.
+import unittest
+
+# --- App modules ---
+from database import connection_pool, genre_repository, migrations
+from database.genres_table import Genres
+from database.movies_table import Movies
+from model.movie_model import Movie
+
+GENRES = ('Western', 'Action', 'Animation', 'Comedy', 'Horror')    # Animation is added, so its id is not in name order
+
+
+class MoviesSearchTest(unittest.TestCase):
+    """
+    The movies sorted by genre are fetched genre by genre, in the same order the view sorts them
+    """
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        connection_pool.configure(os.path.join(self.folder, 'movies.db'))
+        migrations.upgrade()
+        with Genres() as genres_:
+            genres_.create_table()
+            genres_.save_record(None, {'name': 'Animation'})
+        with Movies() as movies_:
+            movies_.create_table()
+            movies_.save_many(Movie(None, f'Movie {i_ % 37}', f'Director {i_ % 7}', GENRES[i_ % len(GENRES)],
+                                    '1h 30min', i_ % 3 == 0)
+                              for i_ in range(300))
+
+    def tearDown(self):
+        genre_repository.shutdown()
+        connection_pool.shutdown()
+        shutil.rmtree(self.folder)
+
+    def assert_same_order(self, filters_, descending_):
+        with Movies() as movies_:
+            conditions_, params_ = movies_.filter_clause(filters_ or {})
+            where_ = f' WHERE {" AND ".join(conditions_)}' if conditions_ else ''
+            direction_ = 'DESC' if descending_ else 'ASC'
+            command_ = (f'SELECT id FROM movies_view{where_} '
+                        f'ORDER BY gender {direction_}, name {direction_}, id {direction_} LIMIT ? OFFSET ?')
+            for offset_, limit_ in ((0, 25), (55, 50), (118, 7), (290, 50), (0, -1), (400, 10)):
+                expected_ = movies_.db.get(command_, tuple(params_) + (limit_, offset_)).fetchall()
+                expected_ = [row_[0] for row_ in expected_]
+                found_ = movies_.search(filters_, ('gender', 'name', 'id'), descending_, limit_, offset_)
+                found_ = [movie_.id for movie_ in found_]
+                self.assertEqual(found_, expected_, f'offset {offset_}, limit {limit_}')
+
+    def test_sort_by_genre(self):
+        self.assert_same_order(None, False)
+        self.assert_same_order(None, True)
+
+    def test_sort_by_genre_filtered(self):
+        self.assert_same_order(Movies.filters(available_=True), False)
+        self.assert_same_order(Movies.filters(director_='Director 2', genre_='comedy'), True)
+        self.assert_same_order(Movies.filters(genre_='Animation'), False)
+        self.assert_same_order(Movies.filters(genre_='Unknown'), False)
+
+    def test_count_on_table(self):
+        with Movies() as movies_:
+            self.assertEqual(movies_.count_source(), 'movies')
+            self.assertEqual(movies_.count(), 301)      # Along with the movie of the creation script
+            self.assertEqual(movies_.search_count(Movies.filters(genre_='Horror')),
+                             movies_.db.get_value('SELECT COUNT(*) FROM movies_view WHERE gender = ?', 0, ('Horror',)))
+
+
+
+class MoviesFullTextMigrationTest(unittest.TestCase):
+    """
+    A database created without the full-text index gets it, with the movies already saved, when it is upgraded
+    """
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        connection_pool.configure(os.path.join(self.folder, 'movies.db'))
+        with Genres() as genres_:
+            genres_.create_table()
+        with Movies() as movies_:
+            movies_.create_table()
+            movies_.save(Movie(None, 'Rio Bravo', 'Howard Hawks', 'Western', '2h 21min', True))
+
+    def tearDown(self):
+        genre_repository.shutdown()
+        connection_pool.shutdown()
+        shutil.rmtree(self.folder)
+
+    def test_full_text_index_added(self):
+        with Movies() as movies_:
+            self.assertFalse(movies_.full_text_index_exists())
+        migrations.upgrade()
+
+        with Movies() as movies_:
+            self.assertTrue(movies_.full_text_index_exists())
+            self.assertEqual([movie_.name for movie_ in movies_.search_text('hawk')], ['Rio Bravo'])
+            movies_.save(Movie(None, 'Red River', 'Howard Hawks', 'Western', '2h 13min', True))
+            self.assertEqual(sorted(movie_.name for movie_ in movies_.search_text('howard')),
+                             ['Red River', 'Rio Bravo'])
+
+
+if __name__ == '__main__':
+    unittest.main()
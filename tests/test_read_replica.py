@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# shutil: module which offers a number of high-level operations on files and collections of files.
+import shutil
+# tempfile: module which creates temporary files and directories.
+import tempfile
+# threading: module which constructs higher-level threading interfaces on top of the lower level _thread module.
+import threading
+# unittest: unit testing framework.
+import unittest
+from unittest import mock
+
+# --- App modules ---
+from database import connection_pool, genre_repository, migrations, read_replica
+from database.genres_table import Genres
+from database.movies_table import Movies
+from model.movie_model import Movie
+
+
+class ReadReplicaTest(unittest.TestCase):
+    """
+    The replica gets every transaction committed once it is enabled, and its readers never see one half applied
+    """
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        connection_pool.configure(os.path.join(self.folder, 'movies.db'))
+        migrations.upgrade()
+        with Genres() as genres_:
+            genres_.create_table()
+        with Movies() as movies_:
+            movies_.create_table()
+            movies_.save(Movie(None, 'Rio Bravo', 'Howard Hawks', 'Western', '2h 21min', True))
+        # Enabled by each test, and disabled again once it ends
+        self.enabled = mock.patch.object(read_replica, '_enabled', False)
+        self.enabled.start()
+        read_replica.enable()
+
+    def tearDown(self):
+        read_replica.shutdown()
+        self.enabled.stop()
+        genre_repository.shutdown()
+        connection_pool.shutdown()
+        shutil.rmtree(self.folder)
+
+    @staticmethod
+    def directors() -> []:
+        with Movies() as movies_:
+            return [row_[0] for row_ in movies_.db.get('SELECT director FROM movies WHERE id IN (1, 2) ORDER BY id')]
+
+    def test_write_committed_after_the_load(self):
+        with Movies() as movies_:
+            with movies_.db.transaction():
+                movies_.db.execute('UPDATE movies SET director = ? WHERE id = 1', ('Someone',), commit_=False)
+                read_replica.get_replica()
+        self.assertEqual(self.directors()[0], 'Someone')
+
+    def test_transaction_not_seen_half_applied(self):
+        read_replica.get_replica()
+        seen_ = []
+        blocked_ = []
+
+        def read():
+            seen_.extend(self.directors())
+
+        class Params(dict):
+            """
+            Values of the 2º update, bound once on the database file, then on the replica, with the 1º update applied
+            """
+            def __getitem__(self, key_):
+                blocked_.append(None)
+                if len(blocked_) == 2:
+                    self.reader = threading.Thread(target=read)
+                    self.reader.start()
+                    self.reader.join(0.2)
+                    blocked_[-1] = self.reader.is_alive()
+                return super().__getitem__(key_)
+
+        params_ = Params(director='Someone')
+        with Movies() as movies_:
+            with movies_.db.transaction():
+                movies_.db.execute('UPDATE movies SET director = ? WHERE id = 1', ('Someone',), commit_=False)
+                movies_.db.execute('UPDATE movies SET director = :director WHERE id = 2', params_, commit_=False)
+        params_.reader.join()
+
+        self.assertEqual(blocked_, [None, True])
+        self.assertEqual(seen_, ['Someone', 'Someone'])
+
+
+    def test_stream_not_changed_while_read(self):
+        with Movies() as movies_:
+            movies_.save_many(Movie(None, f'Movie {i_:04}', 'Someone', 'Western', '1h 30min', True)
+                              for i_ in range(200))
+        read_replica.get_replica()
+
+        with Movies() as reader_:
+            stream_ = reader_.iter_search(None, ('name',), batch_size_=10)
+            rows_ = [next(stream_) for _ in range(10)]
+            # A row already read is moved to the end
+            with Movies() as writer_:
+                movie_ = writer_.fetch_by_id(rows_[0].id)
+                movie_.name = 'Zulu'
+                writer_.save(movie_)
+            rows_ += list(stream_)
+
+        ids_ = [row_.id for row_ in rows_]
+        self.assertEqual(len(ids_), 202)
+        self.assertEqual(len(set(ids_)), 202)
+
+
+if __name__ == '__main__':
+    unittest.main()
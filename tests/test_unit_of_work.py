@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# os: module which allows access to OperatingSystem-dependent functionalities.
+import os
+# shutil: module which offers a number of high-level operations on files and collections of files.
+import shutil
+# tempfile: module which creates temporary files and directories.
+import tempfile
+# unittest: unit testing framework.
+import unittest
+from unittest import mock
+
+# --- App modules ---
+from database import connection_pool, genre_repository, migrations, unit_of_work
+from database.genres_table import Genres
+from database.movies_table import Movies
+
+NEW_MOVIE = {'name': 'Rio Bravo', 'director': 'Howard Hawks', 'gender': 'Western', 'duration': '2h 21min',
+             'available': True}
+
+
+class Crash(Exception):
+    """
+    Stands for the process being killed
+    """
+
+
+def crash(*_):
+    raise Crash()
+
+
+class UnitOfWorkRecoveryTest(unittest.TestCase):
+    """
+    The changes of a flush interrupted by a crash are written again on the next start only if it was not committed
+    """
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        database_ = os.path.join(self.folder, 'movies.db')
+        connection_pool.configure(database_)
+        migrations.upgrade()
+        with Genres() as genres_:
+            genres_.create_table()
+        with Movies() as movies_:
+            movies_.create_table()
+            self.movie = movies_.fetch_by_id(1)     # The movie of the creation script
+        self.journal_file = database_ + unit_of_work.JOURNAL_SUFFIX
+
+    def tearDown(self):
+        genre_repository.shutdown()
+        connection_pool.shutdown()
+        shutil.rmtree(self.folder)
+
+    def unchanged_values(self) -> dict:
+        return {'name': self.movie.name, 'director': self.movie.director, 'gender': self.movie.gender,
+                'duration': self.movie.duration, 'available': self.movie.available}
+
+    def flush_crashing(self, unit_of_work_, committed_: bool):
+        """
+        Flushes, crashing once the flush is journaled but before its transaction is committed, or after it is
+          committed but before the journal is cleared
+        """
+        if committed_:
+            patch_ = mock.patch.object(unit_of_work.UnitOfWork, '_UnitOfWork__rewrite', crash)
+        else:
+            append_ = unit_of_work.UnitOfWork._UnitOfWork__append
+
+            def append_crashing(self_, entry_: dict):
+                append_(self_, entry_)
+                if 'flush' in entry_:
+                    raise Crash()
+
+            patch_ = mock.patch.object(unit_of_work.UnitOfWork, '_UnitOfWork__append', append_crashing)
+        with patch_, self.assertRaises(Crash):
+            unit_of_work_.flush()
+        with open(self.journal_file, 'r', encoding='utf-8') as file_:
+            self.assertIn('"flush"', file_.read())
+
+    @staticmethod
+    def count_movies(name_: str) -> int:
+        with Movies() as movies_:
+            return movies_.search_count({'name': name_})
+
+    def test_no_op_save_crash_before_commit(self):
+        unit_of_work_ = unit_of_work.UnitOfWork(self.journal_file)
+        unit_of_work_.save('movies', 1, self.unchanged_values())
+        self.flush_crashing(unit_of_work_, committed_=False)
+
+        self.assertEqual(len(unit_of_work.UnitOfWork(self.journal_file)), 1)
+
+    def test_no_op_save_crash_after_commit(self):
+        unit_of_work_ = unit_of_work.UnitOfWork(self.journal_file)
+        unit_of_work_.save('movies', 1, self.unchanged_values())
+        self.flush_crashing(unit_of_work_, committed_=True)
+
+        self.assertEqual(len(unit_of_work.UnitOfWork(self.journal_file)), 0)
+
+    def test_new_record_crash_before_commit(self):
+        unit_of_work_ = unit_of_work.UnitOfWork(self.journal_file)
+        unit_of_work_.save('movies', None, NEW_MOVIE)
+        self.flush_crashing(unit_of_work_, committed_=False)
+        self.assertEqual(self.count_movies(NEW_MOVIE['name']), 0)
+
+        recovered_ = unit_of_work.UnitOfWork(self.journal_file)
+        self.assertEqual(len(recovered_), 1)
+        recovered_.flush()
+        self.assertEqual(self.count_movies(NEW_MOVIE['name']), 1)
+        self.assertFalse(os.path.exists(self.journal_file))
+
+    def test_new_record_crash_after_commit(self):
+        unit_of_work_ = unit_of_work.UnitOfWork(self.journal_file)
+        unit_of_work_.save('movies', None, NEW_MOVIE)
+        self.flush_crashing(unit_of_work_, committed_=True)
+
+        recovered_ = unit_of_work.UnitOfWork(self.journal_file)
+        self.assertEqual(len(recovered_), 0)
+        recovered_.flush()
+        self.assertEqual(self.count_movies(NEW_MOVIE['name']), 1)
+
+    def test_genre_renamed_no_conflict(self):
+        unit_of_work_ = unit_of_work.UnitOfWork(self.journal_file)
+        # With the name the genre will have, so the change is valid on flush
+        unit_of_work_.save('movies', 1, dict(self.unchanged_values(), director='Someone', gender='Renamed'))
+        with Genres() as genres_:
+            genres_.save_record(self.movie.genre_id, {'name': 'Renamed'})
+
+        _, rejected_ = unit_of_work_.flush()
+        self.assertEqual(rejected_, [])
+        with Movies() as movies_:
+            self.assertEqual(movies_.fetch_by_id(1).director, 'Someone')
+
+    def test_record_changed_conflict(self):
+        unit_of_work_ = unit_of_work.UnitOfWork(self.journal_file)
+        unit_of_work_.save('movies', 1, dict(self.unchanged_values(), director='Someone'))
+        with Movies() as movies_:
+            movies_.save_record(1, dict(self.unchanged_values(), duration='1h 01min'))
+
+        _, rejected_ = unit_of_work_.flush()
+        self.assertEqual([reason_ for _, reason_ in rejected_], ['the record was changed by someone else'])
+
+
+if __name__ == '__main__':
+    unittest.main()
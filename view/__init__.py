@@ -3,4 +3,9 @@
 """
 view package contains user interface elements
 """
+from . import chunk_sizer
+from . import diagnostics
+from . import forms
 from . import gui
+from . import tk_dispatcher
+from . import virtual_datagrid
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+DEFAULT_FRAME_BUDGET_MS = 20    # Milliseconds the Tk main loop may spend on a chunk, so it keeps handling events
+DEFAULT_MIN_CHUNK_SIZE = 50
+DEFAULT_MAX_CHUNK_SIZE = 5000
+SMOOTHING = 0.5                 # Weight of the last measure in the estimated time per row
+
+
+class ChunkSizer:
+    """
+    Adaptive size of the chunks of a long task run on the Tk main loop, e.g. inserting rows into a Treeview. The time
+      per item is measured on each chunk, and the next chunk is sized to fit in the frame budget, so the task goes as
+      fast as the machine allows without freezing the window.
+    """
+    def __init__(self,
+                 size_: int,
+                 budget_ms_: float = DEFAULT_FRAME_BUDGET_MS,
+                 min_size_: int = DEFAULT_MIN_CHUNK_SIZE,
+                 max_size_: int = DEFAULT_MAX_CHUNK_SIZE):
+        """
+        Class constructor
+        :param size_: size of the 1º chunk
+        :param budget_ms_: milliseconds each chunk should take
+        :param min_size_: minimum size of a chunk
+        :param max_size_: maximum size of a chunk, which also bounds the memory of the chunks
+        """
+        if budget_ms_ <= 0 or min_size_ < 1 or max_size_ < min_size_:
+            raise ValueError('Invalid chunk sizes or frame budget.')
+
+        self.budget_ms = budget_ms_
+        self.min_size = min_size_
+        self.max_size = max_size_
+        self.size = max(min_size_, min(size_, max_size_))
+        self.__ms_per_item = None           # Estimated milliseconds per item, None until the 1º measure
+
+    def measure(self,
+                items_: int,
+                elapsed_ms_: float) -> int:
+        """
+        Takes into account the time a chunk took, and sizes the next one
+        :param items_: number of items of the chunk
+        :param elapsed_ms_: milliseconds it took
+        :return: size of the next chunk
+        """
+        if items_ > 0:
+            ms_per_item_ = max(elapsed_ms_, 0.0) / items_
+            if self.__ms_per_item is None:
+                self.__ms_per_item = ms_per_item_
+            else:
+                self.__ms_per_item += SMOOTHING * (ms_per_item_ - self.__ms_per_item)
+
+            # Grow at most twice each time, a single fast chunk (e.g. updates of items already shown) is not trusted
+            target_ = self.budget_ms / self.__ms_per_item if self.__ms_per_item > 0 else self.max_size
+            self.size = int(max(self.min_size, min(target_, self.size * 2, self.max_size)))
+
+        return self.size
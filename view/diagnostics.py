@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# tkinter: this package (“Tk interface”) is the standard Python interface to the Tcl/Tk GUI toolkit.
+import tkinter as tk
+from tkinter import ttk
+
+# --- App modules ---
+from helper import layout, profiling
+
+COLUMNS = (('name', 'Method', 260, tk.W),
+           ('count', 'Calls', 60, tk.E),
+           ('total_ms', 'Total ms', 80, tk.E),
+           ('p50_ms', 'p50 ms', 70, tk.E),
+           ('p90_ms', 'p90 ms', 70, tk.E),
+           ('p99_ms', 'p99 ms', 70, tk.E),
+           ('max_ms', 'Max ms', 70, tk.E))
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """
+    Window with the timers of the profiled methods (see helper.profiling), the ones with the most total time first
+    """
+    def __init__(self,
+                 master_: tk.Misc):
+        """
+        Class constructor
+        :param master_: window that owns this one
+        """
+        super().__init__(master_)
+        self.title('Diagnostics')
+        self.config(background=layout.BACKGROUND_COLOR)
+
+        self.datagrid = ttk.Treeview(self, columns=tuple(column_[0] for column_ in COLUMNS), show='headings',
+                                     height=layout.DEFAULT_TREEVIEW_GRID_ROWS_COUNT)
+        for column_, heading_, width_, anchor_ in COLUMNS:
+            self.datagrid.heading(column_, text=heading_)
+            self.datagrid.column(column_, width=width_, anchor=anchor_, stretch=tk.NO)
+        self.datagrid.pack(fill=tk.BOTH, expand=True, padx=layout.DEFAULT_LEFT_MARGIN, pady=layout.DEFAULT_TOP_MARGIN)
+
+        buttons_ = tk.Frame(self, background=layout.BACKGROUND_COLOR)
+        buttons_.pack(fill=tk.X, padx=layout.DEFAULT_LEFT_MARGIN, pady=layout.DEFAULT_TOP_MARGIN)
+        tk.Button(buttons_, text='Refresh', width=10, command=self.refresh).pack(side=tk.RIGHT)
+        tk.Button(buttons_, text='Reset', width=10, command=self.__reset).pack(side=tk.RIGHT,
+                                                                             padx=layout.DEFAULT_LEFT_MARGIN)
+        self.status = tk.Label(buttons_, font=layout.DEFAULT_FONT, anchor=tk.W, background=layout.BACKGROUND_COLOR)
+        self.status.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        self.refresh()
+
+    def refresh(self):
+        """
+        Shows the timers measured so far
+        """
+        self.datagrid.delete(*self.datagrid.get_children())
+        if not profiling.enabled():
+            self.status.config(text='Profiling is off, start the application with --profile to enable it.')
+            return
+
+        summaries_ = profiling.summary()
+        for summary_ in summaries_:
+            self.datagrid.insert('', tk.END, values=tuple(
+                f'{summary_[column_]:.3f}' if column_.endswith('_ms') else summary_[column_]
+                for column_, *_ in COLUMNS))
+        self.status.config(text=f'{len(summaries_)} methods timed.')
+
+    def __reset(self):
+        profiling.reset()
+        self.refresh()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+"""
+Declarative form specs. Each one describes a CRUD screen over a table, which gui.Application builds from its placement
+  plan (see helper.layout_compiler), so a new screen needs a new spec but no new view code.
+
+  name: identifier of the form, also used to name its cached placement plan
+  title: title of the window
+  table: name of the table, in database.TABLES
+  order_by: order of the rows in the data grid, the 1º column is also the sort key of the incremental refresh, the
+    rows sorted by clicking a column heading are ordered by that column and then by these ones
+  fields: widgets placed in a fake cell (row, col[, rowspan, colspan]):
+    label: text
+    entry, combobox, checkbox: variable, the column it is saved to, if it is not the same name, and for combobox,
+      lookup (table, column) or options, with the options to show
+    or, instead of variable, filter: the rows shown in the data grid are searched by it (see Table.filter_clause),
+      formats: 'yes_no' for booleans
+  filter_delay_ms: optional, milliseconds without changes in the filters before searching the rows
+  buttons: strip of buttons aligned to the right of a fake row, each one with a command of the Application
+  datagrid: cell, and its columns, formats: 'yes_no' for booleans
+  status: cell of the status bar
+"""
+
+# --- Python modules ---
+# tkinter: this package (“Tk interface”) is the standard Python interface to the Tcl/Tk GUI toolkit.
+import tkinter as tk
+
+CRUD_COMMANDS = ('new', 'edit', 'cancel', 'save', 'delete')
+DEFAULT_FILTER_DELAY_MS = 300       # Keystrokes typed within this window are searched once
+
+MOVIES_FORM = {
+    'name': 'movies',
+    'title': 'Movie Catalog',
+    'table': 'movies',
+    'order_by': ('name', 'id'),
+    'fields': (
+        {'kind': 'label', 'text': 'Movie name', 'cell': (1, 1)},
+        {'kind': 'entry', 'variable': 'name', 'cell': (1, 2)},
+        {'kind': 'label', 'text': 'Director', 'cell': (1, 3)},
+        {'kind': 'entry', 'variable': 'director', 'cell': (1, 4, 1, 2)},
+        {'kind': 'label', 'text': 'Main genre', 'cell': (2, 1)},
+        {'kind': 'combobox', 'variable': 'genre', 'column': 'gender', 'lookup': ('genres', 'name'), 'cell': (2, 2)},
+        {'kind': 'label', 'text': 'Duration', 'cell': (2, 3)},
+        {'kind': 'entry', 'variable': 'duration', 'cell': (2, 4)},
+        {'kind': 'checkbox', 'variable': 'available', 'text': 'Available', 'cell': (2, 5)},
+        {'kind': 'label', 'text': 'Search', 'cell': (6, 1)},
+        {'kind': 'entry', 'filter': 'text', 'cell': (6, 2)},
+        {'kind': 'label', 'text': 'Genre', 'cell': (6, 3)},
+        {'kind': 'combobox', 'filter': 'gender', 'lookup': ('genres', 'name'), 'cell': (6, 4)},
+        {'kind': 'combobox', 'filter': 'available', 'options': ('Yes', 'No'), 'format': 'yes_no', 'cell': (6, 5)},
+    ),
+    'buttons': {'row': 4, 'commands': CRUD_COMMANDS},
+    'datagrid': {
+        'cell': (7, 1, 1, 5),
+        'columns': (
+            {'column': 'name', 'heading': 'Movie name', 'width': 200, 'anchor': tk.W},
+            {'column': 'director', 'heading': 'Director', 'width': 200, 'anchor': tk.W},
+            {'column': 'gender', 'heading': 'Main Genre', 'width': 150, 'anchor': tk.W},
+            {'column': 'duration', 'heading': 'Duration', 'width': 100, 'anchor': tk.W},
+            {'column': 'available', 'heading': 'Available', 'width': 70, 'anchor': tk.CENTER, 'format': 'yes_no'},
+        ),
+    },
+    'status': {'cell': (8, 1, 1, 5)},
+}
+
+GENRES_FORM = {
+    'name': 'genres',
+    'title': 'Genres',
+    'table': 'genres',
+    'order_by': ('name', 'id'),
+    'fields': (
+        {'kind': 'label', 'text': 'Genre', 'cell': (1, 1)},
+        {'kind': 'entry', 'variable': 'name', 'cell': (1, 2)},
+        {'kind': 'label', 'text': 'Search', 'cell': (6, 1)},
+        {'kind': 'entry', 'filter': 'name_prefix', 'cell': (6, 2)},
+    ),
+    'buttons': {'row': 4, 'commands': CRUD_COMMANDS},
+    'datagrid': {
+        'cell': (7, 1, 1, 5),
+        'columns': (
+            {'column': 'name', 'heading': 'Genre', 'width': 300, 'anchor': tk.W},
+            {'column': 'created_on', 'heading': 'Created on', 'width': 200, 'anchor': tk.W},
+        ),
+    },
+    'status': {'cell': (8, 1, 1, 5)},
+}
@@ -1,36 +1,61 @@
 # -*- coding: utf-8 -*-
 
-# --- Third Party Libraries ---
-# pynput.keyboard: contains classes for controlling and monitoring the keyboard.
-from pynput.keyboard import Key, Controller
-
 # --- Python modules ---
+# bisect: module which provides support for maintaining a list in sorted order without having to sort the list after
+#         each insertion.
+import bisect
+# itertools: module which implements a number of iterator building blocks.
+import itertools
 # sys: module which provides access to variables used or maintained by the interpreter and to functions that
 #      interact strongly with the interpreter.
 import sys
+# time: module which provides various time-related functions.
+import time
 # tkinter: this package (“Tk interface”) is the standard Python interface to the Tcl/Tk GUI toolkit.
 import tkinter as tk
 from tkinter import messagebox, ttk
 
 # --- App modules ---
-from database.movies_table import Movies
-from database.genres_table import Genres
-from model.movie_model import Movie
-from helper import layout
+from helper import layout, layout_compiler, startup
+from view import forms
+from view.chunk_sizer import ChunkSizer
+from view.diagnostics import DiagnosticsWindow
+from view.tk_dispatcher import TkDispatcher
+from view.virtual_datagrid import PLACEHOLDER_TEXT, VirtualDatagrid
 
 
 class Application(tk.Frame):
     """
     Class of a specialized frame for the app. Inherits from tk.Frame.
+    The frame is a CRUD screen over a table, built from a declarative form spec (see view.forms).
     """
     def __init__(self,
-                 master_: tk.Tk):
+                 master_: tk.Tk | tk.Toplevel,
+                 form_: dict = forms.MOVIES_FORM,
+                 menu_: bool = True,
+                 startup_=None,
+                 write_behind_: bool = False):
         """
-        Class constructor
+        Class constructor. Only the widgets are created, the data is loaded once the window is shown.
         :param master_: window that will contain this frame
+        :param form_: declarative spec of the form
+        :param menu_: flag to create the main menu in the window
+        :param startup_: optional callable run on the database worker before any other request, e.g. to upgrade the
+          schema of the database
+        :param write_behind_: flag to queue the saves and deletions, which are shown at once and written together later
+          (see database.unit_of_work), instead of writing each one on its own
         """
         # Save parent widget (probably the top level window )
         self.master = master_
+        self.form = form_
+        self.startup = startup_
+        self.table = None           # Class of the table, see database.TABLES, set once the database is loaded
+        self.dispatcher = None      # Set once the database is loaded
+        # Key of the data grid loads, each window supersedes only its own ones on the shared database worker
+        self.__datagrid_key = f'datagrid-{id(self)}'
+        self.write_behind = write_behind_
+        self.__flush_idle_after = None      # Identifier of the scheduled flush, once no record changes for a while
+        self.__flush_interval_after = None  # Identifier of the scheduled flush, at the latest after the 1º change
         self.container_width = layout.DEFAULT_CONTAINER_WIDTH
         self.container_height = layout.DEFAULT_CONTAINER_HEIGHT
 
@@ -43,104 +68,323 @@ class Application(tk.Frame):
         # Config display (ie alternative to resize)
         self.config(background=layout.BACKGROUND_COLOR)
 
-        # Create fake grid layout fake-grid mimicked by GRID_ROWS_HEIGHT and GRID_COLUMNS_WIDTH, in order to place
-        #   each widget based on Place layout manager
-        self.fake_grid = layout.FakeGridLayout(layout.DEFAULT_GRID_ROWS_HEIGHT,
-                                               layout.DEFAULT_GRID_COLUMNS_WIDTH)
         # Create controls/widgets in the GUI
         self.__create_widgets()
 
         # Create main menu
-        self.menu_bar = MenuBar(self)
-        master_.config(menu=self.menu_bar)
+        if menu_:
+            self.menu_bar = MenuBar(self)
+            master_.config(menu=self.menu_bar)
+
+        # The database is loaded and queried once the skeleton of the window is shown
+        self.bind('<Map>', self.__start, add='+')
+
+    def __start(self,
+                _=None):
+        """
+        Load the database, then the data of the widgets, once the window is shown
+        """
+        self.unbind('<Map>')
+        self.update_idletasks()                     # Paint the skeleton of the window before the slower work
+        startup.mark(startup.FIRST_PAINT)
+
+        # --- App modules ---
+        # database: package with sql access elements, the heaviest part of the startup, so it is imported here
+        from database import db_worker, TABLES
+
+        self.table = TABLES[self.form['table']]
+
+        # Database requests run on the database worker thread, their results are delivered back to this frame
+        self.dispatcher = TkDispatcher(self, db_worker.get_worker(),
+                                       busy_callback_=self.__set_busy, error_callback_=self.__show_error)
+        if self.startup is None:
+            self.__load_data()
+        else:
+            self.dispatcher.submit(self.startup, on_success_=lambda _: self.__load_data())
+
+    def __load_data(self):
+        """
+        Fetch the options of the comboboxes and the rows of the data grid, on the database worker thread
+        """
+        for combobox_, is_filter_, table_name_, column_ in self.__lookups:
+            self.dispatcher.submit(self.__fetch_lookup, table_name_, column_,
+                                   on_success_=lambda values_, c_=combobox_, f_=is_filter_:
+                                   c_.config(values=[''] + values_ if f_ else values_))
+        self.__reload_datagrid_()
 
     def __create_widgets(self):
         """
         Create and add the widgets to the container thought as a grid, but positioning them after translation to Place
-          positioning.
+          positioning. Widgets are created from the form spec, and placed from its placement plan, which is compiled
+          from the fake grid once and then cached.
         """
-        # Get fake grid to var to made easier its referenced
-        fk = self.fake_grid
-
         # Create data fields and associated items
         self.id = None
+        self.variables = {}         # variable name -> tk.Variable linked to an input widget
+        self.inputs = {}            # variable name -> input widget
+        self.buttons = {}           # command -> button
+
+        # Index of the data grid items: row id -> Treeview iid, the values shown for each row, and the sort keys
+        #   (1º order by column, id) of the rows in the order they are displayed, so a single row can be refreshed on
+        #   its own
+        self.datagrid_iids = {}
+        self.__datagrid_values = {}
+        self.__datagrid_keys = []
+        self.__datagrid_row_keys = {}   # row id -> sort key
+
+        # Order of the rows in the data grid
+        self.filters = {}           # filter name -> (tk.Variable, field spec) of the widgets to search the rows
+        self.__sort_column = None   # Column whose heading was clicked, None to sort by the form order by columns
+        self.__filter_after = None  # Identifier of the scheduled search, while the filters keep changing
+        self.__descending = False
+
+        commands_ = {'new': self.__new, 'edit': self.__edit, 'cancel': self.__cancel, 'save': self.__save,
+                     'delete': self.__delete}
+
+        # Each placement has the cell (x, y, width, height) of a widget, placed in a single call
+        self.__datagrid_cell = None
+        self.__lookups = []         # (combobox, is filter, table, column) whose options are fetched once the
+                                    #   database is loaded
+        for placement_ in layout_compiler.get_plan(self.form):
+            section_ = placement_['section']
+            index_ = placement_['index']
+            cell_ = placement_['x'], placement_['y'], placement_['width'], placement_['height']
+
+            if section_ == 'fields':
+                self.__create_field(self.form['fields'][index_], cell_)
+
+            elif section_ == 'buttons':
+                command_ = self.form['buttons']['commands'][index_]
+                self.buttons[command_] = self.__create_button(command_.capitalize(), commands_[command_],
+                                                              command_ == 'new', *cell_)
+
+            elif section_ == 'status':
+                # Status bar
+                self.status = tk.StringVar(self)
+                self.label_status = tk.Label(self, textvariable=self.status, font=layout.DEFAULT_FONT, anchor=tk.W,
+                                             background=layout.BACKGROUND_COLOR)
+                self.label_status.place(x=cell_[0], y=cell_[1], width=cell_[2], height=cell_[3])
+
+            elif section_ == 'datagrid':
+                # Data grid is created when its data is fetched from the database
+                self.__datagrid_cell = cell_
+
+        self.buttons['new'].focus()                 # Set focus on button New
+
+        # Data grid is created when its data is fetched from the database
+        self.datagrid = None
+        self.virtual_datagrid = None
+        self.__datagrid_scrollbars = ()
+        self.__datagrid_loading = False
+        self.__datagrid_stream = None   # Rows still to load into the data grid, streamed from the database
+        self.__datagrid_order = []      # Items loaded so far, in the order of the rows
+        self.__datagrid_total = 0       # Rows of the load in progress, to show its progress
+        self.__datagrid_sizer = None    # Size of the chunks of the load in progress, fitted to the frame budget
+
+    def __create_field(self,
+                       field_: dict,
+                       cell_: tuple):
+        """
+        Create a widget of the form spec, in its cell
+        :param field_: spec of the widget
+        :param cell_: geometry (x, y, width, height) of the widget
+        """
+        kind_ = field_['kind']
+        if kind_ == 'label':
+            self.__create_label(field_['text'], *cell_)
+            return
+
+        # Input widgets are enabled while editing a record, filter widgets are always enabled
+        filter_ = field_.get('filter')
+        enabled_ = filter_ is not None
+        if kind_ == 'entry':
+            variable_ = tk.StringVar(self)
+            widget_ = self.__create_entry(variable_, enabled_, *cell_)
+
+        elif kind_ == 'combobox':
+            variable_ = tk.StringVar(self)
+            # Filters also offer an empty option, to stop filtering
+            options_ = list(field_.get('options', ()))
+            widget_ = self.__create_combobox(variable_, [''] + options_ if enabled_ else options_, enabled_, *cell_)
+            if 'lookup' in field_:
+                self.__lookups.append((widget_, enabled_, *field_['lookup']))
+
+        elif kind_ == 'checkbox':
+            variable_ = tk.BooleanVar(self)
+            x_, y_, width_, height_ = cell_
+            widget_ = self.__create_checkbox(variable_, field_['text'], enabled_=enabled_,
+                                             x_=x_, y_=y_, width_=width_, height_=height_)
+
+        else:
+            raise ValueError(f'Unknown kind of field: {kind_}.')
+
+        if filter_ is None:
+            self.variables[field_['variable']] = variable_
+            self.inputs[field_['variable']] = widget_
+        else:
+            # Search again when the filter changes, once the user stops typing
+            self.filters[filter_] = (variable_, field_)
+            variable_.trace_add('write', lambda *_: self.__on_filter_changed())
+
+    def __input_fields(self):
+        """
+        Fields of the form spec linked to a variable, i.e. input widgets
+        """
+        return (field_ for field_ in self.form['fields'] if 'variable' in field_)
+
+    def __create_datagrid(self,
+                          data_: tuple):
+        """
+        Create the data grid, or load it again if it already exists
+        :param data_: tuple (virtual, total, rows) fetched by __fetch_datagrid_data
+        """
+        virtual_, total_, rows_ = data_
 
-        # Row Nº 1
-        x_, y_ = fk.get_place(1, 1)             # get absolute (x, y) Place for widget in fake row 1 and fake col 1
-        self.label_name = self.__create_label('Movie name', x_, y_)
-        x_, y_ = fk.get_place(1, 2)             # get absolute (x, y) Place for widget in fake row 1 and fake col 2
-        self.name = tk.StringVar()
-        self.entry_name = self.__create_entry(self.name, False, x_, y_)
-        x_, y_ = fk.get_place(1, 3)             # get absolute (x, y) Place for widget in fake row 1 and fake col 3
-        self.label_name = self.__create_label('Director', x_, y_)
-        x_, y_ = fk.get_place(1, 4)             # get absolute (x, y) Place for widget in fake row 1 and fake col 4
-        self.director = tk.StringVar()
-        self.entry_director = self.__create_entry(self.director, False, x_, y_)
-
-        # Row Nº 2
-        x_, y_ = fk.get_place(2, 1)             # get absolute (x, y) Place for widget in fake row 2 and fake col 1
-        self.label_genre = self.__create_label('Main genre', x_, y_)
-        x_, y_ = fk.get_place(2, 2)             # get absolute (x, y) Place for widget in fake row 2 and fake col 2
-        # Dropdown genre menu options
-        genre_values = Genres().fechtall('name ASC')        # get list of values for movie genre combo box from database
-        genre_values = [tuple_[1] for tuple_ in genre_values]   # with list comprehension extract name (2º column)
-        self.genre = tk.StringVar(self)
-        self.combobox_genre = self.__create_combobox(self.genre, genre_values, False, x_, y_,
-                                                     width_=layout.DEFAULT_INPUT_WIDGET_WIDTH)
-        x_, y_ = fk.get_place(2, 3)             # get absolute (x, y) Place for widget in fake row 2 and fake col 3
-        self.label_duration = self.__create_label('Duration', x_, y_)
-        x_, y_ = fk.get_place(2, 4)             # get absolute (x, y) Place for widget in fake row 2 and fake col 4
-        self.duration = tk.StringVar(self)      # Alternately DoubleVar()
-        width_ = int(layout.DEFAULT_INPUT_WIDGET_WIDTH / 2)
-        self.entry_duration = self.__create_entry(self.duration, False, x_, y_, width_=width_)
-        x_ += width_ + layout.DEFAULT_LEFT_MARGIN * 3
-        width_ = self.container_width - x_ - layout.DEFAULT_LEFT_MARGIN
-        self.available = tk.BooleanVar()
-        self.checkbox_available = self.__create_checkbox(self.available, 'Available', enabled_=False,
-                                                         x_=x_, y_=y_, width_=width_)
-
-        # Create five (5) buttons
-        _, y_ = fk.get_place(4, 1)             # get absolute x Place for 1º button in fake row 4
-        buttons_count = 5
-        total_width = (layout.DEFAULT_BUTTON_LEFT_MARGIN + layout.DEFAULT_BUTTON_WIDTH)
-        x_ = self.container_width - total_width * buttons_count - layout.DEFAULT_LEFT_MARGIN
-        self.button_new = self.__create_button('New', self.__new, True, x_, y_)
-        self.button_new.focus()                     # Set focus on button New
-        x_ += total_width
-        self.button_edit = self.__create_button('Edit', self.__edit, False, x_, y_)
-        x_ += total_width
-        self.button_cancel = self.__create_button('Cancel', self.__cancel, False, x_, y_)
-        x_ += total_width
-        self.button_save = self.__create_button('Save', self.__save, False, x_, y_)
-        x_ += total_width
-        self.button_delete = self.__create_button('Delete', self.__delete, False, x_, y_)
-
-        # Fetch data to load datagrid
-        movies_ = self.__fetch_movies()
-
-        # Create data grid
-        x_, y_ = fk.get_place(6, 1)             # get absolute (x, y) Place for widget in fake row 6 and fake col 1
-        datagrid_height_ = self.container_height - y_ - layout.DEFAULT_TOP_MARGIN * 2
+        if self.datagrid is not None and virtual_ != (self.virtual_datagrid is not None):
+            # The number of rows crossed the threshold of virtual scrolling, the grid is created again of the other kind
+            self.__destroy_datagrid()
+
+        if self.datagrid is not None:
+            if self.virtual_datagrid is not None:
+                self.__datagrid_loading = False
+                self.virtual_datagrid.refresh()
+            else:
+                self.__load_datagrid_(rows_, total_)
+            return
+
+        # Create data grid in its cell, the full width of the container
+        x_, y_, _, datagrid_height_ = self.__datagrid_cell
+        datagrid_columns_ = self.form['datagrid']['columns']
         self.datagrid = self.__create_treeview_datagrid(
-            items_=movies_,
-            columns_=('Name', 'Director', 'Genre', 'Duration', 'Available'),
-            col_headings_=('Movie name', 'Director', 'Main Genre', 'Duration', 'Available'),
-            col_widths_=(200, 200, 150, 100, 70),
-            col_anchors_=(tk.W, tk.W, tk.W, tk.W, tk.CENTER),
-            x_=x_, y_=y_, height_=datagrid_height_)
+            columns_=tuple(column_['column'] for column_ in datagrid_columns_),
+            col_headings_=tuple(column_['heading'] for column_ in datagrid_columns_),
+            col_widths_=tuple(column_['width'] for column_ in datagrid_columns_),
+            col_anchors_=tuple(column_['anchor'] for column_ in datagrid_columns_),
+            x_=x_, y_=y_, height_=datagrid_height_,
+            sort_command_=self.__sort_by,
+            count_source_=self.__request_rows_count if virtual_ else None,
+            page_source_=self.__request_rows_page if virtual_ else None)
 
         # Bind event with its event handler
-        self.datagrid.bind('<<TreeviewSelect>>', self.__enable_edit)
+        self.datagrid.bind('<<TreeviewSelect>>', self.__enable_edit, add='+')
+        self.__show_sort_order()
+
+        if virtual_:
+            # The startup is over once its 1º page is shown
+            self.__datagrid_loading = False
+        else:
+            self.__load_datagrid_(rows_, total_)
+
+    def __filter_values(self) -> dict:
+        """
+        Values of the filter widgets, by filter name
+        """
+        values_ = {}
+        for filter_, (variable_, field_) in self.filters.items():
+            value_ = variable_.get()
+            if field_.get('format') == 'yes_no':
+                value_ = {'Yes': True, 'No': False}.get(value_)
+            values_[filter_] = value_
+        return values_
+
+    def __on_filter_changed(self):
+        """
+        Schedule a search with the new filters, postponing it while they keep changing (e.g. on each keystroke), so
+          only the last change runs a query
+        """
+        if self.__filter_after is not None:
+            self.after_cancel(self.__filter_after)
+        self.__filter_after = self.after(self.form.get('filter_delay_ms', forms.DEFAULT_FILTER_DELAY_MS),
+                                         self.__apply_filters)
+
+    def __apply_filters(self):
+        """
+        Search the rows with the filters, superseding and interrupting the search still in progress, if any
+        """
+        self.__filter_after = None
+        self.__reload_datagrid_()
+
+    def __order(self) -> tuple:
+        """
+        Columns to order the rows by: the column whose heading was clicked, if any, then the form order by columns
+        """
+        order_by_ = tuple(self.form['order_by'])
+        if self.__sort_column is None:
+            return order_by_
+        return (self.__sort_column,) + tuple(column_ for column_ in order_by_ if column_ != self.__sort_column)
+
+    def __sort_by(self,
+                  column_: str):
+        """
+        Sort the rows by a column, in the database, clicking again on the same column reverses the order
+        :param column_: column whose heading was clicked
+        """
+        if self.__sort_column == column_:
+            self.__descending = not self.__descending
+        else:
+            self.__sort_column = column_
+            self.__descending = False
+
+        self.__show_sort_order()
+        self.__reload_datagrid_()
+
+    def __show_sort_order(self):
+        """
+        Show the order in the headings: the column whose heading was clicked, if any, and its direction
+        """
+        for datagrid_column_ in self.form['datagrid']['columns']:
+            text_ = datagrid_column_['heading']
+            if datagrid_column_['column'] == self.__sort_column:
+                text_ += ' \u25BC' if self.__descending else ' \u25B2'
+            self.datagrid.heading(datagrid_column_['column'], text=text_)
+
+    def __reload_datagrid_(self):
+        """
+        Fetch the data grid data on the database worker thread, superseding any load still in progress
+        """
+        if self.dispatcher is None:
+            # Not started yet, the data is fetched once the window is shown
+            return
+        if self.write_behind:
+            # The queued changes are written first, so the rows are fetched with them
+            self.__flush(reload_=False)
+        self.__datagrid_loading = True
+        self.dispatcher.submit(self.__fetch_datagrid_data, self.table, self.__filter_values(), self.__order(),
+                               self.__descending,
+                               on_success_=self.__create_datagrid, on_error_=self.__on_datagrid_error,
+                               key_=self.__datagrid_key)
+
+    def __set_busy(self,
+                   busy_: bool):
+        """
+        Show whether database requests are in progress
+        :param busy_: flag to indicate whether there are pending requests
+        """
+        self.master.config(cursor='watch' if busy_ else '')
+        self.status.set('Working...' if busy_ else '')
+
+    @staticmethod
+    def __show_error(error_: BaseException):
+        """
+        Show the error of a failed database request
+        """
+        if startup.elapsed(startup.DATA_READY) is None:
+            # Before the modal box, which would hold the startup report until it is closed
+            startup.mark(startup.LOAD_FAILED)
+        messagebox.showerror('Error', f'{type(error_)}\n{str(error_)}')
 
     def __create_label(self,
                        text_: str = 'New Label',
                        x_: int = 0, y_: int = 0,
+                       width_: int = layout.DEFAULT_LABEL_WIDTH, height_: int = layout.DEFAULT_ROW_HEIGHT,
                        font_: tuple = layout.DEFAULT_FONT) -> tk.Label:
         """
         Add a new label to the GUI using Place layout manager
         :param text_: string of text to show in the widget
         :param x_: horizontal offset in pixels for displaying widget
         :param y_:  vertical offset in pixels for displaying widget
+        :param width_: width of the widget in pixels
+        :param height_: height of the widget in pixels
         :param font_: font style for displaying widget
 
         :return: a new label
@@ -150,7 +394,7 @@ class Application(tk.Frame):
         #   aligning options: E is Right, W is Left, N is Top, S is bottom
         new_label_ = tk.Label(self, text=text_, font=font_, anchor=tk.W, background=layout.BACKGROUND_COLOR)
         # Place label
-        new_label_.place(x=x_, y=y_, width=layout.DEFAULT_LABEL_WIDTH)
+        new_label_.place(x=x_, y=y_, width=width_, height=height_)
 
         return new_label_
 
@@ -280,17 +524,18 @@ class Application(tk.Frame):
         return new_button_
 
     def __create_treeview_datagrid(self,
-                                   items_: list,
                                    columns_: tuple,
                                    col_headings_: tuple,
                                    col_widths_: tuple,
                                    col_anchors_: tuple,
                                    x_: int = 0, y_: int = 0,
                                    width_: int = layout.DEFAULT_TREEVIEW_DATAGRID_WIDTH,
-                                   height_: int = layout.DEFAULT_TREEVIEW_DATAGRID_HEIGHT) -> ttk.Treeview:
+                                   height_: int = layout.DEFAULT_TREEVIEW_DATAGRID_HEIGHT,
+                                   sort_command_=None,
+                                   count_source_=None,
+                                   page_source_=None) -> ttk.Treeview:
         """
         Add a new datagrid as a ttk.TreeView instance, to the GUI using Place layout manager
-        :param items_: item list to load the datagrid
         :param columns_: list of column identifiers
         :param col_headings_: list of texts to display in the column headings
         :param col_widths_: list of column widths
@@ -299,6 +544,11 @@ class Application(tk.Frame):
         :param y_:  vertical offset in pixels for displaying widget
         :param width_: width for displaying widget
         :param height_: height of the widget in pixels
+        :param sort_command_: callable invoked with the column identifier when its heading is clicked
+        :param count_source_: callable that requests the count of the rows, only for virtual scrolling, see
+          VirtualDatagrid
+        :param page_source_: callable that requests a page of rows, see VirtualDatagrid, if it is set the datagrid is
+          scrolled virtually, otherwise it is empty until it is loaded
 
         :return: a new datagrid as a ttk.TreeView instance
         """
@@ -324,56 +574,494 @@ class Application(tk.Frame):
 
         # Link datatable (TreeView widget) with scrollbars
         new_datagrid_.configure(yscrollcommand=v_scrollbar_.set, xscrollcommand=h_scrollbar_.set)
+        self.__datagrid_scrollbars = (v_scrollbar_, h_scrollbar_)
 
         # Create columns
         new_datagrid_.heading('#0', text='Identifier')
         new_datagrid_.column('#0', width=80, stretch=tk.NO)
         for i in range(0, len(columns_)):
             new_datagrid_.heading(columns_[i], text=col_headings_[i])       # Define headings.
+            if sort_command_ is not None:
+                new_datagrid_.heading(columns_[i], command=lambda c_=columns_[i]: sort_command_(c_))
             # stretch: If this option is True, the column's width will be adjusted when the widget is resized
             new_datagrid_.column(columns_[i], anchor=col_anchors_[i], stretch=tk.NO, width=col_widths_[i])
 
-        if len(items_) > 0:
-            self.__load_datagrid_(new_datagrid_, items_)
+        if page_source_ is not None:
+            # Only the rows that fit in the datagrid height are created as items
+            row_height_ = int(ttk.Style().lookup('Treeview', 'rowheight') or layout.DEFAULT_ROW_HEIGHT)
+            visible_rows_ = (height_ - layout.DEFAULT_TREEVIEW_HEADING_HEIGHT) // row_height_
+            self.virtual_datagrid = VirtualDatagrid(new_datagrid_, v_scrollbar_, count_source_, page_source_,
+                                                    self.__datagrid_row_values, visible_rows_)
+            self.virtual_datagrid.refresh()
 
         return new_datagrid_
 
     def __load_datagrid_(self,
-                         datagrid_: ttk.Treeview = None,
-                         items_: list = None):
+                         rows_,
+                         total_: int = 0):
+        """
+        Load data rows in data grid, in chunks fetched from the database worker while the previous chunk is inserted,
+          so the first rows are shown at once and at most two chunks are held in memory. Each chunk is sized to be
+          inserted within a frame budget, so the window keeps responding during the whole load. The rows are compared
+          by id with the rows already shown, thus only the items that changed are inserted or updated, and the items
+          whose rows were not fetched are deleted at the end.
+        :param rows_: iterator over the rows, ordered by the order by columns of the form, not started yet, None to
+          empty the data grid
+        :param total_: number of rows, to show the progress of the load
+        """
+        self.__close_datagrid_stream()
+        if rows_ is None:
+            rows_ = iter(())
+        self.__datagrid_loading = True
+        self.__datagrid_stream = rows_
+        self.__datagrid_order = None
+        self.__datagrid_keys = []
+        self.__datagrid_total = total_
+        self.__datagrid_sizer = ChunkSizer(layout.DEFAULT_TREEVIEW_LOAD_CHUNK_SIZE)
+        self.__request_datagrid_chunk()
+
+    def __request_datagrid_chunk(self):
+        """
+        Fetch the next chunk of rows of the load in progress, on the database worker thread. A new load supersedes it.
         """
-        Load data rows in data grid
-        :param items_: item list fetched from database
+        size_ = self.__datagrid_sizer.size
+        self.dispatcher.submit(self.__fetch_datagrid_chunk, self.__datagrid_stream, size_,
+                               on_success_=lambda rows_: self.__load_datagrid_chunk(rows_, size_),
+                               on_error_=self.__on_datagrid_error, key_=self.__datagrid_key)
+
+    def __load_datagrid_chunk(self,
+                              rows_: list,
+                              size_: int):
         """
-        if datagrid_ is None:
-            datagrid_ = self.datagrid
+        Insert a chunk of rows at the end of the data grid
+        :param rows_: rows fetched
+        :param size_: number of rows requested, an incomplete chunk is the last one
+        """
+        last_ = len(rows_) < size_
+        if not last_:
+            # Fetch the next chunk meanwhile
+            self.__request_datagrid_chunk()
+
+        start_ = time.perf_counter()
+
+        if self.__datagrid_order is None:
+            # The items shown before are detached, and reattached as their rows arrive in the new order
+            self.__datagrid_order = []
+            self.datagrid.set_children('')
+
+        for row in rows_:
+            id_ = row.id
+            values_ = self.__datagrid_row_values(row)
+            iid_ = self.datagrid_iids.get(id_)
+            if iid_ is None:
+                iid_ = self.datagrid.insert('', tk.END, iid=str(id_), text=id_, values=values_)
+                self.datagrid_iids[id_] = iid_
+            else:
+                if self.__datagrid_values[id_] != values_:
+                    self.datagrid.item(iid_, values=values_)
+                self.datagrid.move(iid_, '', tk.END)
+            self.__datagrid_values[id_] = values_
+            self.__datagrid_row_keys[id_] = key_ = self.__datagrid_row_key(row)
+            self.__datagrid_keys.append(key_)
+            self.__datagrid_order.append(id_)
+
+        # Fit the next chunks to the time this one took
+        self.__datagrid_sizer.measure(len(rows_), (time.perf_counter() - start_) * 1000)
+
+        if last_:
+            self.__finish_datagrid_load()
+        else:
+            self.status.set(f'Loading rows... {len(self.__datagrid_order)} of '
+                            f'{max(self.__datagrid_total, len(self.__datagrid_order))}')
+
+    def __finish_datagrid_load(self):
+        """
+        Delete the items whose rows were not fetched by the load just finished
+        """
+        fetched_ids_ = set(self.__datagrid_order)
+        for id_ in [id_ for id_ in self.datagrid_iids if id_ not in fetched_ids_]:
+            self.datagrid.delete(self.datagrid_iids.pop(id_))
+            del self.__datagrid_values[id_]
+            del self.__datagrid_row_keys[id_]
+
+        self.__datagrid_stream = None
+        self.__datagrid_order = []
+        self.__datagrid_sizer = None
+        self.__datagrid_loading = False
+        startup.mark(startup.DATA_READY)
+
+    def __on_datagrid_error(self,
+                            error_: BaseException):
+        """
+        Stop the load in progress, since its rows could not be fetched, or counted before, so a later load can start
+        """
+        self.__close_datagrid_stream()
+        self.__datagrid_loading = False
+        self.__show_error(error_)
 
-        # Clear old items
-        for item in datagrid_.get_children():
-            datagrid_.delete(item)
+    def __destroy_datagrid(self):
+        """
+        Destroy the data grid and its scrollbars, with the items shown and the load in progress, if any
+        """
+        self.__close_datagrid_stream()
+        if self.virtual_datagrid is not None:
+            self.virtual_datagrid.close()
+            self.virtual_datagrid = None
+        for widget_ in (self.datagrid, *self.__datagrid_scrollbars):
+            widget_.destroy()
+        self.datagrid = None
+        self.__datagrid_scrollbars = ()
+
+        self.datagrid_iids = {}
+        self.__datagrid_values = {}
+        self.__datagrid_keys = []
+        self.__datagrid_row_keys = {}
+        self.__datagrid_order = []
+        self.__datagrid_loading = False
+
+    def __close_datagrid_stream(self):
+        """
+        Release the database connection of the load in progress, if any, on the database worker thread
+        """
+        if self.__datagrid_stream is not None:
+            self.dispatcher.submit(self.__datagrid_stream.close)
+            self.__datagrid_stream = None
 
-        if items_ is None:
-            items_ = []
+    def __refresh_datagrid_row_(self,
+                                id_: int,
+                                row_):
+        """
+        Refresh a single row of the data grid, after it was saved or deleted, touching only its item
+        :param id_: identifier of the record
+        :param row_: row fetched from database after saving it, None if it was deleted
+        """
+        if (self.datagrid is None or self.__datagrid_loading or self.__sort_column is not None
+                or any(value_ not in (None, '') for value_ in self.__filter_values().values())):
+            # A load still in progress may have fetched the data before the change, fetch it again. Also when the
+            #   rows are sorted or filtered, which is done by the database.
+            self.__reload_datagrid_()
+            return
+
+        if self.virtual_datagrid is not None:
+            # Only the visible rows exist, display them again
+            self.virtual_datagrid.refresh()
+            return
+
+        # Remove the old sort key of the item, if it is already shown
+        iid_ = self.datagrid_iids.get(id_)
+        if iid_ is not None:
+            old_key_ = self.__datagrid_row_keys.pop(id_)
+            del self.__datagrid_keys[bisect.bisect_left(self.__datagrid_keys, old_key_)]
+
+        if row_ is None:
+            # Row was deleted
+            if iid_ is not None:
+                self.datagrid.delete(self.datagrid_iids.pop(id_))
+                del self.__datagrid_values[id_]
+            return
+
+        # Locate the new position of the row, keeping the grid ordered
+        key_ = self.__datagrid_row_key(row_)
+        index_ = bisect.bisect_left(self.__datagrid_keys, key_)
+        self.__datagrid_keys.insert(index_, key_)
+        values_ = self.__datagrid_row_values(row_)
+        self.__datagrid_values[id_] = values_
+        self.__datagrid_row_keys[id_] = key_
+
+        if iid_ is None:
+            self.datagrid_iids[id_] = self.datagrid.insert('', index_, iid=str(id_), text=id_, values=values_)
         else:
-            items_.reverse()
+            self.datagrid.item(iid_, values=values_)
+            # Detach first, so the index counts only the other items
+            self.datagrid.detach(iid_)
+            self.datagrid.move(iid_, '', index_)
 
-        for row in items_:
-            datagrid_.insert('', 0, text=row[0],
-                             values=(row[1], row[2], row[3], row[4], 'Yes' if row[5] else 'No'))
+    def __datagrid_row_values(self,
+                              row_) -> tuple:
+        """
+        Values shown in the data grid columns for a row fetched from the database
+        """
+        values_ = []
+        for column_ in self.form['datagrid']['columns']:
+            value_ = getattr(row_, column_['column'])
+            if column_.get('format') == 'yes_no':
+                value_ = 'Yes' if value_ else 'No'
+            values_.append(value_)
+        return tuple(values_)
+
+    def __datagrid_row_key(self,
+                           row_) -> tuple:
+        """
+        Sort key of a row in the data grid: (value of the 1º order by column, id)
+        """
+        return getattr(row_, self.form['order_by'][0]), row_.id
 
     @staticmethod
-    def __fetch_movies() -> []:
+    def __fetch_datagrid_data(table_,
+                              filters_: dict,
+                              order_by_: tuple,
+                              descending_: bool) -> tuple:
         """
-        Fetch data from the database for the datagrid (a ttk.TreeView instance), ordered by column name
-        :return: data row list
+        Fetch data from the database for the datagrid (a ttk.TreeView instance). Runs on the database worker thread.
+        :param table_: class of the table
+        :param filters_: values of the filters to search the rows
+        :param order_by_: columns to order the rows by
+        :param descending_: flag to order the rows descending
+        :return: tuple (virtual, total, rows), rows is an iterator which fetches the rows while they are loaded, very
+          large tables are scrolled virtually so no rows are fetched
         """
-        list_ = []
-        try:
-            list_ = Movies().fechtall('name ASC')
-        except Exception as e:
-            messagebox.showerror('Error', f'{sys.exc_info()[0]}\n{str(e)}')
+        with table_() as rows_table_:
+            total_ = rows_table_.count()
+            if total_ > layout.DEFAULT_TREEVIEW_VIRTUAL_THRESHOLD:
+                return True, total_, None
+            if any(value_ not in (None, '') for value_ in filters_.values()):
+                total_ = rows_table_.search_count(filters_)
+        return False, total_, Application.__stream_datagrid_rows(table_, filters_, order_by_, descending_)
 
-        return list_
+    @staticmethod
+    def __stream_datagrid_rows(table_,
+                               filters_: dict,
+                               order_by_: tuple,
+                               descending_: bool):
+        """
+        Streams the rows of the data grid, holding a connection of the pool until they are all fetched or the stream is
+          closed. It must be iterated on the database worker thread.
+        """
+        with table_() as rows_table_:
+            yield from rows_table_.iter_search(filters_, order_by_, descending_)
+
+    @staticmethod
+    def __fetch_datagrid_chunk(rows_,
+                               size_: int) -> list:
+        """
+        Fetch the next rows of a stream. Runs on the database worker thread.
+        :param rows_: iterator over the rows, see __stream_datagrid_rows
+        :param size_: maximum number of rows to fetch
+        """
+        return list(itertools.islice(rows_, size_))
+
+    @staticmethod
+    def __fetch_lookup(table_name_: str,
+                       column_: str) -> []:
+        """
+        Fetch the options of a combobox from a column of a table, ordered. Runs on the database worker thread.
+        :return: list of values
+        """
+        from database import TABLES
+        with TABLES[table_name_]() as lookup_table_:
+            return lookup_table_.lookup(column_)
+
+    @staticmethod
+    def __fetch_record(table_,
+                       id_: int,
+                       table_name_: str = None):
+        """
+        Fetch a record to edit it. Runs on the database worker thread.
+        :param table_name_: name of the table, to look for a queued change of the record first, if writes are queued
+        """
+        if table_name_ is not None:
+            from database import unit_of_work
+            pending_, row_ = unit_of_work.get_unit_of_work().pending_row(table_name_, id_)
+            if pending_:
+                return row_
+
+        with table_() as records_table_:
+            return records_table_.fetch_by_id(id_)
+
+    @staticmethod
+    def __save_record(table_,
+                      id_: int,
+                      values_: dict) -> tuple:
+        """
+        Save a record in the database, and fetch it back. Runs on the database worker thread.
+        :return: tuple (id, row) of the saved record
+        """
+        with table_() as records_table_:
+            id_ = records_table_.save_record(id_, values_)
+            return id_, records_table_.fetch_by_id(id_)
+
+    @staticmethod
+    def __delete_record(table_,
+                        id_: int) -> tuple:
+        """
+        Delete a record from the database. Runs on the database worker thread.
+        :return: tuple (id, None) of the deleted record
+        """
+        with table_() as records_table_:
+            records_table_.delete(id_)
+        return id_, None
+
+    @staticmethod
+    def __queue_save(table_name_: str,
+                     id_: int,
+                     values_: dict) -> tuple:
+        """
+        Queue the saving of a record, see database.unit_of_work. Runs on the database worker thread.
+        :return: tuple (id, row) of the record as it will be saved, the id is temporary for a new record
+        """
+        from database import unit_of_work
+        return unit_of_work.get_unit_of_work().save(table_name_, id_, values_)
+
+    @staticmethod
+    def __queue_delete(table_name_: str,
+                       id_: int) -> tuple:
+        """
+        Queue the deletion of a record. Runs on the database worker thread.
+        :return: tuple (id, None) of the deleted record
+        """
+        from database import unit_of_work
+        return unit_of_work.get_unit_of_work().delete(table_name_, id_)
+
+    @staticmethod
+    def __flush_queue() -> tuple:
+        """
+        Write the queued changes as a single transaction. Runs on the database worker thread.
+        :return: tuple (ids, rejected), see UnitOfWork.flush()
+        """
+        from database import unit_of_work
+        return unit_of_work.get_unit_of_work().flush()
+
+    def __schedule_flush(self):
+        """
+        Schedule the writing of the queued changes, once no record changes for a while, or at the latest a while after
+          the 1º change
+        """
+        from database import unit_of_work
+        if self.__flush_idle_after is not None:
+            self.after_cancel(self.__flush_idle_after)
+        self.__flush_idle_after = self.after(unit_of_work.FLUSH_IDLE_MS, self.__flush)
+        if self.__flush_interval_after is None:
+            self.__flush_interval_after = self.after(unit_of_work.FLUSH_INTERVAL_MS, self.__flush)
+
+    def __flush(self,
+                reload_: bool = True):
+        """
+        Write the queued changes, on the database worker thread
+        :param reload_: flag to fetch the data grid again afterwards, if the ids of new records or rejected changes
+          make the rows shown differ from the database
+        """
+        for after_ in (self.__flush_idle_after, self.__flush_interval_after):
+            if after_ is not None:
+                self.after_cancel(after_)
+        self.__flush_idle_after = self.__flush_interval_after = None
+        self.dispatcher.submit(self.__flush_queue, on_success_=lambda result_: self.__on_flushed(result_, reload_))
+
+    def __on_flushed(self,
+                     result_: tuple,
+                     reload_: bool):
+        """
+        Report the changes rejected on flush, and refresh the data grid
+        :param result_: tuple (ids, rejected), see UnitOfWork.flush()
+        """
+        ids_, rejected_ = result_
+        # The record being edited may have just got its id
+        self.id = ids_.get(self.id, self.id)
+        if rejected_:
+            messagebox.showwarning('Changes not saved',
+                                   '\n'.join(f'{operation_}: {reason_}' for operation_, reason_ in rejected_))
+        if reload_ and (ids_ or rejected_ or self.virtual_datagrid is not None):
+            self.__reload_datagrid_()
+
+    def __on_record_queued(self,
+                           result_: tuple):
+        """
+        Show a queued change at once, as if it was written, and schedule the writing
+        :param result_: tuple (id, row) of the record, row is None if it is going to be deleted
+        """
+        self.__on_record_changed(result_)
+        if self.virtual_datagrid is not None:
+            # The visible rows are fetched again from the database, write the change first
+            self.__flush()
+        else:
+            self.__schedule_flush()
+
+    def __request_rows_count(self,
+                             on_count_,
+                             on_error_):
+        """
+        Count the rows of the virtual datagrid on the database worker thread, superseding and interrupting the count
+          still in progress
+        :param on_count_: callable invoked with the number of rows
+        :param on_error_: callable invoked if they could not be counted
+        """
+        self.dispatcher.submit(self.__fetch_rows_count, self.table, self.__filter_values(),
+                               on_success_=lambda total_: self.__on_rows_count(total_, on_count_),
+                               on_error_=lambda error_: self.__on_rows_error(error_, on_error_),
+                               key_=f'{self.__datagrid_key}-count')
+
+    def __request_rows_page(self,
+                            offset_: int,
+                            limit_: int,
+                            on_page_,
+                            on_error_):
+        """
+        Fetch a page of rows of the virtual datagrid on the database worker thread, superseding and interrupting the
+          page still in progress (e.g. while the scrollbar is dragged)
+        :param offset_: position of the 1º row of the page
+        :param limit_: maximum number of rows of the page
+        :param on_page_: callable invoked with the list of rows
+        :param on_error_: callable invoked if they could not be fetched
+        """
+        self.dispatcher.submit(self.__fetch_rows_page, self.table, self.__filter_values(), self.__order(),
+                               self.__descending, offset_, limit_,
+                               on_success_=lambda rows_: self.__on_rows_page(rows_, on_page_),
+                               on_error_=lambda error_: self.__on_rows_error(error_, on_error_),
+                               key_=f'{self.__datagrid_key}-page')
+
+    @staticmethod
+    def __on_rows_count(total_: int,
+                        on_count_):
+        on_count_(total_)
+        if not total_:
+            # No page is going to be fetched
+            startup.mark(startup.DATA_READY)
+
+    @staticmethod
+    def __on_rows_page(rows_: list,
+                       on_page_):
+        on_page_(rows_)
+        startup.mark(startup.DATA_READY)
+
+    def __on_rows_error(self,
+                        error_: BaseException,
+                        on_error_):
+        """
+        Let the virtual datagrid request the rows again later, and show the error
+        """
+        on_error_()
+        self.__show_error(error_)
+
+    @staticmethod
+    def __fetch_rows_count(table_,
+                           filters_: dict) -> int:
+        """
+        Count the rows in the database. Runs on the database worker thread.
+        :param table_: class of the table
+        :param filters_: values of the filters to search the rows
+        :return: number of rows
+        """
+        with table_() as rows_table_:
+            return rows_table_.search_count(filters_)
+
+    @staticmethod
+    def __fetch_rows_page(table_,
+                          filters_: dict,
+                          order_by_: tuple,
+                          descending_: bool,
+                          offset_: int,
+                          limit_: int) -> []:
+        """
+        Fetch a page of data from the database for the virtual datagrid. Runs on the database worker thread.
+        :param table_: class of the table
+        :param filters_: values of the filters to search the rows
+        :param order_by_: columns to order the rows by
+        :param descending_: flag to order the rows descending
+        :param offset_: position of the 1º row of the page
+        :param limit_: maximum number of rows of the page
+        :return: data row list
+        """
+        with table_() as rows_table_:
+            return rows_table_.search(filters_, order_by_, descending_, limit_, offset_)
 
     def __new(self):
         """
@@ -381,7 +1069,7 @@ class Application(tk.Frame):
         """
         self.__clean()                              # Clean entry widgets
         self.__toggle_widgets_state(tk.NORMAL)      # Enable widgets to allow edit a new item
-        self.entry_name.focus()                     # Set focus on 1º entry widget
+        next(iter(self.inputs.values())).focus()    # Set focus on 1º entry widget
 
     def __enable_edit(self,
                       _):
@@ -390,7 +1078,7 @@ class Application(tk.Frame):
         """
         if len(self.datagrid.selection()) > 0:
             # Enable button widgets
-            self.button_edit.config(state=tk.NORMAL)
+            self.buttons['edit'].config(state=tk.NORMAL)
 
     def __edit(self):
         """
@@ -399,52 +1087,84 @@ class Application(tk.Frame):
         selection_ = self.datagrid.selection()
         if len(selection_) > 0:
             selected_item_ = self.datagrid.item(selection_[0])
+            if str(selected_item_['text']) == PLACEHOLDER_TEXT:
+                # Row of the virtual datagrid whose page is still being fetched
+                return
+            # Fetch the whole record, on the database worker thread
+            self.dispatcher.submit(self.__fetch_record, self.table, int(selected_item_['text']),
+                                   self.form['table'] if self.write_behind else None,
+                                   on_success_=self.__fill_fields)
+
+    def __fill_fields(self,
+                      row_):
+        """
+        Show a record in the input widgets, to edit it
+        :param row_: record fetched from the database
+        """
+        if row_ is None:
+            messagebox.showinfo('Information', 'The record no longer exists.')
+            return
 
-            self.id = selected_item_['text']
-            self.name.set(selected_item_['values'][0])
-            self.director.set(selected_item_['values'][1])
-            self.genre.set(selected_item_['values'][2])
-            self.duration.set(selected_item_['values'][3])
-            self.available.set(True if selected_item_['values'][4] == 'Yes' else False)
+        self.id = row_.id
+        for field_ in self.__input_fields():
+            value_ = getattr(row_, field_.get('column', field_['variable']))
+            if field_['kind'] == 'checkbox':
+                value_ = bool(value_)
+            self.variables[field_['variable']].set('' if value_ is None else value_)
 
-            self.__toggle_widgets_state(tk.NORMAL)      # Enable widgets to allow edit
-            self.button_delete.config(state=tk.NORMAL)  # Also enable Delete button
+        self.__toggle_widgets_state(tk.NORMAL)          # Enable widgets to allow edit
+        self.buttons['delete'].config(state=tk.NORMAL)  # Also enable Delete button
 
     def __save(self):
         """
-        Save a new or existing movie in the database
+        Save a new or existing record in the database
         """
         try:
             self.__toggle_widgets_state(tk.DISABLED)    # Disable widgets to cancel editing
 
-            movie_ = Movie(                             # Instantiate a new movie to save in database
-                self.id,
-                self.name.get(),
-                self.director.get(),
-                self.genre.get(),
-                self.duration.get(),
-                self.available.get()
-            )
-
-            Movies().save(movie_)                       # Save it in database
-            movies_ = self.__fetch_movies()             # Fetch updated data from the database
-            self.__load_datagrid_(items_=movies_)       # Refresh datagrid
+            # Values of the record to save in database, by column
+            values_ = {field_.get('column', field_['variable']): self.variables[field_['variable']].get()
+                       for field_ in self.__input_fields()}
 
-            # Prepare view for next action
-            self.__clean()                              # Clean entry widgets
-            self.__toggle_widgets_state(tk.DISABLED)    # Disable widgets waiting for new edition
-            self.button_new.focus()                     # Set focus on button New
+            # Save it in database, on the database worker thread, or queue it to be written later
+            if self.write_behind:
+                self.dispatcher.submit(self.__queue_save, self.form['table'], self.id, values_,
+                                       on_success_=self.__on_record_queued, on_error_=self.__on_save_error)
+            else:
+                self.dispatcher.submit(self.__save_record, self.table, self.id, values_,
+                                       on_success_=self.__on_record_changed, on_error_=self.__on_save_error)
 
         except Exception as e:
             messagebox.showerror('Error', f'{sys.exc_info()[0]}\n{str(e)}')
 
+    def __on_record_changed(self,
+                            result_: tuple):
+        """
+        Refresh the view after a record was saved or deleted in the database
+        :param result_: tuple (id, row) of the record, row is None if it was deleted
+        """
+        self.__refresh_datagrid_row_(*result_)      # Refresh the changed row in datagrid
+
+        # Prepare view for next action
+        self.__clean()                              # Clean entry widgets
+        self.__toggle_widgets_state(tk.DISABLED)    # Disable widgets waiting for new edition
+        self.buttons['new'].focus()                 # Set focus on button New
+
+    def __on_save_error(self,
+                        error_: BaseException):
+        """
+        Show the error of a failed save, and enable widgets again to allow fixing the data
+        """
+        self.__show_error(error_)
+        self.__toggle_widgets_state(tk.NORMAL)
+
     def __cancel(self):
         """
         Clean and disable widgets to cancel record editing
         """
         self.__clean()                              # Clean entry widgets
         self.__toggle_widgets_state(tk.DISABLED)    # Disable widgets to cancel editing
-        self.button_new.focus()                     # Set focus on button New
+        self.buttons['new'].focus()                 # Set focus on button New
 
     def __delete(self):
         """
@@ -453,17 +1173,15 @@ class Application(tk.Frame):
 
         # Confirm drop
         response_ = tk.messagebox.askquestion('Delete item',
-                                              f'Are you sure you want to delete movie {self.name.get()}?',
+                                              'Are you sure you want to delete the selected item?',
                                               icon='warning')
         if response_ == 'yes':
-            Movies().delete(self.id)                    # Delete from database the record identified with ID
-            movies_ = self.__fetch_movies()             # Fetch data from the database
-            self.__load_datagrid_(items_=movies_)       # Refresh datagrid
-
-            # Prepare view for next action
-            self.__clean()                              # Clean entry widgets
-            self.__toggle_widgets_state(tk.DISABLED)    # Disable widgets waiting for new edition
-            self.button_new.focus()                     # Set focus on button New
+            # Delete from database the record identified with ID, on the database worker thread, or queue it
+            if self.write_behind:
+                self.dispatcher.submit(self.__queue_delete, self.form['table'], self.id,
+                                       on_success_=self.__on_record_queued)
+            else:
+                self.dispatcher.submit(self.__delete_record, self.table, self.id, on_success_=self.__on_record_changed)
 
         else:
             messagebox.showinfo('Information', 'Deletion canceled by user.')
@@ -473,11 +1191,8 @@ class Application(tk.Frame):
         Clean entry widgets
         """
         self.id = None
-        self.name.set('')
-        self.director.set('')
-        self.duration.set('')
-        self.genre.set('')
-        self.available.set(False)
+        for variable_ in self.variables.values():
+            variable_.set(False if isinstance(variable_, tk.BooleanVar) else '')
 
     def __toggle_widgets_state(self,
                                state_: []):
@@ -486,70 +1201,111 @@ class Application(tk.Frame):
         :param state_: state to set on widgets
         """
         # Enable/Disable entry widgets
-        self.entry_name.config(state=state_)
-        self.entry_director.config(state=state_)
-        self.combobox_genre.config(state=state_)
-        self.entry_duration.config(state=state_)
-        self.checkbox_available.config(state=state_)
+        for input_ in self.inputs.values():
+            input_.config(state=state_)
 
         # Enable/Disable button widgets
-        self.button_save.config(state=state_)
-        self.button_cancel.config(state=state_)
+        self.buttons['save'].config(state=state_)
+        self.buttons['cancel'].config(state=state_)
         if state_ == tk.DISABLED:
-            self.button_edit.config(state=state_)
-            self.button_delete.config(state=state_)
+            self.buttons['edit'].config(state=state_)
+            self.buttons['delete'].config(state=state_)
 
-    @staticmethod
-    def create():
+    def open_form(self,
+                  form_: dict):
+        """
+        Open a CRUD screen over another table, in a new window
+        :param form_: declarative spec of the form
+        """
+        window_ = tk.Toplevel(self.master)
+        window_.title(form_['title'])
+        window_.resizable(False, False)
+        Application(window_, form_, menu_=False, write_behind_=self.write_behind)
+
+    def create(self):
         """
         Create tables in the database
         """
-        try:
-            # Initialize the counter of created tables
-            counter_ = 0
+        self.dispatcher.submit(self.__create_tables, on_success_=self.__on_tables_created)
+
+    @staticmethod
+    def __create_tables() -> int:
+        """
+        Create tables in the database. Runs on the database worker thread.
+        :return: number of tables created
+        """
+        from database.genres_table import Genres
+        from database.movies_table import Movies
+
+        # Initialize the counter of created tables
+        counter_ = 0
 
-            # Create genres table
-            if Genres().create_table():
+        # Create genres table
+        with Genres() as genres_:
+            if genres_.create_table():
                 counter_ += 1
 
-            # Create movies table
-            if Movies().create_table():
+        # Create movies table, and its full-text index if SQLite supports it, also on a table created without it
+        with Movies() as movies_:
+            if movies_.create_table():
                 counter_ += 1
+            if not movies_.full_text_index_exists():
+                movies_.create_full_text_index()
 
-            messagebox.showinfo('Information', f'{counter_} tables created successfully.')
+        return counter_
 
-        except Exception as e:
-            messagebox.showerror('Error', f'{sys.exc_info()[0]}\n{str(e)}')
+    def __on_tables_created(self,
+                            counter_: int):
+        """
+        Inform the tables created, and load the data grid from them
+        """
+        messagebox.showinfo('Information', f'{counter_} tables created successfully.')
+        self.__reload_datagrid_()
 
-    @staticmethod
-    def drop():
+    def drop(self):
         """
         Drop tables from the database
         """
-        try:
-            # Confirm drop
-            response_ = tk.messagebox.askquestion('Drop tables',
-                                                  'Are you sure you want to drop the tables in Database?',
-                                                  icon='warning')
-            if response_ == 'yes':
-                # Dropping confirmed, initialize counter of tables dropped
-                counter_ = 0
+        # Confirm drop
+        response_ = tk.messagebox.askquestion('Drop tables',
+                                              'Are you sure you want to drop the tables in Database?',
+                                              icon='warning')
+        if response_ == 'yes':
+            self.dispatcher.submit(self.__drop_tables, on_success_=self.__on_tables_dropped)
 
-                # Drop movies if exists
-                if Movies().drop_table():
-                    counter_ += 1
+        else:
+            messagebox.showinfo('Information', 'Dropping of tables canceled by user.')
 
-                # Drop genres if exists
-                if Genres().drop_table():
-                    counter_ += 1
+    @staticmethod
+    def __drop_tables() -> int:
+        """
+        Drop tables from the database. Runs on the database worker thread.
+        :return: number of tables dropped
+        """
+        from database.genres_table import Genres
+        from database.movies_table import Movies
 
-                messagebox.showinfo('Information', f'{counter_} table(s) dropped.')
+        # Dropping confirmed, initialize counter of tables dropped
+        counter_ = 0
 
-            else:
-                messagebox.showinfo('Information', 'Dropping of tables canceled by user.')
+        # Drop movies if exists
+        with Movies() as movies_:
+            if movies_.drop_table():
+                counter_ += 1
 
-        except Exception as e:
-            messagebox.showerror('Error', f'{sys.exc_info()[0]}\n{str(e)}')
+        # Drop genres if exists
+        with Genres() as genres_:
+            if genres_.drop_table():
+                counter_ += 1
+
+        return counter_
+
+    @staticmethod
+    def __on_tables_dropped(counter_: int):
+        """
+        Inform the tables dropped
+        """
+        messagebox.showinfo('Information', f'{counter_} table(s) dropped.')
 
 
 class MenuBar(tk.Menu):
@@ -574,6 +1330,8 @@ class MenuBar(tk.Menu):
         home_menu_.add_command(label="Create tables", command=self.application.create)
         home_menu_.add_command(label="Drop tables", command=self.application.drop)
         home_menu_.add_separator()
+        home_menu_.add_command(label="Genres...", command=lambda: self.application.open_form(forms.GENRES_FORM))
+        home_menu_.add_separator()
         home_menu_.add_command(label="Exit", underline=1, command=self.quit)
         # Associate drop-down Home menu to the menu bar
         self.add_cascade(label="Home", underline=0, menu=home_menu_)
@@ -590,6 +1348,8 @@ class MenuBar(tk.Menu):
 
         # Create a drop-down Help menu
         help_menu_ = tk.Menu(self, tearoff=False)
+        help_menu_.add_command(label="Diagnostics...", command=lambda: DiagnosticsWindow(self.master))
+        help_menu_.add_separator()
         help_menu_.add_command(label="About", command=self.__about)
         # Associate drop-down Help menu to the menu bar
         self.add_cascade(label="Help", menu=help_menu_)
@@ -606,6 +1366,11 @@ def __press_ctrl_plus(key_):
     Simulates to press a key while holding <ctrl> key
     :param key_: key to press with the <ctrl> key
     """
+    # --- Third Party Libraries ---
+    # pynput.keyboard: contains classes for controlling and monitoring the keyboard. Imported on first use, since it
+    #                  needs a display server, thus the views can be imported (e.g. their form specs) without one.
+    from pynput.keyboard import Key, Controller
+
     # Create keyboard controller to send hot-key programmatically (virtual keyboard events)
     keyboard = Controller()
 
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# queue: module which implements multi-producer, multi-consumer queues, useful in threaded programming.
+import queue
+# tkinter: this package (“Tk interface”) is the standard Python interface to the Tcl/Tk GUI toolkit.
+import tkinter as tk
+
+DEFAULT_POLL_MS = 20        # Milliseconds between checks of finished requests, while there are pending requests
+
+
+class TkDispatcher:
+    """
+    Submits requests to the database worker and delivers their results back to the Tk main loop thread, polling with
+      after(), since Tk widgets must only be touched from that thread.
+    """
+    def __init__(self,
+                 widget_: tk.Misc,
+                 worker_,
+                 busy_callback_=None,
+                 error_callback_=None,
+                 poll_ms_: int = DEFAULT_POLL_MS):
+        """
+        Class constructor
+        :param widget_: widget whose after() method schedules the polling
+        :param worker_: database worker that runs the requests, a database.db_worker.DbWorker (not imported here, so the
+          database package is loaded only when the worker is created)
+        :param busy_callback_: callable invoked with True when requests start to be pending, and False when all of
+          them finished
+        :param error_callback_: default callable invoked with the exception of a failed request
+        :param poll_ms_: milliseconds between checks of finished requests
+        """
+        self.widget = widget_
+        self.worker = worker_
+        self.busy_callback = busy_callback_
+        self.error_callback = error_callback_
+        self.poll_ms = poll_ms_
+
+        self.__done = queue.SimpleQueue()   # Finished futures, put by the worker thread
+        self.__pending = 0
+        self.__polling = False
+
+    @property
+    def busy(self) -> bool:
+        """
+        Indicates whether there are requests not yet delivered
+        """
+        return self.__pending > 0
+
+    def submit(self,
+               function_,
+               *args_,
+               on_success_=None,
+               on_error_=None,
+               key_: str = None):
+        """
+        Runs function_(*args_) on the database worker, then calls on_success_(result) or on_error_(exception) on the
+          Tk main loop thread. Results of requests superseded by a newer request with the same key are discarded.
+        :return: future of the request, which may be cancelled
+        """
+        future_ = self.worker.submit(function_, *args_, key_=key_)
+        self.__pending += 1
+        if self.__pending == 1 and self.busy_callback is not None:
+            self.busy_callback(True)
+
+        future_.add_done_callback(lambda f_: self.__done.put((f_, key_, on_success_, on_error_)))
+
+        if not self.__polling:
+            self.__polling = True
+            self.widget.after(self.poll_ms, self.__poll)
+
+        return future_
+
+    def __poll(self):
+        """
+        Delivers the results of the finished requests
+        """
+        while True:
+            try:
+                future_, key_, on_success_, on_error_ = self.__done.get_nowait()
+            except queue.Empty:
+                break
+
+            self.__pending -= 1
+            if future_.cancelled() or not self.worker.is_latest(key_, future_):
+                continue
+
+            error_ = future_.exception()
+            if error_ is None:
+                if on_success_ is not None:
+                    on_success_(future_.result())
+            else:
+                on_error_ = on_error_ or self.error_callback
+                if on_error_ is not None:
+                    on_error_(error_)
+
+        if self.__pending > 0:
+            self.widget.after(self.poll_ms, self.__poll)
+        else:
+            self.__polling = False
+            if self.busy_callback is not None:
+                self.busy_callback(False)
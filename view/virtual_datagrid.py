@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+# --- Python modules ---
+# collections: module which implements specialized container datatypes.
+import collections
+# tkinter: this package (“Tk interface”) is the standard Python interface to the Tcl/Tk GUI toolkit.
+import tkinter as tk
+from tkinter import ttk
+
+DEFAULT_PAGE_SIZE = 100         # Rows fetched from the database on each page
+DEFAULT_CACHED_PAGES = 10       # Pages kept in memory, the least recently used is discarded first
+PLACEHOLDER_TEXT = '...'        # Shown in the visible rows whose page is being fetched
+
+
+class VirtualDatagrid:
+    """
+    Virtual scrolling over a ttk.Treeview. Only the visible rows exist as Treeview items, whose values are replaced
+      when scrolling, and the rows are fetched page by page keeping a bounded cache of pages. So memory and startup
+      time do not depend on the number of rows.
+    The count and the pages are requested asynchronously (e.g. on the database worker), the rows whose page is being
+      fetched show a placeholder until it arrives. Only the latest request of each kind is awaited, the sources may
+      discard the older ones.
+    """
+    def __init__(self,
+                 datagrid_: ttk.Treeview,
+                 scrollbar_: ttk.Scrollbar,
+                 count_source_,
+                 page_source_,
+                 row_values_,
+                 visible_rows_: int,
+                 page_size_: int = DEFAULT_PAGE_SIZE,
+                 cached_pages_: int = DEFAULT_CACHED_PAGES):
+        """
+        Class constructor
+        :param datagrid_: Treeview where the rows are displayed
+        :param scrollbar_: vertical scrollbar, which represents the position over all the rows
+        :param count_source_: callable (on_count, on_error) that requests the total number of rows, then calls
+          on_count(total), or on_error() if it could not be counted
+        :param page_source_: callable (offset, limit, on_page, on_error) that requests a list of rows, entities with an
+          id attribute, then calls on_page(rows), or on_error() if they could not be fetched
+        :param row_values_: callable that returns the values shown in the Treeview columns for a row
+        :param visible_rows_: number of rows displayed at the same time
+        :param page_size_: number of rows fetched on each page
+        :param cached_pages_: number of pages kept in memory
+        """
+        self.datagrid = datagrid_
+        self.scrollbar = scrollbar_
+        self.count_source = count_source_
+        self.page_source = page_source_
+        self.row_values = row_values_
+        self.visible_rows = max(1, visible_rows_)
+        self.page_size = page_size_
+        self.cached_pages = cached_pages_
+
+        self.offset = 0                             # Position of the 1º visible row
+        self.total = 0                              # Number of rows
+        self.__pages = collections.OrderedDict()    # page number -> rows, in least recently used order
+        self.__requested = None                     # range of the page numbers being fetched, if any
+        self.__generation = 0                       # Increased when the rows change, so older answers are ignored
+        self.__selected_id = None                   # Selection is kept by row identifier, not by Treeview item
+
+        # Create the fixed Treeview items (slots) which display the visible rows
+        self.__slots = [self.datagrid.insert('', tk.END, iid=f'slot{i}') for i in range(self.visible_rows)]
+        self.__attached = len(self.__slots)
+
+        # Link the scrollbar and the mouse wheel with the virtual position instead of the Treeview view
+        self.scrollbar.configure(command=self.yview)
+        self.datagrid.configure(yscrollcommand='')
+        self.datagrid.bind('<MouseWheel>', self.__on_mouse_wheel, add='+')
+        self.datagrid.bind('<Button-4>', lambda _: self.scroll(-3), add='+')
+        self.datagrid.bind('<Button-5>', lambda _: self.scroll(3), add='+')
+        self.datagrid.bind('<Prior>', lambda _: self.scroll(-self.visible_rows), add='+')
+        self.datagrid.bind('<Next>', lambda _: self.scroll(self.visible_rows), add='+')
+        self.datagrid.bind('<<TreeviewSelect>>', self.__on_select, add='+')
+
+    def refresh(self):
+        """
+        Discards the cached pages, e.g. after rows were saved or deleted, and displays again the current position
+        """
+        self.__pages.clear()
+        self.__requested = None
+        self.__generation += 1
+        generation_ = self.__generation
+        self.count_source(lambda total_: self.__on_count(generation_, total_), lambda: None)
+        # Meanwhile, the pages of the current position
+        self.__request_pages(self.offset, self.offset + self.visible_rows - 1)
+
+    def close(self):
+        """
+        Ignores the answers still to come, e.g. before the Treeview is destroyed
+        """
+        self.__pages.clear()
+        self.__requested = None
+        self.__generation += 1
+
+    def __on_count(self,
+                   generation_: int,
+                   total_: int):
+        if generation_ == self.__generation:
+            self.total = total_
+            self.__render()
+
+    def __on_page(self,
+                  generation_: int,
+                  page_numbers_: range,
+                  rows_: list):
+        """
+        Caches the pages fetched, and displays them if they are still visible
+        """
+        if generation_ != self.__generation:
+            return
+        if self.__requested == page_numbers_:
+            self.__requested = None
+        for page_number_ in page_numbers_:
+            start_ = (page_number_ - page_numbers_.start) * self.page_size
+            self.__pages[page_number_] = rows_[start_:start_ + self.page_size]
+            self.__pages.move_to_end(page_number_)
+        while len(self.__pages) > max(self.cached_pages, len(page_numbers_)):
+            self.__pages.popitem(last=False)
+        self.__render()
+
+    def __on_page_error(self,
+                        generation_: int,
+                        page_numbers_: range):
+        # The pages are requested again on the next render
+        if generation_ == self.__generation and self.__requested == page_numbers_:
+            self.__requested = None
+
+    def __request_pages(self,
+                        first_index_: int,
+                        last_index_: int):
+        """
+        Fetches the pages of a range of rows which are not in the cache, in a single request which supersedes the one
+          still in progress, unless it already fetches them
+        """
+        page_numbers_ = [page_number_ for page_number_ in range(first_index_ // self.page_size,
+                                                                last_index_ // self.page_size + 1)
+                         if page_number_ not in self.__pages]
+        if not page_numbers_:
+            return
+        page_numbers_ = range(page_numbers_[0], page_numbers_[-1] + 1)
+        if self.__requested is not None and all(page_number_ in self.__requested for page_number_ in page_numbers_):
+            return
+
+        self.__requested = page_numbers_
+        generation_ = self.__generation
+        self.page_source(page_numbers_.start * self.page_size, len(page_numbers_) * self.page_size,
+                         lambda rows_: self.__on_page(generation_, page_numbers_, rows_),
+                         lambda: self.__on_page_error(generation_, page_numbers_))
+
+    def yview(self,
+              *args_):
+        """
+        Scrollbar command: 'moveto fraction' or 'scroll number units|pages'
+        """
+        if args_[0] == tk.MOVETO:
+            self.__move_to(int(float(args_[1]) * self.total))
+        elif args_[0] == tk.SCROLL:
+            number_ = int(args_[1])
+            self.scroll(number_ * self.visible_rows if args_[2] == tk.PAGES else number_)
+
+    def scroll(self,
+               rows_: int):
+        """
+        Scrolls the view a number of rows, up if it is negative, down otherwise
+        """
+        self.__move_to(self.offset + rows_)
+        return 'break'
+
+    def __move_to(self,
+                  offset_: int):
+        offset_ = max(0, min(offset_, self.total - self.visible_rows))
+        if offset_ != self.offset:
+            self.offset = offset_
+            self.__render()
+
+    def __on_mouse_wheel(self,
+                         event_: tk.Event):
+        return self.scroll(-3 if event_.delta > 0 else 3)
+
+    def __on_select(self,
+                    _):
+        selection_ = self.datagrid.selection()
+        if len(selection_) > 0:
+            id_ = str(self.datagrid.item(selection_[0], 'text'))
+            if id_ != PLACEHOLDER_TEXT:
+                self.__selected_id = id_
+
+    def __row(self,
+              index_: int):
+        """
+        Gets a row by its position, from the cache
+        :return: the row, None if there is no such row, or PLACEHOLDER_TEXT if its page is not fetched yet
+        """
+        if index_ >= self.total:
+            return None
+
+        page_number_, position_ = divmod(index_, self.page_size)
+        page_ = self.__pages.get(page_number_)
+        if page_ is None:
+            return PLACEHOLDER_TEXT
+        self.__pages.move_to_end(page_number_)
+        return page_[position_] if position_ < len(page_) else None
+
+    def __render(self):
+        """
+        Displays the visible rows in the slots, and updates the scrollbar
+        """
+        self.offset = max(0, min(self.offset, self.total - self.visible_rows))
+        self.__request_pages(self.offset, min(self.offset + self.visible_rows, self.total) - 1)
+        selected_slot_ = None
+        attached_ = 0
+        for i_, slot_ in enumerate(self.__slots):
+            row_ = self.__row(self.offset + i_)
+            if row_ is None:
+                break
+            if row_ is PLACEHOLDER_TEXT:
+                self.datagrid.item(slot_, text=PLACEHOLDER_TEXT, values=())
+            else:
+                self.datagrid.item(slot_, text=row_.id, values=self.row_values(row_))
+            if row_ is not PLACEHOLDER_TEXT and str(row_.id) == self.__selected_id:
+                selected_slot_ = slot_
+            attached_ += 1
+
+        # Show only as many slots as rows there are
+        if attached_ != self.__attached:
+            for i_, slot_ in enumerate(self.__slots):
+                if i_ < attached_:
+                    self.datagrid.move(slot_, '', i_)
+                else:
+                    self.datagrid.detach(slot_)
+            self.__attached = attached_
+
+        # Selection follows the row, not the slot
+        if selected_slot_ is None:
+            if len(self.datagrid.selection()) > 0:
+                self.datagrid.selection_set(())
+        elif self.datagrid.selection() != (selected_slot_,):
+            self.datagrid.selection_set(selected_slot_)
+
+        if self.total > 0:
+            self.scrollbar.set(self.offset / self.total, min(1.0, (self.offset + attached_) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)